@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# Allow execution from anywhere
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import time
+
+from devscripts.utils import read_file
+from yt_dlp import YoutubeDL
+from yt_dlp.extractor.common import InfoExtractor
+
+FILLER = (
+    '<div class="content">',
+    '<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit</p>',
+    '<a href="/news/article-{}.html">Article</a>',
+    '<img src="https://cdn.example.com/img/{}.jpg" alt="">',
+    '<script>window.data = {{"id": {}}};</script>',
+    '</div>',
+)
+EMBEDS = (
+    '<iframe src="https://www.youtube.com/embed/BaW_jenozKc"></iframe>',
+    '<iframe src="https://player.vimeo.com/video/76979871"></iframe>',
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the detection of embeds in webpages')
+    parser.add_argument(
+        'webpage', nargs='?', metavar='HTMLFILE',
+        help='webpage to detect the embeds of (default: a generated webpage)')
+    parser.add_argument(
+        '-s', '--size', type=int, default=2 * 1024 ** 2,
+        help='approximate size of the generated webpage in bytes (default: %(default)s)')
+    parser.add_argument(
+        '-n', '--runs', type=int, default=5,
+        help='number of times to detect the embeds (default: %(default)s)')
+    return parser.parse_args()
+
+
+def generate_webpage(size):
+    rng = random.Random(0)
+    parts, length = [], 0
+    while length < size:
+        parts.append(rng.choice(FILLER).format(len(parts)))
+        length += len(parts[-1])
+    for embed in EMBEDS:
+        parts.insert(rng.randrange(len(parts)), embed)
+    return ''.join(parts)
+
+
+def extract_unfiltered(ydl, url, webpage):
+    embeds = []
+    for ie in ydl._ies.values():
+        try:
+            embeds.extend(ie.extract_from_webpage(ydl, url, webpage))
+        except InfoExtractor.StopExtraction:
+            break
+    return embeds
+
+
+def benchmark(name, func, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    print(f'{name:<12} best {min(times) * 1000:8.1f}ms  mean {sum(times) / runs * 1000:8.1f}ms  '
+          f'{len(result)} embeds')
+    return min(times)
+
+
+def main():
+    args = parse_args()
+    webpage = read_file(args.webpage) if args.webpage else generate_webpage(args.size)
+    url = 'https://example.com/'
+
+    ydl = YoutubeDL({'quiet': True})
+    generic = ydl.get_info_extractor('Generic')
+    generic.report_detected = lambda *args, **kwargs: None
+    print(f'{len(ydl._ies)} extractors, webpage of {len(webpage)} characters')
+
+    # The first run also loads the extractors and builds the keyword index
+    benchmark('first run', lambda: generic._extract_embeds(url, webpage), 1)
+    filtered = benchmark('filtered', lambda: generic._extract_embeds(url, webpage), args.runs)
+    unfiltered = benchmark('unfiltered', lambda: extract_unfiltered(ydl, url, webpage), args.runs)
+    print(f'Speedup: {unfiltered / filtered:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+# Allow execution from anywhere
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import time
+
+from devscripts.utils import read_file
+from yt_dlp.utils import LenientJSONDecoder, js_to_json
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the parsing of JavaScript objects, as done by InfoExtractor._parse_json')
+    parser.add_argument(
+        'payloads', nargs='*', metavar='FILE',
+        help='files with the objects to parse (default: generated JSON and JavaScript payloads)')
+    parser.add_argument(
+        '-s', '--size', type=int, default=2 * 1024 ** 2,
+        help='approximate size of the generated payloads in bytes (default: %(default)s)')
+    parser.add_argument(
+        '-n', '--runs', type=int, default=5,
+        help='number of times to parse each payload (default: %(default)s)')
+    return parser.parse_args()
+
+
+def generate_payloads(size):
+    rng = random.Random(0)
+    items, length = [], 0
+    while length < size:
+        items.append({
+            'videoId': f'{rng.getrandbits(64):016x}',
+            'title': {'runs': [{'text': f'Video "{len(items)}" é'}]},
+            'lengthSeconds': rng.randrange(10000),
+            'thumbnails': [{'url': f'https://example.com/{len(items)}.jpg?w=320&h=180', 'width': 320, 'height': 180}],
+            'isLive': False,
+            'badge': None,
+            'rating': rng.random(),
+        })
+        length += len(json.dumps(items[-1]))
+    code = json.dumps({'contents': items})
+    # The same payload as it would appear in a script: unquoted keys, minified booleans, trailing commas
+    javascript = (code.replace('"videoId"', 'videoId').replace('"isLive": false', 'isLive: !1')
+                  .replace('null', 'void 0').replace(']}', '],}'))
+    return {'json': code, 'javascript': javascript}
+
+
+def benchmark(name, code, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        json.loads(code, cls=LenientJSONDecoder, strict=False, transform_source=js_to_json)
+        times.append(time.perf_counter() - start)
+    print(f'{name:<24} {len(code):>10} chars  best {min(times) * 1000:8.1f}ms  '
+          f'mean {sum(times) / runs * 1000:8.1f}ms')
+
+
+def main():
+    args = parse_args()
+    payloads = {path: read_file(path) for path in args.payloads} or generate_payloads(args.size)
+    for name, code in payloads.items():
+        benchmark(name, code, args.runs)
+
+
+if __name__ == '__main__':
+    main()
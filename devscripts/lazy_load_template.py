@@ -11,7 +11,7 @@
 )
 
 # These bloat the lazy_extractors, so allow them to passthrough silently
-ALLOWED_CLASSMETHODS = {'extract_from_webpage', 'get_testcases', 'get_webpage_testcases'}
+ALLOWED_CLASSMETHODS = {'extract_from_webpage', 'embed_keywords', 'get_testcases', 'get_webpage_testcases'}
 _WARNED = False
 
 
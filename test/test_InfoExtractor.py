@@ -4,6 +4,7 @@
 import os
 import sys
 import unittest
+import unittest.mock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -14,7 +15,8 @@
 from test.helper import FakeYDL, expect_dict, expect_value, http_server_port
 from yt_dlp.compat import compat_etree_fromstring
 from yt_dlp.extractor import YoutubeIE, get_info_extractor
-from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.extractor.common import InfoExtractor, _regex_keywords
+from yt_dlp.extractor.generic import _KeywordIndex
 from yt_dlp.utils import (
     ExtractorError,
     RegexNotFoundError,
@@ -359,6 +361,35 @@ def test_download_json(self):
         self.assertRaises(ExtractorError, self.ie._download_json, uri, None)
         self.assertEqual(self.ie._download_json(uri, None, fatal=False), None)
 
+    def test_download_concurrently(self):
+        uris = [encode_data_uri(f'{{"n": {n}}}'.encode(), 'application/json') for n in range(5)]
+        self.assertEqual(self.ie._download_concurrently(
+            lambda uri: self.ie._download_json(uri, None), uris), [{'n': n} for n in range(5)])
+
+        # Up to concurrent_requests calls run at once
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait(n):
+            barrier.wait()
+            return n
+
+        ie = DummyIE(FakeYDL({'concurrent_requests': 3}))
+        self.assertEqual(ie._download_concurrently(wait, range(3)), [0, 1, 2])
+        ie = DummyIE(FakeYDL({'concurrent_requests': 3, 'sleep_interval_requests': 0.01}))
+        threads = ie._download_concurrently(lambda _: threading.get_ident(), range(3))
+        self.assertEqual(threads, [threading.get_ident()] * 3)
+
+        def download(n):
+            if n % 2:
+                raise ExtractorError(f'Failed {n}', expected=True)
+            return n
+
+        with self.assertRaisesRegex(ExtractorError, 'Failed 1'):
+            self.ie._download_concurrently(download, range(5))
+        with unittest.mock.patch.object(self.ie, 'report_warning') as report_warning:
+            self.assertEqual(self.ie._download_concurrently(download, range(5), fatal=False), [0, None, 2, None, 4])
+        self.assertEqual(report_warning.call_count, 2)
+
     def test_parse_html5_media_entries(self):
         # inline video tag
         expect_dict(
@@ -1081,6 +1112,33 @@ def test_parse_m3u8_formats(self):
                 expect_value(self, formats, expected_formats, None)
                 expect_value(self, subs, expected_subs, None)
 
+    def test_parse_m3u8_media_playlist_data(self):
+        media_doc = '#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXTINF:4,\n0.ts\n#EXT-X-DISCONTINUITY\n#EXTINF:4,\n1.ts\n'
+        master_doc = '#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1000000\nmedia.m3u8\n'
+
+        # Only playlists that cannot change any more are shared with the downloader
+        for doc, url, shared in (
+            (media_doc, 'https://example.com/hls/live.m3u8', False),
+            (f'{media_doc}#EXT-X-ENDLIST\n', 'https://example.com/hls/vod.m3u8', True),
+            (master_doc, 'https://example.com/hls/master.m3u8', False),
+        ):
+            formats, _ = self.ie._parse_m3u8_formats_and_subtitles(doc, url)
+            self.assertEqual(self.ie._downloader._m3u8_playlists.get(url), (doc, url) if shared else None)
+            # It is not part of the info dict
+            self.assertNotIn('hls_media_playlist_data', formats[0])
+
+        ie = DummyIE(FakeYDL({'hls_split_discontinuity': True}))
+        redirect_url = 'https://cdn.example.com/hls/media.m3u8'
+        with unittest.mock.patch.object(ie, '_download_webpage_handle', return_value=(
+                f'{media_doc}#EXT-X-ENDLIST\n', unittest.mock.Mock(url=redirect_url))) as download:
+            formats, _ = ie._parse_m3u8_formats_and_subtitles(master_doc, 'https://example.com/hls/split.m3u8')
+        download.assert_called_once()
+        self.assertEqual([f['format_index'] for f in formats], [0, 1])
+        self.assertEqual([f['url'] for f in formats], ['https://example.com/hls/media.m3u8'] * 2)
+        self.assertEqual(
+            ie._downloader._m3u8_playlists.get('https://example.com/hls/media.m3u8'),
+            (f'{media_doc}#EXT-X-ENDLIST\n', redirect_url))
+
     def test_parse_mpd_formats(self):
         _TEST_CASES = [
             (
@@ -1472,6 +1530,26 @@ def test_parse_mpd_formats(self):
                 expect_value(self, formats, expected_formats, None)
                 expect_value(self, subtitles, expected_subtitles, None)
 
+    def test_parse_dynamic_mpd_formats(self):
+        mpd_doc = compat_etree_fromstring(b'''<?xml version="1.0"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="dynamic" availabilityStartTime="1970-01-01T00:00:00Z"
+     minimumUpdatePeriod="PT2S" timeShiftBufferDepth="PT10S">
+  <Period id="0" start="PT0S">
+    <AdaptationSet mimeType="video/mp4" contentType="video">
+      <SegmentTemplate media="$RepresentationID$/$Number$.m4s" initialization="$RepresentationID$/init.mp4"
+                       duration="2" timescale="1" startNumber="1"/>
+      <Representation id="v1" bandwidth="1000000" width="1280" height="720" codecs="avc1.64001f"/>
+    </AdaptationSet>
+  </Period>
+</MPD>''')
+        with unittest.mock.patch('time.time', return_value=1001.0):
+            formats, _ = self.ie._parse_mpd_formats_and_subtitles(
+                mpd_doc, mpd_base_url='http://127.0.0.1/live', mpd_url='http://127.0.0.1/live/Manifest.mpd')
+        # 500 segments have been fully published; the time shift buffer holds the last 5 of them
+        self.assertEqual(
+            [f['path'] for f in formats[0]['fragments']],
+            ['v1/init.mp4', 'v1/496.m4s', 'v1/497.m4s', 'v1/498.m4s', 'v1/499.m4s', 'v1/500.m4s'])
+
     def test_parse_ism_formats(self):
         _TEST_CASES = [
             (
@@ -2168,6 +2246,80 @@ def test_search_nuxt_json(self):
             self.assertIs(
                 self.ie._search_nuxt_json(HTML_TMPL.format(data), None, default=DEFAULT), DEFAULT)
 
+    def test_regex_keywords(self):
+        self.assertEqual(_regex_keywords(r'<iframe[^>]+src="(?P<url>https?://(?:www\.)?Example\.com/embed/\d+)'), (
+            'example.com/embed/',))
+        self.assertEqual(_regex_keywords(r'(?x)\s* fo \. (?:bart|qu zx) \b'), ('bart', 'quzx'))
+        self.assertEqual(_regex_keywords(r'(?:<iframe|<embed)[^>]+src="(?:https?:)?//x\.(?:com|net)'), (
+            'embed', 'iframe'))
+        self.assertEqual(_regex_keywords(r'<a[^>]+src="\w+\.(?:videos)+'), ('videos',))
+        self.assertIsNone(_regex_keywords(r'<(?:iframe|ab)\s+(?P<url>.+?)>'))
+        self.assertIsNone(_regex_keywords(r'(?:example\.com)?/ab(?P<url>\d+)'))
+
+    def test_embed_keywords(self):
+        class RegexIE(InfoExtractor):
+            _EMBED_REGEX = [r'<iframe[^>]+src="(?P<url>https?://Example\.com/\d+)', r'data-example-id="(?P<url>\d+)']
+
+        class SubRegexIE(RegexIE):
+            _EMBED_REGEX = []
+
+        class CustomIE(RegexIE):
+            @classmethod
+            def _extract_embed_urls(cls, url, webpage):
+                yield from super()._extract_embed_urls(url, webpage)
+
+        class ExplicitIE(CustomIE):
+            _EMBED_KEYWORDS = ('Example',)
+
+        class GenericRegexIE(InfoExtractor):
+            _EMBED_REGEX = [r'<iframe[^>]+src="(?P<url>[^"]+)']
+
+        self.assertEqual(RegexIE.embed_keywords(), ('://example.com/', 'data-example-id="'))
+        self.assertEqual(SubRegexIE.embed_keywords(), ())
+        self.assertIsNone(CustomIE.embed_keywords())
+        self.assertEqual(ExplicitIE.embed_keywords(), ('example',))
+        self.assertEqual(GenericRegexIE.embed_keywords(), ('<iframe',))
+
+    def test_keyword_index(self):
+        index = _KeywordIndex(frozenset(('youtube.com', 'tube.com', 'be.co', 'ubeco', '<iframe')))
+        self.assertEqual(index.search('<IFRAME src="//www.YouTube.com/embed/x">'), {
+            '<iframe', 'youtube.com', 'tube.com', 'be.co'})
+        self.assertEqual(index.search('ubecom'), {'ubeco'})
+        self.assertEqual(index.search('youtubeco'), {'ubeco'})
+        self.assertEqual(index.search(''), set())
+        self.assertEqual(_KeywordIndex(frozenset()).search('youtube.com'), set())
+
+    def test_extract_embeds(self):
+        ydl = FakeYDL()
+        ydl.add_default_info_extractors()
+        generic = ydl.get_info_extractor('Generic')
+        generic.report_detected = lambda *args, **kwargs: None
+
+        def extract_all(webpage):
+            # Without filtering the extractors by their keywords
+            embeds = []
+            for ie in ydl._ies.values():
+                try:
+                    embeds.extend(ie.extract_from_webpage(ydl, 'https://example.com/', webpage))
+                except InfoExtractor.StopExtraction:
+                    break
+            return [embed['url'] for embed in embeds]
+
+        for webpage, expected_count in (
+            ('<p>No embeds</p>', 0),
+            ('''<iframe src="https://www.youtube.com/embed/BaW_jenozKc"></iframe>
+               <iframe src="https://player.vimeo.com/video/76979871"></iframe>
+               <iframe src="https://streamable.com/e/dnd1"></iframe>
+               <IFRAME SRC="https://www.DailyMotion.com/embed/video/x5kesuj"></IFRAME>''', 4),
+            # An exclusive embed discards the others
+            (('<link rel="alternate" href="https://www.youtube.com/watch?v=BaW_jenozKc">'
+              '<iframe src="https://streamable.com/e/dnd1"></iframe>'), 1),
+        ):
+            expected = extract_all(webpage)
+            self.assertEqual(len(expected), expected_count)
+            self.assertEqual(
+                [embed['url'] for embed in generic._extract_embeds('https://example.com/', webpage)], expected)
+
 
 class TestInfoExtractorNetwork(unittest.TestCase):
     def setUp(self, /):
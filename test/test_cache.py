@@ -12,6 +12,7 @@
 
 from test.helper import FakeYDL
 from yt_dlp.cache import Cache
+from yt_dlp.utils import locked_file
 
 
 def _is_empty(d):
@@ -52,6 +53,27 @@ def test_cache(self):
         self.assertFalse(os.path.exists(self.test_dir))
         self.assertEqual(c.load('test_cache', 'k.'), None)
 
+    def test_cache_update(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+        })
+        c = Cache(ydl)
+        self.assertEqual(c.update('test_cache', 'k', lambda data: [*(data or []), 1]), [1])
+        self.assertEqual(c.update('test_cache', 'k', lambda data: [*(data or []), 2]), [1, 2])
+        self.assertEqual(c.load('test_cache', 'k'), [1, 2])
+
+        def concurrent_update(data):
+            # Updates from other processes wait for the lock
+            with self.assertRaises(BlockingIOError):
+                locked_file(os.path.join(self.test_dir, 'test_cache', 'k.json.lock'), 'a', block=False).open()
+            return [*data, 3]
+
+        self.assertEqual(c.update('test_cache', 'k', concurrent_update), [1, 2, 3])
+        self.assertEqual(c.load('test_cache', 'k'), [1, 2, 3])
+
+        ydl.params['cachedir'] = False
+        self.assertEqual(c.update('test_cache', 'k', lambda data: data), None)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import http.server
+import json
+import threading
+
+from test.helper import http_server_port, try_rm
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.downloader.dash import DashSegmentsFD
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
+from yt_dlp.utils import DashFragments
+from yt_dlp.utils._utils import _YDLLogger as FakeLogger
+
+
+def _dynamic_mpd(start, count, ended=False):
+    mpd_type = 'static' if ended else 'dynamic'
+    timeline = f'<S t="{start * 2}" d="2" r="{count - 1}"/>'
+    return f'''<?xml version="1.0"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="{mpd_type}" minimumUpdatePeriod="PT1S">
+  <Period id="0">
+    <AdaptationSet mimeType="video/mp4" contentType="video">
+      <SegmentTemplate media="seg$Time$.m4s" initialization="init.mp4" timescale="1">
+        <SegmentTimeline>{timeline}</SegmentTimeline>
+      </SegmentTemplate>
+      <Representation id="v1" bandwidth="1000000" width="1280" height="720" codecs="avc1.64001f"/>
+    </AdaptationSet>
+  </Period>
+</MPD>'''
+
+
+class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
+    # The time shift buffer slides forward by 2 segments on every request
+    manifest_requests = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, content, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        if self.path == '/live.mpd':
+            cls = type(self)
+            start = 10 + 2 * cls.manifest_requests
+            cls.manifest_requests += 1
+            self._send(_dynamic_mpd(start, 5, ended=start >= 14).encode(), 'application/dash+xml')
+        elif self.path.endswith(('.m4s', '.mp4')):
+            self._send(self.path[1:].encode() + b'\n', 'video/mp4')
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+
+class TestDashSegmentsFDDownload(unittest.TestCase):
+    def setUp(self):
+        self.httpd = http.server.HTTPServer(('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def test_live_downloader_selection(self):
+        info_dict = {
+            'url': 'http://127.0.0.1/live.mpd',
+            'protocol': 'http_dash_segments+http_dash_segments',
+            'is_live': True,
+        }
+        self.assertIsNone(get_suitable_downloader(info_dict.copy(), {}))
+        self.assertEqual(get_suitable_downloader(info_dict.copy(), {'external_downloader': 'native'}), DashSegmentsFD)
+
+    def test_live_download(self):
+        HTTPTestRequestHandler.manifest_requests = 0
+        manifest_url = f'http://127.0.0.1:{self.port}/live.mpd'
+        filename = 'testlive.mp4'
+        try_rm(filename)
+        with YoutubeDL({'logger': FakeLogger(), 'concurrent_fragment_downloads': 2}) as ydl:
+            ie = ydl.get_info_extractor('Generic')
+            mpd_doc, urlh = ie._download_xml_handle(manifest_url, 'testlive')
+            urlh.close()
+            formats, _ = ie._parse_mpd_formats_and_subtitles(
+                mpd_doc, 'dash', mpd_base_url=f'http://127.0.0.1:{self.port}', mpd_url=manifest_url)
+            fd = DashSegmentsFD(ydl, ydl.params)
+            with mock.patch('time.sleep'):
+                self.assertTrue(fd.real_download(filename, {
+                    **formats[0],
+                    # The extractor finds the format in the refreshed manifest, even if it was renamed since
+                    'format_id': 'renamed',
+                    'id': 'testlive',
+                    'is_live': True,
+                }))
+        with open(filename, 'rb') as f:
+            self.assertEqual(
+                f.read().decode().split(),
+                ['init.mp4', *(f'seg{i * 2}.m4s' for i in range(12, 19))])
+        try_rm(filename)
+
+    def test_multiple_formats_download(self):
+        filenames = ['testmultiple.fvideo.mp4', 'testmultiple.faudio.mp4']
+        for filename in filenames:
+            try_rm(filename)
+        base_url = f'http://127.0.0.1:{self.port}/'
+        with YoutubeDL({'logger': FakeLogger(), 'concurrent_fragment_downloads': 3}) as ydl:
+            fd = DashSegmentsFD(ydl, ydl.params)
+            self.assertTrue(fd.real_download('testmultiple.mp4', {
+                'id': 'testmultiple',
+                'ext': 'mp4',
+                'protocol': 'http_dash_segments+http_dash_segments',
+                'requested_formats': [{
+                    'format_id': format_id,
+                    'filepath': filename,
+                    'fragment_base_url': base_url,
+                    'fragments': [{'path': f'{format_id}{i}.m4s'} for i in range(count)],
+                } for format_id, filename, count in zip(('video', 'audio'), filenames, (12, 3), strict=True)],
+            }))
+        for filename, format_id, count in zip(filenames, ('video', 'audio'), (12, 3), strict=True):
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read().decode().split(), [f'{format_id}{i}.m4s' for i in range(count)])
+            try_rm(filename)
+
+    def test_serialized_fragments_download(self):
+        filename = 'testserialized.mp4'
+        try_rm(filename)
+        fragments = DashFragments([{'path': 'init.mp4'}])
+        fragments.extend(DashFragments.from_template('seg%(Time)d.m4s', 'path', [[1, 0, 2, 3], [4, 10, 4, 2]]))
+        with YoutubeDL({'logger': FakeLogger()}) as ydl:
+            fd = DashSegmentsFD(ydl, ydl.params)
+            self.assertTrue(fd.real_download(filename, json.loads(json.dumps(ydl.sanitize_info({
+                'id': 'testserialized',
+                'ext': 'mp4',
+                'protocol': 'http_dash_segments',
+                'fragment_base_url': f'http://127.0.0.1:{self.port}/',
+                'fragments': fragments,
+            })))))
+        with open(filename, 'rb') as f:
+            self.assertEqual(
+                f.read().decode().split(), ['init.mp4', 'seg0.m4s', 'seg2.m4s', 'seg4.m4s', 'seg10.m4s', 'seg14.m4s'])
+        try_rm(filename)
+
+    def test_section_download(self):
+        filename = 'testsection.mp4'
+        try_rm(filename)
+        ffmpeg_args = []
+
+        def real_run_ffmpeg(_, input_path_opts, output_path_opts):
+            ffmpeg_args.extend((input_path_opts, output_path_opts))
+            with open(output_path_opts[0][0], 'wb') as f:
+                f.write(b'trimmed')
+
+        with YoutubeDL({'logger': FakeLogger(), 'concurrent_fragment_downloads': 2}) as ydl, \
+                mock.patch.object(FFmpegPostProcessor, 'real_run_ffmpeg', real_run_ffmpeg):
+            fd = DashSegmentsFD(ydl, ydl.params)
+            self.assertTrue(fd.real_download(filename, {
+                'id': 'testsection',
+                'ext': 'mp4',
+                'protocol': 'http_dash_segments',
+                'fragment_base_url': f'http://127.0.0.1:{self.port}/',
+                'fragments': [
+                    {'path': 'init.mp4'},
+                    *({'path': f'seg{i}.m4s', 'duration': 2.0} for i in range(10)),
+                ],
+                'section_start': 5,
+                'section_end': 9,
+            }))
+        self.assertEqual(ffmpeg_args, [
+            [(filename, ['-ss', '1.0', '-t', '4'])],
+            [('testsection.temp.mp4', ['-map', '0', '-dn', '-ignore_unknown', '-c', 'copy', '-c:s', 'mov_text'])],
+        ])
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read(), b'trimmed')
+        try_rm(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -85,6 +85,17 @@ def test_make_cmd(self):
             ydl.cookiejar.set_cookie(http.cookiejar.Cookie(**TEST_COOKIE))
             assert '--load-cookies' in downloader._make_cmd('test', TEST_INFO)
 
+    def test_rate_limit(self):
+        with FakeYDL() as ydl:
+            for params, expected in (
+                ({}, None),
+                ({'ratelimit': 2000}, '2000'),
+                ({'ratelimit_per_host': 1000}, '1000'),
+                ({'ratelimit': 2000, 'ratelimit_per_host': 1000}, '1000'),
+            ):
+                cmd = WgetFD(ydl, params)._make_cmd('test', TEST_INFO)
+                self.assertEqual(cmd[cmd.index('--limit-rate') + 1] if '--limit-rate' in cmd else None, expected)
+
 
 class HTTPTestHandler(http.server.BaseHTTPRequestHandler):
     def do_GET(self, /):
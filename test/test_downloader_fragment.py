@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import concurrent.futures
+import threading
+from unittest import mock
+
+from yt_dlp.downloader.fragment import _ConcurrencyController, _FragmentScheduler
+from yt_dlp.networking import Response
+from yt_dlp.networking.exceptions import HTTPError, IncompleteRead
+
+
+def _http_error(status, headers=None):
+    return HTTPError(Response(None, 'http://example.com', headers or {}, status=status))
+
+
+class TestFragmentScheduler(unittest.TestCase):
+    def test_priority(self):
+        scheduler = _FragmentScheduler(1)
+        small, large = scheduler.queue(lambda: 10), scheduler.queue(lambda: 1000)
+        started, release, order = threading.Event(), threading.Event(), []
+
+        def gate():
+            started.set()
+            release.wait()
+
+        futures = [small.submit(gate)]
+        started.wait()
+        futures += [queue.submit(order.append, name) for queue, name in (
+            (small, 'small1'), (small, 'small2'), (large, 'large1'), (large, 'large2'))]
+        release.set()
+        concurrent.futures.wait(futures)
+        scheduler.shutdown()
+        # The single worker serves the format with the most remaining bytes first
+        self.assertEqual(order, ['large1', 'large2', 'small1', 'small2'])
+
+    def test_shared_workers(self):
+        scheduler = _FragmentScheduler(4)
+        queues = [scheduler.queue(), scheduler.queue()]
+        barrier = threading.Barrier(4, timeout=10)
+        # A format can use all the workers when the other one has nothing left to download
+        futures = [queues[0].submit(barrier.wait) for _ in range(4)]
+        for future in futures:
+            future.result()
+        scheduler.shutdown()
+
+    def test_cancel(self):
+        scheduler = _FragmentScheduler(1)
+        queue = scheduler.queue()
+        started, release = threading.Event(), threading.Event()
+
+        def gate():
+            started.set()
+            return release.wait()
+
+        running = queue.submit(gate)
+        started.wait()
+        pending = queue.submit(lambda: None)
+        queue.shutdown(wait=False, cancel_futures=True)
+        release.set()
+        self.assertTrue(running.result())
+        self.assertTrue(pending.cancelled())
+        scheduler.shutdown()
+        self.assertRaises(RuntimeError, queue.submit, lambda: None)
+
+    def test_controller_limit(self):
+        controller = _ConcurrencyController(4)
+        controller.level = 1
+        scheduler = _FragmentScheduler(4, controller)
+        queue = scheduler.queue()
+        lock, running, peak = threading.Lock(), [0], [0]
+
+        def job():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.01)
+            with lock:
+                running[0] -= 1
+
+        concurrent.futures.wait([queue.submit(job) for _ in range(10)])
+        scheduler.shutdown()
+        self.assertEqual(peak[0], 1)
+
+
+class TestConcurrencyController(unittest.TestCase):
+    def _run_window(self, controller, clock, throughput):
+        # Complete a measurement window of fragments at the given throughput (bytes/sec)
+        frags = 2 * controller.level
+        clock[0] += frags / throughput
+        for _ in range(frags):
+            controller.fragment_downloaded(1)
+
+    @mock.patch('yt_dlp.downloader.fragment.time.monotonic')
+    def test_additive_increase(self, monotonic):
+        clock = [0]
+        monotonic.side_effect = lambda: clock[0]
+        changes = []
+        controller = _ConcurrencyController(5, on_change=lambda level, _: changes.append(level))
+        self.assertEqual(controller.level, 2)
+        for throughput in (100, 200, 300, 305, 310):
+            self._run_window(controller, clock, throughput)
+        # Raised while the throughput improved, held once it stopped improving
+        self.assertEqual(changes, [3, 4, 5])
+        self._run_window(controller, clock, 1000)
+        self.assertEqual(controller.level, 5)
+
+    @mock.patch('yt_dlp.downloader.fragment.time.monotonic')
+    def test_multiplicative_decrease(self, monotonic):
+        clock = [0]
+        monotonic.side_effect = lambda: clock[0]
+        controller = _ConcurrencyController(16)
+        controller.level = 8
+        controller.fragment_failed(_http_error(404))
+        self.assertEqual(controller.level, 8)
+        controller.fragment_failed(_http_error(429))
+        self.assertEqual(controller.level, 4)
+        # Failures of the fragments that were already running are not counted again
+        controller.fragment_failed(_http_error(503))
+        self.assertEqual(controller.level, 4)
+        self._run_window(controller, clock, 100)
+        controller.fragment_failed(IncompleteRead(partial=1, expected=2))
+        self.assertEqual(controller.level, 2)
+        self._run_window(controller, clock, 100)
+        controller.fragment_failed(_http_error(403, {'Retry-After': '10'}))
+        self.assertEqual(controller.level, 1)
+
+    @mock.patch('yt_dlp.downloader.fragment.time.monotonic')
+    def test_throttling(self, monotonic):
+        clock = [0]
+        monotonic.side_effect = lambda: clock[0]
+        controller = _ConcurrencyController(16, min_level=2)
+        controller.level = 6
+        self._run_window(controller, clock, 1000)
+        self._run_window(controller, clock, 500)
+        self.assertEqual(controller.level, 3)
+        self._run_window(controller, clock, 100)
+        self._run_window(controller, clock, 50)
+        self.assertEqual(controller.level, 2)
+        self.assertEqual(controller.peak, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
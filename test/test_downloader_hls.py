@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import http.server
+import threading
+
+from test.helper import FakeYDL, http_server_port, try_rm
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.downloader.external import FFmpegFD
+from yt_dlp.downloader.hls import HlsFD
+from yt_dlp.utils import M3U8Playlist
+from yt_dlp.utils._utils import _YDLLogger as FakeLogger
+
+
+def _media_playlist(start, count, ended=False):
+    playlist = f'#EXTM3U\n#EXT-X-TARGETDURATION:1\n#EXT-X-MEDIA-SEQUENCE:{start}\n'
+    for sequence in range(start, start + count):
+        playlist += f'#EXTINF:1.0,\nseg{sequence}.ts\n'
+    return playlist + ('#EXT-X-ENDLIST\n' if ended else '')
+
+
+class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
+    # The live playlist slides forward by 2 segments on every request
+    playlist_requests = 0
+    # The DVR playlist keeps all its segments and ends once its last segment is downloaded
+    dvr_ended = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, content, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        if self.path == '/live.m3u8':
+            cls = type(self)
+            start = 10 + 2 * cls.playlist_requests
+            cls.playlist_requests += 1
+            self._send(_media_playlist(start, 5, ended=start >= 14).encode(), 'application/vnd.apple.mpegurl')
+        elif self.path == '/dvr.m3u8':
+            playlist = _media_playlist(0, 8, ended=True) if type(self).dvr_ended else _media_playlist(0, 6)
+            self._send(playlist.encode(), 'application/vnd.apple.mpegurl')
+        elif self.path == '/vod.m3u8':
+            self._send(_media_playlist(0, 10, ended=True).encode(), 'application/vnd.apple.mpegurl')
+        elif self.path.startswith(('/seg', '/cdn/seg')):
+            if self.path == '/seg5.ts':
+                type(self).dvr_ended = True
+            self._send(self.path[1:].encode() + b'\n', 'video/mp2t')
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+
+class TestHlsFD(unittest.TestCase):
+    def test_parse_fragments(self):
+        fd = HlsFD(FakeYDL(), {})
+        fragments = fd._parse_fragments(M3U8Playlist.parse(
+            '#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXT-X-MEDIA-SEQUENCE:7\n'
+            '#EXT-X-MAP:URI="init.mp4"\n#EXTINF:4.0,\na.m4s\n#EXTINF:3.5,\nb.m4s\n#EXT-X-ENDLIST\n'),
+            'http://127.0.0.1/dir/index.m3u8', {})
+        self.assertEqual([f['url'] for f in fragments], [
+            'http://127.0.0.1/dir/init.mp4', 'http://127.0.0.1/dir/a.m4s', 'http://127.0.0.1/dir/b.m4s'])
+        self.assertTrue(fragments[0]['init'])
+        self.assertEqual([f.get('sequence') for f in fragments], [None, 7, 8])
+        self.assertEqual([f.get('duration') for f in fragments], [None, 4.0, 3.5])
+
+    def test_live_fragments(self):
+        fd = HlsFD(FakeYDL(), {})
+        playlists = iter([_media_playlist(12, 5), _media_playlist(14, 5), _media_playlist(14, 5, ended=True)])
+
+        class FakeResponse:
+            url = 'http://127.0.0.1/live.m3u8'
+
+            def read(self):
+                return next(playlists).encode()
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+        def live_fragments(info_dict):
+            return [f['url'].rpartition('/')[2] for f in fd._live_fragments(
+                {'fragment_index': 0}, info_dict, FakeResponse.url, _media_playlist(10, 5))]
+
+        with mock.patch.object(fd.ydl, 'urlopen', lambda _: FakeResponse()), mock.patch('time.sleep'):
+            # Starts near the live edge and never yields a segment twice
+            self.assertEqual(live_fragments({}), [f'seg{i}.ts' for i in range(12, 19)])
+        playlists = iter([_media_playlist(10, 5, ended=True)])
+        with mock.patch.object(fd.ydl, 'urlopen', lambda _: FakeResponse()), mock.patch('time.sleep'):
+            self.assertEqual(live_fragments({'is_from_start': True}), [f'seg{i}.ts' for i in range(10, 15)])
+        # A media sequence that goes backwards is a reset of the stream, even without a discontinuity
+        playlists = iter([_media_playlist(20, 3), _media_playlist(1, 3), _media_playlist(1, 4, ended=True)])
+        with mock.patch.object(fd.ydl, 'urlopen', lambda _: FakeResponse()), mock.patch('time.sleep'):
+            self.assertEqual(live_fragments({}), [f'seg{i}.ts' for i in (12, 13, 14, 20, 21, 22, 1, 2, 3, 4)])
+
+    def test_select_section_fragments(self):
+        fragments = [{'url': 'init.mp4', 'init': True}, *({'url': f'{i}.m4s', 'duration': 4.0} for i in range(5))]
+        selected, offset = HlsFD._select_section_fragments(fragments, {'section_start': 5, 'section_end': 12})
+        self.assertEqual([f['url'] for f in selected], ['init.mp4', '1.m4s', '2.m4s'])
+        self.assertEqual(offset, 4)
+        selected, offset = HlsFD._select_section_fragments(fragments, {'section_start': 16})
+        self.assertEqual([f['url'] for f in selected], ['init.mp4', '4.m4s'])
+        self.assertEqual(offset, 16)
+        self.assertIsNone(HlsFD._select_section_fragments(
+            [*fragments, {'url': '5.m4s'}], {'section_end': 1}))
+
+    @mock.patch.object(FFmpegFD, 'available', return_value=True)
+    def test_section_downloader_selection(self, _):
+        info_dict = {'url': 'http://127.0.0.1/index.m3u8', 'protocol': 'm3u8_native', 'section_start': 10}
+        self.assertEqual(get_suitable_downloader(info_dict.copy(), {}), HlsFD)
+        self.assertEqual(get_suitable_downloader(info_dict.copy(), {'hls_prefer_native': False}), FFmpegFD)
+        self.assertEqual(get_suitable_downloader({**info_dict, 'is_live': True}, {}), FFmpegFD)
+        self.assertEqual(get_suitable_downloader(info_dict.copy(), {}, to_stdout=True), FFmpegFD)
+
+    def test_live_downloader_selection(self):
+        info_dict = {'url': 'http://127.0.0.1/live.m3u8', 'protocol': 'm3u8_native', 'is_live': True}
+        self.assertEqual(get_suitable_downloader(info_dict.copy(), {}), FFmpegFD)
+        self.assertEqual(get_suitable_downloader(info_dict.copy(), {'external_downloader': 'native'}), HlsFD)
+        self.assertEqual(get_suitable_downloader(info_dict.copy(), {'hls_prefer_native': True}), HlsFD)
+
+
+class TestHlsFDDownload(unittest.TestCase):
+    def setUp(self):
+        self.httpd = http.server.HTTPServer(('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _test_live_download(self, concurrent_fragment_downloads):
+        HTTPTestRequestHandler.playlist_requests = 0
+        filename = f'testlive{concurrent_fragment_downloads}.ts'
+        try_rm(filename)
+        with YoutubeDL({
+            'logger': FakeLogger(),
+            'concurrent_fragment_downloads': concurrent_fragment_downloads,
+        }) as ydl, mock.patch('time.sleep'):
+            fd = HlsFD(ydl, ydl.params)
+            self.assertTrue(fd.real_download(filename, {
+                'id': 'testlive',
+                'url': f'http://127.0.0.1:{self.port}/live.m3u8',
+                'ext': 'ts',
+                'is_live': True,
+            }))
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read().decode().split(), [f'seg{i}.ts' for i in range(12, 19)])
+        try_rm(filename)
+
+    def test_live_download(self):
+        self._test_live_download(1)
+
+    def test_live_download_interrupted(self):
+        HTTPTestRequestHandler.playlist_requests = 0
+        filename = 'testliveinterrupted.ts'
+        try_rm(filename)
+        # Interrupt while waiting for the first playlist refresh, before any fragment has been appended
+        with YoutubeDL({
+            'logger': FakeLogger(),
+            'concurrent_fragment_downloads': 4,
+        }) as ydl, mock.patch('time.sleep', side_effect=KeyboardInterrupt):
+            fd = HlsFD(ydl, ydl.params)
+            self.assertTrue(fd.real_download(filename, {
+                'id': 'testlive',
+                'url': f'http://127.0.0.1:{self.port}/live.m3u8',
+                'ext': 'ts',
+                'is_live': True,
+            }))
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read().decode().split(), [f'seg{i}.ts' for i in range(12, 15)])
+        try_rm(filename)
+
+    def test_live_from_start_download(self):
+        filename = 'testdvr.ts'
+        for live_from_start, expected_segments in ((True, range(8)), (False, range(3, 8))):
+            HTTPTestRequestHandler.dvr_ended = False
+            try_rm(filename)
+            with YoutubeDL({
+                'logger': FakeLogger(),
+                'live_from_start': live_from_start,
+                'hls_prefer_native': True,
+                'outtmpl': filename,
+                'fixup': 'never',
+            }) as ydl, mock.patch('time.sleep'):
+                info = ydl.extract_info(f'http://127.0.0.1:{self.port}/dvr.m3u8')
+            self.assertTrue(info['is_live'])
+            self.assertEqual(bool(info.get('is_from_start')), live_from_start)
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read().decode().split(), [f'seg{i}.ts' for i in expected_segments])
+        try_rm(filename)
+
+    def test_section_download(self):
+        filename = 'testsection.ts'
+        try_rm(filename)
+        with YoutubeDL({'logger': FakeLogger(), 'concurrent_fragment_downloads': 2}) as ydl, \
+                mock.patch.object(HlsFD, '_trim_section', return_value=True) as trim_section:
+            fd = HlsFD(ydl, ydl.params)
+            info_dict = {
+                'id': 'testsection',
+                'url': f'http://127.0.0.1:{self.port}/vod.m3u8',
+                'ext': 'ts',
+                'section_start': 2.5,
+                'section_end': 4.5,
+            }
+            self.assertTrue(fd.real_download(filename, info_dict))
+            trim_section.assert_called_once_with(filename, info_dict, 2.0, [])
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read().decode().split(), ['seg2.ts', 'seg3.ts', 'seg4.ts'])
+        try_rm(filename)
+
+    def test_media_playlist_data_download(self):
+        filename = 'testplaylistdata.ts'
+        try_rm(filename)
+        with YoutubeDL({'logger': FakeLogger()}) as ydl:
+            fd = HlsFD(ydl, ydl.params)
+            # The playlist is not downloaded again, so its URL does not need to be reachable
+            self.assertTrue(fd.real_download(filename, {
+                'id': 'testplaylistdata',
+                'url': f'http://127.0.0.1:{self.port}/missing.m3u8',
+                'ext': 'ts',
+                'hls_media_playlist_data': _media_playlist(3, 4, ended=True),
+            }))
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read().decode().split(), [f'seg{i}.ts' for i in range(3, 7)])
+        try_rm(filename)
+
+    def test_shared_playlist_download(self):
+        filename = 'testsharedplaylist.ts'
+        try_rm(filename)
+        url = f'http://127.0.0.1:{self.port}/shared.m3u8'
+        with YoutubeDL({'logger': FakeLogger()}) as ydl:
+            # As if the playlist had been downloaded during extraction, and redirected
+            ydl._m3u8_playlists[url] = (
+                _media_playlist(3, 4, ended=True), f'http://127.0.0.1:{self.port}/cdn/playlist.m3u8')
+            fd = HlsFD(ydl, ydl.params)
+            self.assertTrue(fd.real_download(filename, {'id': 'testsharedplaylist', 'url': url, 'ext': 'ts'}))
+            # It is taken by the download
+            self.assertNotIn(url, ydl._m3u8_playlists)
+        # The segments are relative to the redirected URL
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read().decode().split(), [f'cdn/seg{i}.ts' for i in range(3, 7)])
+        try_rm(filename)
+
+    def test_live_download_concurrent(self):
+        self._test_live_download(4)
+
+    def test_adaptive_concurrency_download(self):
+        filename = 'testadaptive.ts'
+        try_rm(filename)
+        with YoutubeDL({
+            'logger': FakeLogger(),
+            'concurrent_fragment_downloads': 4,
+            'adaptive_fragment_concurrency': True,
+        }) as ydl, mock.patch.object(HlsFD, 'to_screen') as to_screen:
+            fd = HlsFD(ydl, ydl.params)
+            self.assertTrue(fd.real_download(filename, {
+                'id': 'testadaptive',
+                'url': f'http://127.0.0.1:{self.port}/vod.m3u8',
+                'ext': 'ts',
+            }))
+        self.assertTrue(any(
+            'Adaptive concurrency settled at' in call.args[0] for call in to_screen.call_args_list))
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read().decode().split(), [f'seg{i}.ts' for i in range(10)])
+        try_rm(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
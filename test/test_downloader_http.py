@@ -4,6 +4,7 @@
 import os
 import sys
 import unittest
+from unittest import mock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -15,6 +16,9 @@
 from test.helper import http_server_port, try_rm
 from yt_dlp import YoutubeDL
 from yt_dlp.downloader.http import HttpFD
+from yt_dlp.networking import Response
+from yt_dlp.networking._urllib import UrllibResponseAdapter
+from yt_dlp.utils.ratelimit import RateLimiter
 from yt_dlp.utils._utils import _YDLLogger as FakeLogger
 
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -100,6 +104,37 @@ def test_chunked(self):
             'http_chunk_size': 1000,
         })
 
+    def test_rate_limit(self):
+        with mock.patch.object(RateLimiter, 'consume') as consume:
+            self.download({'ratelimit': 20000, 'buffersize': 8192}, 'regular')
+        # Reads are split to keep the pace smooth
+        self.assertEqual(sum(call.args[0] for call in consume.call_args_list), TEST_SIZE)
+        self.assertLessEqual(max(call.args[0] for call in consume.call_args_list), 2000)
+
+    def test_slow_down(self):
+        with YoutubeDL({'logger': FakeLogger()}) as ydl, \
+                mock.patch.object(RateLimiter, 'consume') as consume:
+            fd = HttpFD(ydl, {'ratelimit': 20000})
+            for start_time, byte_counter in ((1, 1000), (1, 3000), (2, 500)):
+                fd.slow_down(start_time, None, byte_counter)
+        # Only the bytes that are new since the last call of the same download are drawn
+        self.assertEqual([call.args[0] for call in consume.call_args_list], [1000, 2000, 500])
+
+    def test_buffer_reuse(self):
+        buffers = set()
+
+        def spy(readinto):
+            def wrapper(response, b):
+                buffers.add(id(b.obj))
+                return readinto(response, b)
+            return wrapper
+
+        with mock.patch.object(Response, 'readinto', spy(Response.readinto)), \
+                mock.patch.object(UrllibResponseAdapter, 'readinto', spy(UrllibResponseAdapter.readinto)):
+            self.download({'buffersize': 1024, 'noresizebuffer': True}, 'regular')
+        # Every block is read into the same buffer
+        self.assertEqual(len(buffers), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import concurrent.futures
+import http.server
+import subprocess
+import tempfile
+import threading
+
+from test.helper import http_server_port, try_rm
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.downloader.external import FFmpegFD
+from yt_dlp.downloader.merge import FFmpegStreamMergeFD
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
+from yt_dlp.utils import Popen
+from yt_dlp.utils._utils import _YDLLogger as FakeLogger
+
+TEST_DATA = b'video data' * 1000
+
+
+class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
+    # Files served at /files/<name>
+    files = {}
+    # The connection of the first request of /flaky.mp4 is closed halfway through the response
+    flaky_requests = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, content):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        if self.path == '/video.mp4':
+            self._send(TEST_DATA)
+        elif self.path == '/flaky.mp4':
+            type(self).flaky_requests += 1
+            range_start = int(self.headers.get('Range', 'bytes=0-')[6:].partition('-')[0])
+            self.send_response(206 if range_start else 200)
+            self.send_header('Content-Length', str(len(TEST_DATA) - range_start))
+            if range_start:
+                self.send_header('Content-Range', f'bytes {range_start}-{len(TEST_DATA) - 1}/{len(TEST_DATA)}')
+            self.end_headers()
+            self.wfile.write(TEST_DATA[range_start:] if range_start else TEST_DATA[:len(TEST_DATA) // 2])
+        elif self.path.startswith('/files/'):
+            self._send(self.files[self.path[7:]])
+        elif self.path == '/audio.m3u8':
+            self._send(
+                b'#EXTM3U\n#EXT-X-TARGETDURATION:1\n'
+                + b''.join(b'#EXTINF:1.0,\nseg%d.ts\n' % i for i in range(3)) + b'#EXT-X-ENDLIST\n')
+        elif self.path.startswith('/seg'):
+            self._send(self.path[1:].encode() + b'\n')
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+
+@unittest.skipUnless(hasattr(os, 'mkfifo'), 'named pipes are not supported')
+class TestFFmpegStreamMergeFD(unittest.TestCase):
+    def setUp(self):
+        self.httpd = http.server.HTTPServer(('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _info_dict(self):
+        base_url = f'http://127.0.0.1:{self.port}'
+        requested_formats = [{
+            'format_id': 'video',
+            'url': f'{base_url}/video.mp4',
+            'protocol': 'http',
+            'ext': 'mp4',
+        }, {
+            'format_id': 'audio',
+            'url': f'{base_url}/audio.m3u8',
+            'protocol': 'm3u8_native',
+            'ext': 'mp4',
+        }]
+        return {
+            'id': 'test',
+            'ext': 'mp4',
+            'protocol': 'http+m3u8_native',
+            'url': '\n'.join(f['url'] for f in requested_formats),
+            'requested_formats': requested_formats,
+        }
+
+    @mock.patch.object(FFmpegFD, 'available', return_value=True)
+    def test_downloader_selection(self, _):
+        info_dict = self._info_dict()
+        self.assertIsNone(get_suitable_downloader(info_dict.copy(), {'hls_prefer_native': True}))
+        self.assertEqual(get_suitable_downloader(
+            info_dict.copy(), {'hls_prefer_native': True, 'stream_merge': True}), FFmpegStreamMergeFD)
+        self.assertIsNone(get_suitable_downloader(
+            {**info_dict, 'is_live': True}, {'hls_prefer_native': True, 'stream_merge': True}))
+
+    def _download(self, info_dict, params={}):
+        received = {}
+
+        def call_ffmpeg(fd, tmpfilename, info_dict):
+            # Stands in for ffmpeg by reading every input pipe concurrently
+            def read_pipe(fmt):
+                with open(fmt['url'], 'rb') as f:
+                    received[fmt['format_id']] = f.read()
+
+            proc = mock.Mock(**{'poll.return_value': None})
+            with concurrent.futures.ThreadPoolExecutor() as pool:
+                futures = [pool.submit(read_pipe, fmt) for fmt in info_dict['requested_formats']]
+                fd.on_process_started(proc, None)
+                for future in futures:
+                    future.result()
+            return 0
+
+        with YoutubeDL({'logger': FakeLogger(), 'hls_prefer_native': True, **params}) as ydl, \
+                mock.patch.object(FFmpegFD, '_call_downloader', call_ffmpeg):
+            fd = FFmpegStreamMergeFD(ydl, ydl.params)
+            self.assertEqual(fd._call_downloader('test.mp4', info_dict), 0)
+        return received
+
+    def test_download(self):
+        self.assertEqual(self._download(self._info_dict()), {
+            'video': TEST_DATA,
+            'audio': b'seg0.ts\nseg1.ts\nseg2.ts\n',
+        })
+
+    def test_download_retry(self):
+        HTTPTestRequestHandler.flaky_requests = 0
+        info_dict = self._info_dict()
+        info_dict['requested_formats'][0]['url'] = f'http://127.0.0.1:{self.port}/flaky.mp4'
+        # The interrupted format continues where it stopped instead of being written to the pipe again
+        with mock.patch('time.sleep'):
+            received = self._download(info_dict, {'retries': 1})
+        self.assertEqual(HTTPTestRequestHandler.flaky_requests, 2)
+        self.assertEqual(received['video'], TEST_DATA)
+
+    @unittest.skipUnless(FFmpegFD.available(), 'ffmpeg not found')
+    def test_ffmpeg_merge(self):
+        ffmpeg = FFmpegPostProcessor().executable
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, args in (
+                ('video.mp4', ['-f', 'lavfi', '-i', 'testsrc=duration=1:size=64x64:rate=10',
+                               '-c:v', 'mpeg4', '-movflags', '+faststart']),
+                ('audio.m4a', ['-f', 'lavfi', '-i', 'sine=duration=1', '-c:a', 'aac', '-movflags', '+faststart']),
+            ):
+                path = os.path.join(tmpdir, name)
+                Popen.run([ffmpeg, '-y', *args, path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                with open(path, 'rb') as f:
+                    HTTPTestRequestHandler.files[name] = f.read()
+
+        info_dict = self._info_dict()
+        for fmt, name in zip(info_dict['requested_formats'], ('video.mp4', 'audio.m4a'), strict=True):
+            fmt.update({'url': f'http://127.0.0.1:{self.port}/files/{name}', 'protocol': 'http'})
+        info_dict['protocol'] = 'http+http'
+        filename = 'test_stream_merge.mp4'
+        try_rm(filename)
+        with YoutubeDL({'logger': FakeLogger()}) as ydl:
+            self.assertTrue(FFmpegStreamMergeFD(ydl, ydl.params).real_download(filename, info_dict))
+        _, stderr, _ = Popen.run([ffmpeg, '-hide_banner', '-i', filename], text=True, stderr=subprocess.PIPE)
+        try_rm(filename)
+        self.assertIn('Video: mpeg4', stderr)
+        self.assertIn('Audio: aac', stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
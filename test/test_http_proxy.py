@@ -16,8 +16,10 @@
 from test.test_networking import TEST_DIR
 from test.test_socks import IPv6ThreadingTCPServer
 from yt_dlp.dependencies import urllib3
-from yt_dlp.networking import Request
+from yt_dlp.networking import Request, RequestDirector
+from yt_dlp.networking._proxy_pool import ProxyPool
 from yt_dlp.networking.exceptions import HTTPError, ProxyError, SSLError
+from yt_dlp.utils._utils import _YDLLogger as FakeLogger
 
 
 class HTTPProxyAuthMixin:
@@ -330,6 +332,17 @@ def test_http_with_idn(self, handler, ctx):
                 assert proxy_info['path'].startswith('http://xn--fiq228c.tw')
                 assert proxy_info['headers']['Host'].split(':', 1)[0] == 'xn--fiq228c.tw'
 
+    def test_http_proxy_pool(self, handler, ctx):
+        with ctx.http_server(HTTPProxyHandler) as first, ctx.http_server(HTTPProxyHandler) as second:
+            director = RequestDirector(
+                logger=FakeLogger(), proxy_pool=ProxyPool([f'http://{first}', f'http://{second}']))
+            director.add_handler(handler())
+            with contextlib.closing(director):
+                used = [
+                    json.loads(director.send(Request('http://127.0.0.1:40000/proxy_info')).read().decode())['proxy']
+                    for _ in range(3)]
+            assert used == [first, second, first]
+
 
 @pytest.mark.parametrize(
     'handler,ctx', [
@@ -0,0 +1,100 @@
+import shutil
+
+import pytest
+
+from yt_dlp.extractor.youtube.jsc._builtin.worker import JsRuntimeWorker
+from yt_dlp.extractor.youtube.jsc.provider import JsChallengeProviderError
+
+_node_path = shutil.which('node')
+pytestmark = pytest.mark.skipif(not _node_path, reason='node not available')
+
+# Stand-in for the solver: "preprocessing" counts the preprocessed players, solving reverses the challenges
+FAKE_SOLVER = '''
+var preprocessCount = 0;
+var jsc = (input) => {
+  if (input.player === 'invalid') {
+    throw new Error('invalid player');
+  }
+  if (input.player === 'crash') {
+    process.exit(3);
+  }
+  const preprocessed = input.type === 'player' ? `${input.player}:${++preprocessCount}` : input.preprocessed_player;
+  const output = {
+    type: 'result',
+    responses: input.requests.map((request) => ({
+      type: 'result',
+      data: Object.fromEntries(request.challenges.map((challenge) => [challenge, `${preprocessed}:${[...challenge].reverse().join('')}`])),
+    })),
+  };
+  if (input.type === 'player' && input.output_preprocessed) {
+    output.preprocessed_player = preprocessed;
+  }
+  return output;
+};
+'''
+
+REQUESTS = [{'type': 'n', 'challenges': ['abc', 'de']}, {'type': 'sig', 'challenges': ['fg']}]
+
+
+@pytest.fixture
+def worker(logger):
+    worker = JsRuntimeWorker(
+        lambda script_path: [_node_path, script_path], FAKE_SOLVER, name='node', logger=logger)
+    yield worker
+    worker.close()
+
+
+def player_input(player):
+    return {'type': 'player', 'player': player}
+
+
+def test_solve(worker):
+    assert worker.solve('a', player_input('A'), REQUESTS) == {'type': 'result', 'responses': [
+        {'type': 'result', 'data': {'abc': 'A:1:cba', 'de': 'A:1:ed'}},
+        {'type': 'result', 'data': {'fg': 'A:1:gf'}},
+    ]}
+
+
+def test_players_stay_loaded(worker):
+    process = None
+    for player_id, player, expected in [
+        ('a', 'A', 'A:1:cba'),
+        ('b', 'B', 'B:2:cba'),
+        # The loaded players are reused, even if their input is not sent again
+        ('a', 'A', 'A:1:cba'),
+        ('b', None, 'B:2:cba'),
+    ]:
+        output = worker.solve(player_id, player_input(player), REQUESTS[:1])
+        assert output['responses'][0]['data']['abc'] == expected
+        assert process in (None, worker._process)
+        process = worker._process
+
+
+def test_preprocessed_player(worker):
+    output = worker.solve('a', {**player_input('A'), 'output_preprocessed': True}, REQUESTS[:1])
+    assert output['preprocessed_player'] == 'A:1'
+    output = worker.solve('b', {'type': 'preprocessed', 'preprocessed_player': 'B:9'}, REQUESTS[:1])
+    assert output['responses'][0]['data']['abc'] == 'B:9:cba'
+    assert 'preprocessed_player' not in worker.solve('c', player_input('C'), REQUESTS[:1])
+
+
+def test_solver_error(worker):
+    output = worker.solve('a', player_input('invalid'), REQUESTS)
+    assert output['type'] == 'error'
+    assert output['error'].startswith('invalid player\n')
+    # The worker keeps running after an error in the solver
+    process = worker._process
+    assert worker.solve('b', player_input('B'), REQUESTS)['type'] == 'result'
+    assert worker._process is process
+
+
+def test_restart(worker):
+    worker.solve('a', player_input('A'), REQUESTS)
+    worker._process.kill()
+    worker._process.wait()
+    # The player is loaded again by the new process
+    assert worker.solve('a', player_input('A'), REQUESTS[:1])['responses'][0]['data']['abc'] == 'A:1:cba'
+
+    with pytest.raises(JsChallengeProviderError, match=r'returncode: 3'):
+        worker.solve('b', player_input('crash'), REQUESTS)
+    assert worker.solve('c', player_input('C'), REQUESTS[:1])['responses'][0]['data']['abc'] == 'C:1:cba'
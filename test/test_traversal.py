@@ -6,12 +6,14 @@
 
 from yt_dlp.utils import (
     ExtractorError,
+    HTMLDocument,
     determine_ext,
     dict_get,
     int_or_none,
     join_nonempty,
     str_or_none,
 )
+from yt_dlp.utils import traversal
 from yt_dlp.utils.traversal import (
     find_element,
     find_elements,
@@ -440,6 +442,43 @@ def test_traversal_filter(self):
         assert traverse_obj(data, [..., filter]) == [True, 1, 1.1, 'str', {0: 0}, [1]], \
             '`filter` should filter falsy values'
 
+    def test_traversal_compiled_paths(self):
+        data = {'a': [{'b': 'c'}, {'b': {}}], 'd': 0}
+        path = ('a', -2, 'b')
+
+        for _ in range(2):
+            assert traverse_obj(data, path) == 'c', \
+                'cached paths should give the same result'
+            assert traverse_obj(data, ('a', 1, 'b')) is None, \
+                '`{}` should be discarded by plain lookups'
+            assert traverse_obj(data, ('a', 2, 'b')) is None, \
+                'out of range indices should be discarded by plain lookups'
+            assert traverse_obj(data, 'd', expected_type=int) == 0, \
+                '`expected_type` should apply to plain lookups'
+            assert traverse_obj(data, ('A', 0, 'B'), casesense=False) == 'c', \
+                'cached paths should respect `casesense`'
+            assert traverse_obj(data, ('d', 0), traverse_string=True) == '0', \
+                'cached paths should respect `traverse_string`'
+        assert id(path) in traversal._compiled_paths, \
+            'literal paths should be cached once they are seen again'
+
+        path = ['a', 0]
+        assert traverse_obj(data, path) == {'b': 'c'}
+        path.append('b')
+        assert traverse_obj(data, path) == 'c', \
+            'mutable paths should not be cached'
+
+        with pytest.raises(TypeError):
+            traverse_obj(data, ('a', lambda x: True))
+
+        name = 'a'
+        compiled_paths = dict(traversal._compiled_paths)
+        for _ in range(3):
+            traverse_obj(data, (f'{name}', 0, 'b'))
+            traverse_obj(data, ('a', (0, lambda _, v: v), 'b'))
+        assert traversal._compiled_paths == compiled_paths, \
+            'paths built on each call should not be cached'
+
 
 class TestTraversalHelpers:
     def test_traversal_require(self):
@@ -570,7 +609,8 @@ def test_unpack(self):
         with pytest.raises(TypeError):
             unpack()
 
-    def test_find_element(self):
+    @pytest.mark.parametrize('html', [_TEST_HTML, HTMLDocument(_TEST_HTML)], ids=['str', 'HTMLDocument'])
+    def test_find_element(self, html):
         for improper_kwargs in [
             dict(attr='data-id'),
             dict(value='y'),
@@ -581,21 +621,22 @@ def test_find_element(self):
             dict(cls='[ab]', regex=True),
         ]:
             with pytest.raises(AssertionError):
-                find_element(**improper_kwargs)(_TEST_HTML)
-
-        assert find_element(cls='a')(_TEST_HTML) == '1'
-        assert find_element(cls='a', html=True)(_TEST_HTML) == '<div class="a">1</div>'
-        assert find_element(id='x')(_TEST_HTML) == '2'
-        assert find_element(id='[ex]')(_TEST_HTML) is None
-        assert find_element(id='[ex]', regex=True)(_TEST_HTML) == '2'
-        assert find_element(id='x', html=True)(_TEST_HTML) == '<div class="a" id="x" custom="z">2</div>'
-        assert find_element(attr='data-id', value='y')(_TEST_HTML) == '3'
-        assert find_element(attr='data-id', value='y(?:es)?')(_TEST_HTML) is None
-        assert find_element(attr='data-id', value='y(?:es)?', regex=True)(_TEST_HTML) == '3'
+                find_element(**improper_kwargs)(html)
+
+        assert find_element(cls='a')(html) == '1'
+        assert find_element(cls='a', html=True)(html) == '<div class="a">1</div>'
+        assert find_element(id='x')(html) == '2'
+        assert find_element(id='[ex]')(html) is None
+        assert find_element(id='[ex]', regex=True)(html) == '2'
+        assert find_element(id='x', html=True)(html) == '<div class="a" id="x" custom="z">2</div>'
+        assert find_element(attr='data-id', value='y')(html) == '3'
+        assert find_element(attr='data-id', value='y(?:es)?')(html) is None
+        assert find_element(attr='data-id', value='y(?:es)?', regex=True)(html) == '3'
         assert find_element(
-            attr='data-id', value='y', html=True)(_TEST_HTML) == '<div class="b" data-id="y" custom="z">3</div>'
+            attr='data-id', value='y', html=True)(html) == '<div class="b" data-id="y" custom="z">3</div>'
 
-    def test_find_elements(self):
+    @pytest.mark.parametrize('html', [_TEST_HTML, HTMLDocument(_TEST_HTML)], ids=['str', 'HTMLDocument'])
+    def test_find_elements(self, html):
         for improper_kwargs in [
             dict(tag='p'),
             dict(attr='data-id'),
@@ -605,14 +646,14 @@ def test_find_elements(self):
             dict(cls='[ab]', regex=True),
         ]:
             with pytest.raises(AssertionError):
-                find_elements(**improper_kwargs)(_TEST_HTML)
+                find_elements(**improper_kwargs)(html)
 
-        assert find_elements(cls='a')(_TEST_HTML) == ['1', '2', '4']
-        assert find_elements(cls='a', html=True)(_TEST_HTML) == [
+        assert find_elements(cls='a')(html) == ['1', '2', '4']
+        assert find_elements(cls='a', html=True)(html) == [
             '<div class="a">1</div>', '<div class="a" id="x" custom="z">2</div>', '<p class="a">4</p>']
-        assert find_elements(attr='custom', value='z')(_TEST_HTML) == ['2', '3']
-        assert find_elements(attr='custom', value='[ez]')(_TEST_HTML) == []
-        assert find_elements(attr='custom', value='[ez]', regex=True)(_TEST_HTML) == ['2', '3', '5']
+        assert find_elements(attr='custom', value='z')(html) == ['2', '3']
+        assert find_elements(attr='custom', value='[ez]')(html) == []
+        assert find_elements(attr='custom', value='[ez]', regex=True)(html) == ['2', '3', '5']
 
 
 class TestDictGet:
@@ -10,6 +10,7 @@
 import contextlib
 import datetime as dt
 import io
+import functools
 import itertools
 import json
 import ntpath
@@ -26,10 +27,14 @@
 )
 from yt_dlp.utils import (
     Config,
+    DashFragments,
     DateRange,
     ExtractorError,
+    HTMLDocument,
     InAdvancePagedList,
     LazyList,
+    LenientJSONDecoder,
+    M3U8Playlist,
     NO_DEFAULT,
     OnDemandPagedList,
     Popen,
@@ -60,6 +65,7 @@
     get_compatible_ext,
     get_element_by_attribute,
     get_element_by_class,
+    get_element_by_id,
     get_element_html_by_attribute,
     get_element_html_by_class,
     get_element_text_and_html_by_tag,
@@ -144,6 +150,7 @@
     normalize_url,
     remove_dot_segments,
 )
+from yt_dlp.utils.ratelimit import RateLimiter
 
 
 class TestUtil(unittest.TestCase):
@@ -1318,6 +1325,20 @@ def test_js_to_json_common_constructors(self):
         self.assertEqual(json.loads(js_to_json('new Date("123")')), '123')
         self.assertEqual(json.loads(js_to_json('new Date(\'2023-10-19\')')), '2023-10-19')
 
+    def test_js_to_json_json_passthrough(self):
+        # Valid JSON is parsed without being converted first
+        parse = functools.partial(json.loads, cls=LenientJSONDecoder, transform_source=js_to_json)
+        for code in ('{"a": [1, -2.5e3, true, null], "b": {"c": "\\u00e9\\/\\n"}}', '[]', '"Array(5)"', ' 0 '):
+            self.assertEqual(parse(code), json.loads(code))
+        self.assertEqual(parse(' [1, 2] x', ignore_extra=True), [1, 2])
+        self.assertEqual(parse('[NaN, Infinity]'), ['NaN', 'Infinity'])
+        self.assertEqual(js_to_json('[NaN, Infinity]'), '["NaN", "Infinity"]')
+        self.assertRaises(ValueError, js_to_json, '[NaN]', strict=True)
+        self.assertEqual(
+            js_to_json('{"a": [1, 2.5, "x"], b: \'y\', "c": {"d": true, e: 0x10,},}'),
+            '{"a": [1, 2.5, "x"], "b": "y", "c": {"d": true, "e": 16}}')
+        self.assertEqual(js_to_json('{"a": 1, 2: 3, "b": 4e2}'), '{"a": 1, "2": 3, "b": 4e2}')
+
     def test_extract_attributes(self):
         self.assertEqual(extract_attributes('<e x="y">'), {'x': 'y'})
         self.assertEqual(extract_attributes("<e x='y'>"), {'x': 'y'})
@@ -1927,6 +1948,135 @@ def test_get_element_text_and_html_by_tag(self):
             (self.GET_ELEMENT_BY_TAG_RES_INNERSPAN_TEXT, self.GET_ELEMENT_BY_TAG_RES_INNERSPAN_HTML))
         self.assertRaises(compat_HTMLParseError, get_element_text_and_html_by_tag, 'article', html)
 
+    def test_dash_fragments(self):
+        template = DashFragments.from_template(
+            'seg-%(Number)d-%(Time)d-%(Bandwidth)d.m4s', 'path', [[1, 0, 4, 2], [3, 10, 2, 3], [6, 20, 1, 0]],
+            bandwidth=500, timescale=2)
+        expected = [
+            {'path': 'seg-1-0-500.m4s', 'duration': 2.0},
+            {'path': 'seg-2-4-500.m4s', 'duration': 2.0},
+            {'path': 'seg-3-10-500.m4s', 'duration': 1.0},
+            {'path': 'seg-4-12-500.m4s', 'duration': 1.0},
+            {'path': 'seg-5-14-500.m4s', 'duration': 1.0},
+        ]
+        self.assertEqual(list(template), expected)
+        self.assertEqual(len(template), 5)
+        self.assertEqual([template[i] for i in range(-5, 5)], expected * 2)
+        self.assertEqual(template[1:4], expected[1:4])
+        self.assertEqual(template[::-2], expected[::-2])
+        self.assertRaises(IndexError, template.__getitem__, 5)
+        self.assertRaises(IndexError, template.__getitem__, -6)
+
+        fragments = DashFragments([{'url': 'https://example.com/init.mp4'}])
+        fragments.extend(template)
+        fragments.extend([{'path': 'last.m4s', 'duration': 3.0}])
+        fragments.extend(DashFragments())
+        self.assertEqual(len(fragments), 7)
+        self.assertEqual(fragments[0], {'url': 'https://example.com/init.mp4'})
+        self.assertEqual(fragments[5], expected[-1])
+        self.assertEqual(fragments[-1], {'path': 'last.m4s', 'duration': 3.0})
+        self.assertEqual(list(fragments), [fragments[0], *expected, fragments[-1]])
+
+        serialized = json.loads(json.dumps(fragments.to_json()))
+        self.assertEqual(len(serialized['dash_fragments']), 3)
+        self.assertEqual(list(DashFragments.from_json(serialized)), list(fragments))
+        self.assertEqual(DashFragments(expected).to_json(), expected)
+        self.assertIs(DashFragments.from_json(expected), expected)
+
+    def test_m3u8_playlist(self):
+        master = M3U8Playlist.parse(
+            '#EXTM3U\n#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aac",NAME="English",URI="audio.m3u8"\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=1280000,CODECS="avc1.4d401f,mp4a.40.2",AUDIO="aac"\n'
+            'low.m3u8\n\n#EXT-X-STREAM-INF:BANDWIDTH=2560000\n  high.m3u8  \n')
+        self.assertTrue(master.is_master)
+        self.assertEqual(master.media, [{'TYPE': 'AUDIO', 'GROUP-ID': 'aac', 'NAME': 'English', 'URI': 'audio.m3u8'}])
+        self.assertEqual(master.variants, [
+            ({'BANDWIDTH': '1280000', 'CODECS': 'avc1.4d401f,mp4a.40.2', 'AUDIO': 'aac'}, 'low.m3u8'),
+            ({'BANDWIDTH': '2560000'}, 'high.m3u8'),
+        ])
+        self.assertEqual(master.segments, [])
+
+        data = (
+            '#EXTM3U\n#EXT-X-TARGETDURATION:6\n#EXT-X-MEDIA-SEQUENCE:10\n#EXT-X-PLAYLIST-TYPE:VOD\n'
+            '#EXT-X-MAP:URI="init.mp4",BYTERANGE="720@0"\n#EXTINF:6.0,\n#EXT-X-BYTERANGE:1000@720\nmedia.mp4\n'
+            '#EXT-X-KEY:METHOD=AES-128,URI="key.bin"\n#EXTINF:5.5,\n#EXT-X-BYTERANGE:500\nmedia.mp4\n'
+            '#EXT-X-DISCONTINUITY\n#UPLYNK-SEGMENT:1,00000000,ad\n#EXTINF:2,\nad.ts\n'
+            '#UPLYNK-SEGMENT:2,00000000,segment\n#EXTINF:4,\nlast.ts\n')
+        playlist = M3U8Playlist.parse(data)
+        self.assertFalse(playlist.is_master)
+        self.assertFalse(playlist.is_live)
+        self.assertEqual(playlist.target_duration, 6.0)
+        self.assertEqual(playlist.media_sequence, 10)
+        self.assertEqual(playlist.discontinuity_sequence, 0)
+        self.assertEqual(playlist.discontinuities, 1)
+        self.assertEqual(playlist.tags['EXTINF'], ['6.0,', '5.5,', '2,', '4,'])
+        self.assertEqual(playlist.variants, [])
+        key = {'METHOD': 'AES-128', 'URI': 'key.bin'}
+        self.assertEqual(playlist.segments, [
+            M3U8Playlist.Segment('init.mp4', None, (0, 720), None, None, 0, False, True),
+            M3U8Playlist.Segment('media.mp4', 6.0, (720, 1720), None, 10, 0, False, False),
+            M3U8Playlist.Segment('media.mp4', 5.5, (1720, 2220), key, 11, 0, False, False),
+            M3U8Playlist.Segment('ad.ts', 2.0, None, key, 12, 1, True, False),
+            M3U8Playlist.Segment('last.ts', 4.0, None, key, 13, 1, False, False),
+        ])
+        self.assertTrue(M3U8Playlist.parse(data.replace('#EXT-X-PLAYLIST-TYPE:VOD', '')).is_live)
+
+        # Media playlists without EXT-X-TARGETDURATION are recognized by their segments
+        playlist = M3U8Playlist.parse('#EXTM3U\n#EXTINF:4,\na.ts\n#EXTINF:4,\nb.ts\n#EXT-X-ENDLIST\n')
+        self.assertFalse(playlist.is_master)
+        self.assertEqual([segment.uri for segment in playlist.segments], ['a.ts', 'b.ts'])
+        self.assertEqual(playlist.variants, [])
+        self.assertTrue(M3U8Playlist.parse('#EXTM3U\n').is_master)
+
+    def test_html_document(self):
+        for html in (
+                self.GET_ELEMENT_BY_CLASS_TEST_STRING, self.GET_ELEMENT_BY_ATTRIBUTE_TEST_STRING,
+                self.GET_ELEMENTS_BY_CLASS_TEST_STRING, self.GET_ELEMENT_BY_TAG_TEST_STRING):
+            document = HTMLDocument(html)
+            self.assertEqual(document, html)
+            for func, args in (
+                    (get_elements_by_class, ('foo',)),
+                    (get_elements_html_by_class, ('bar',)),
+                    (get_elements_by_attribute, ('class', 'foo bar')),
+                    (get_elements_html_by_attribute, ('itemprop', 'author')),
+                    (get_elements_by_attribute, ('class', r'fo+\s[^"]+', {'escape_value': False})),
+                    (get_elements_by_attribute, ('class', 'foo bar', {'tag': 'div'})),
+                    (get_element_text_and_html_by_tag, ('div',)),
+                    (extract_attributes, ())):
+                args, kwargs = (args[:-1], args[-1]) if args and isinstance(args[-1], dict) else (args, {})
+                try:
+                    expected = func(*args, html, **kwargs)
+                except compat_HTMLParseError:
+                    self.assertRaises(compat_HTMLParseError, func, *args, document, **kwargs)
+                else:
+                    self.assertEqual(func(*args, document, **kwargs), expected, msg=f'{func.__name__}{args}')
+
+        document = HTMLDocument(
+            '<div class="a b" id=x>1<div class="a">2</div><br/><img class="a" src="c.jpg" /></div>'
+            '<p title=\'say "hi"\'>3<p data-x="&amp;">4</p></p><span class="z">')
+        self.assertEqual(get_elements_by_class('a', document), ['1<div class="a">2</div><br/><img class="a" src="c.jpg" />', '2', ''])
+        self.assertEqual(get_element_by_id('x', document), '1<div class="a">2</div><br/><img class="a" src="c.jpg" />')
+        self.assertEqual(get_element_by_attribute('title', 'say "hi"', document), '3<p data-x="&">4</p>')
+        self.assertEqual(get_element_html_by_attribute('data-x', '&amp;', document), '<p data-x="&amp;">4</p>')
+        self.assertEqual(get_element_by_attribute('class', 'a', document, tag='img'), '')
+        self.assertEqual(extract_attributes(document), {'class': 'a b', 'id': 'x'})
+        self.assertIsNone(get_element_by_class('c', document))
+        self.assertRaises(compat_HTMLParseError, get_element_text_and_html_by_tag, 'span', document)
+
+        # Raw text elements and comments do not contain elements
+        document = HTMLDocument(
+            '<div class="a"><script>var s="</div>";</script>x</div>'
+            '<!-- <p class="a">y</p> </div> --><STYLE>.a::after { content: "<b>" }</style>'
+            '<textarea id="t"><span class="a">z</span></TEXTAREA><span class="voters count">5</span>')
+        self.assertEqual(get_elements_by_class('a', document), ['<script>var s="</div>";</script>x'])
+        self.assertEqual(get_element_by_id('t', document), '<span class="a">z</span>')
+        self.assertEqual(get_element_text_and_html_by_tag('script', document), ('var s="</div>";', '<script>var s="</div>";</script>'))
+        self.assertRaises(compat_HTMLParseError, get_element_text_and_html_by_tag, 'p', document)
+        self.assertRaises(compat_HTMLParseError, get_element_text_and_html_by_tag, 'b', document)
+        # Sequences of class names are matched like with plain strings
+        self.assertEqual(get_element_by_class('voters count', document), '5')
+        self.assertEqual(get_element_by_class('voters count', str(document)), '5')
+
     def test_iri_to_uri(self):
         self.assertEqual(
             iri_to_uri('https://www.google.com/search?q=foo&ie=utf-8&oe=utf-8&client=firefox-b'),
@@ -2286,6 +2436,26 @@ def test(inp):
         test(self._JWT_WITH_REORDERED_HEADERS_AND_RS256_ALG)
         test(self._JWT_WITH_EXTRA_HEADERS_AND_ES256_ALG)
 
+    @unittest.mock.patch('time.monotonic', return_value=100)
+    def test_rate_limiter(self, monotonic):
+        self.assertIsNone(RateLimiter.shared(None, None))
+        self.assertIs(RateLimiter.shared(10000), RateLimiter.shared(10000))
+
+        limiter = RateLimiter(10000)
+        self.assertEqual(limiter.max_block_size, 1024)
+        # The burst is available at once, after which the transfers are paced at the rate
+        self.assertEqual(limiter.delay(1024), 0)
+        self.assertEqual(limiter.delay(1000), 0.1)
+        self.assertEqual(limiter.delay(1000), 0.2)
+        monotonic.return_value = 100.2
+        self.assertEqual(limiter.delay(0), 0)
+
+        limiter = RateLimiter(10000, host_rate=5000)
+        # Every host has its own limit, but the total rate is shared by the hosts
+        self.assertEqual(limiter.delay(1024 + 500, 'https://a.example/1'), 0.1)
+        self.assertEqual(limiter.delay(1024 + 500, 'https://b.example/1'), 0.2024)
+        self.assertEqual(limiter.delay(500, 'https://a.example/2'), 0.2524)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,12 +4,17 @@
 import os
 import sys
 import unittest
+from unittest import mock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import tempfile
+import threading
 
+from test.helper import FakeYDL
 from yt_dlp.extractor import YoutubeIE
 from yt_dlp.extractor.youtube._base import YoutubeBaseInfoExtractor
+from yt_dlp.extractor.youtube._video import STREAMING_DATA_CLIENT_NAME
 
 
 class TestYoutubeMisc(unittest.TestCase):
@@ -58,6 +63,88 @@ def test_extract_relative_time(self):
         for unit in YoutubeBaseInfoExtractor._RELATIVE_TIME_UNIT_MAP:
             self.assertIsNotNone(ert(f'1 {unit} ago'), f'unit {unit!r} did not parse')
 
+    def test_extract_player_responses(self):
+        ie = YoutubeIE(FakeYDL({'concurrent_requests': 3}))
+        # The requested clients must all be waiting for their player responses at the same time
+        barrier = threading.Barrier(3, timeout=5)
+
+        def extract_player_response(client, video_id, **kwargs):
+            if client != 'web_embedded':
+                barrier.wait()
+            playability_status = {'status': 'OK'}
+            if client == 'tv':
+                playability_status['desktopLegacyAgeGateReason'] = 1
+            return {'videoDetails': {'videoId': video_id}, 'playabilityStatus': playability_status}
+
+        with mock.patch.multiple(
+                ie, _download_ytcfg=mock.Mock(return_value={}), _download_player_url=mock.Mock(return_value=None),
+                fetch_po_token=mock.Mock(return_value=None), _extract_player_response=extract_player_response):
+            prs, _ = ie._extract_player_responses(
+                ['tv', 'web_safari', 'android_vr'], 'BaW_jenozKc', None, 'web', {}, False)
+        # The client added for the age-gated response comes right after it
+        self.assertEqual(
+            [pr['streamingData'][STREAMING_DATA_CLIENT_NAME] for pr in prs], ['tv', 'web_embedded', 'web_safari', 'android_vr'])
+
+    def test_extract_player_responses_prerequisites(self):
+        ie = YoutubeIE(FakeYDL({'concurrent_requests': 3}))
+        ytcfgs = {'web_safari': {'VISITOR_DATA': 'safari'}, 'android_vr': {'VISITOR_DATA': 'android_vr'}}
+        po_token_threads, visitor_data = [], {}
+
+        def fetch_po_token(**kwargs):
+            po_token_threads.append(threading.current_thread())
+
+        def extract_player_response(client, video_id, **kwargs):
+            visitor_data[client] = kwargs['visitor_data']
+            playability_status = {'status': 'OK'}
+            if client == 'tv':
+                playability_status['desktopLegacyAgeGateReason'] = 1
+            return {'videoDetails': {'videoId': video_id}, 'playabilityStatus': playability_status}
+
+        with mock.patch.multiple(
+                ie, _download_ytcfg=lambda client, video_id: ytcfgs.get(client, {}),
+                _download_player_url=mock.Mock(return_value=None), fetch_po_token=fetch_po_token,
+                _extract_player_response=extract_player_response):
+            ie._extract_player_responses(['tv', 'web_safari', 'android_vr'], 'BaW_jenozKc', None, 'web', {}, False)
+        # The PO tokens are only fetched on the calling thread
+        self.assertEqual(po_token_threads, [threading.current_thread()] * 4)
+        # The visitor data comes from the first client config that has it, whatever the batch
+        self.assertEqual(visitor_data, {
+            'tv': None, 'web_safari': 'safari', 'android_vr': 'safari', 'web_embedded': 'safari'})
+
+    @mock.patch.multiple(YoutubeIE, _PLAYER_DATA_CACHE_MAX_PLAYERS=2, _PLAYER_DATA_CACHE_MAX_ENTRIES=2)
+    def test_player_data_cache(self):
+        player_url = 'https://www.youtube.com/s/player/{}/player_ias.vflset/en_US/base.js'.format
+
+        with tempfile.TemporaryDirectory() as cachedir:
+            ie = YoutubeIE(FakeYDL({'cachedir': cachedir}))
+            ie._store_player_data_to_cache(12345, 'sts', player_url('00000001'), use_disk_cache=True)
+            # The results of a solve are written to the disk cache at once
+            with mock.patch.object(ie.cache, 'update', wraps=ie.cache.update) as update:
+                ie._store_player_data_list_to_cache(
+                    'n', player_url('00000001'), {(challenge,): challenge.upper() for challenge in 'abc'}, use_disk_cache=True)
+            update.assert_called_once()
+            ie._store_player_data_to_cache('X', 'n', player_url('00000002'), 'x')
+
+            # Another process shares the data stored on disk
+            other_ie = YoutubeIE(FakeYDL({'cachedir': cachedir}))
+            load = lambda ie, *args: ie._load_player_data_from_cache(*args, use_disk_cache=True)
+            self.assertEqual(load(other_ie, 'sts', player_url('00000001')), 12345)
+            # Only the most recently stored entries of a player are kept
+            self.assertEqual(
+                [load(other_ie, 'n', player_url('00000001'), challenge) for challenge in ('a', 'b', 'c')], [None, 'B', 'C'])
+            self.assertIsNone(load(other_ie, 'n', player_url('00000002'), 'x'))
+
+            # The data of the older players is evicted by newer ones
+            other_ie._store_player_data_to_cache('D', 'n', player_url('00000002'), 'd', use_disk_cache=True)
+            other_ie._store_player_data_to_cache('E', 'n', player_url('00000003'), 'e', use_disk_cache=True)
+            new_ie = YoutubeIE(FakeYDL({'cachedir': cachedir}))
+            self.assertIsNone(load(new_ie, 'n', player_url('00000001'), 'c'))
+            self.assertEqual(load(new_ie, 'n', player_url('00000002'), 'd'), 'D')
+            self.assertEqual(load(new_ie, 'n', player_url('00000003'), 'e'), 'E')
+            # The first instance still has its data in memory, and sees the data stored since by others
+            self.assertEqual(load(ie, 'n', player_url('00000001'), 'c'), 'C')
+            self.assertEqual(load(ie, 'n', player_url('00000003'), 'e'), 'E')
+
 
 if __name__ == '__main__':
     unittest.main()
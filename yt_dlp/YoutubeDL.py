@@ -28,7 +28,7 @@
 from .compat import urllib  # isort: split
 from .compat import urllib_req_to_req
 from .cookies import CookieLoadError, LenientSimpleCookie, load_cookies
-from .downloader import FFmpegFD, get_suitable_downloader, shorten_protocol_name
+from .downloader import DashSegmentsFD, FFmpegFD, HlsFD, get_suitable_downloader, shorten_protocol_name
 from .downloader.rtmp import rtmpdump_version
 from .extractor import gen_extractor_classes, get_info_extractor, import_extractors
 from .extractor.common import UnsupportedURLIE
@@ -48,6 +48,10 @@
 from .minicurses import format_text
 from .networking import HEADRequest, Request, RequestDirector
 from .networking.common import _REQUEST_HANDLERS, _RH_PREFERENCES
+from .networking._cache import HTTPCache
+from .networking._proxy_pool import ProxyPool
+from .networking._replay import ReplayRH, RequestRecorder
+from .networking._retry import HostRetryCoordinator
 from .networking.exceptions import (
     HTTPError,
     NoSupportingHandlers,
@@ -92,6 +96,7 @@
     STR_FORMAT_RE_TMPL,
     STR_FORMAT_TYPES,
     ContentTooShortError,
+    DashFragments,
     DateRange,
     DownloadCancelled,
     DownloadError,
@@ -438,10 +443,30 @@ class YoutubeDL:
                        - "detect_or_warn": check whether we can do anything
                                            about it, warn otherwise (default)
     source_address:    Client-side IP address to bind to.
+    proxy_pool:        List of proxy URLs to spread the requests across, instead of "proxy".
+                       All the requests of an extraction (and its downloads) use the same proxy
+    proxy_pool_strategy: How the proxy of the pool is chosen:
+                       "round_robin" (default) or "latency" (lowest response time)
+    host_backoff:      Hold back all the requests to a host that is failing, or that asks
+                       to slow down with Retry-After, instead of retrying every request on its own.
+                       Requests to a host that keeps failing are paused altogether for a while
+    http_cache_size:   Maximum size of the cache of HTTP responses (bytes) that extractors
+                       can use for static resources. 0 disables it. Default is 100MiB.
+                       The cache is in the "http" directory of the cachedir
+    record_requests:   File to record every HTTP request and its response into, for replay_requests.
+                       Large response bodies are written into the "<file>.bodies" directory
+    replay_requests:   File recorded with record_requests to serve the HTTP responses from,
+                       instead of using the network. Requests that were not recorded fail
+    max_connections_per_host: Maximum number of connections to open to a single host at once.
+                       Further requests wait for a connection to become free.
+                       Only supported by the "requests" request handler
     impersonate:       Client to impersonate for requests.
                        An ImpersonateTarget (from yt_dlp.networking.impersonate)
     sleep_interval_requests: Number of seconds to sleep between requests
                        during extraction
+    concurrent_requests: Maximum number of independent requests that an extractor
+                       makes concurrently (default: 4). Requests are made one at
+                       a time when sleep_interval_requests is set
     sleep_interval:    Number of seconds to sleep before each download when
                        used alone or a lower bound of a range for randomized
                        sleep before each download (minimum possible number
@@ -515,10 +540,11 @@ class YoutubeDL:
 
     The following parameters are not used by YoutubeDL itself, they are used by
     the downloader (see yt_dlp/downloader/common.py):
-    nopart, updatetime, buffersize, ratelimit, throttledratelimit, min_filesize,
-    max_filesize, test, noresizebuffer, retries, file_access_retries, fragment_retries,
-    continuedl, hls_use_mpegts, http_chunk_size, external_downloader_args,
-    concurrent_fragment_downloads, progress_delta.
+    nopart, updatetime, buffersize, ratelimit, ratelimit_per_host, throttledratelimit,
+    min_filesize, max_filesize, test, noresizebuffer, retries, file_access_retries,
+    fragment_retries, continuedl, hls_use_mpegts, http_chunk_size,
+    external_downloader_args, concurrent_fragment_downloads,
+    adaptive_fragment_concurrency, progress_delta, stream_merge.
 
     The following options are used by the post processors:
     ffmpeg_location:   Location of the ffmpeg binary; either the path
@@ -653,6 +679,9 @@ def __init__(self, params=None, auto_init=True):
         self._num_videos = 0
         self._playlist_level = 0
         self._playlist_urls = set()
+        # {url: (data, final url)} of the media playlists downloaded during the current extraction,
+        # which HlsFD takes instead of downloading them again
+        self._m3u8_playlists = {}
         self.cache = Cache(self)
         self.__header_cookies = []
 
@@ -1407,6 +1436,8 @@ def sanitize(key, value):
         def _dumpjson_default(obj):
             if isinstance(obj, (set, LazyList)):
                 return list(obj)
+            elif isinstance(obj, DashFragments):
+                return obj.to_json()
             return repr(obj)
 
         class _ReplacementFormatter(string.Formatter):
@@ -1717,7 +1748,8 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
                 if self.params.get('break_on_existing', False):
                     raise ExistingVideoReached
                 break
-            return self.__extract_info(url, self.get_info_extractor(key), download, extra_info, process)
+            with self._proxy_session():
+                return self.__extract_info(url, self.get_info_extractor(key), download, extra_info, process)
         else:
             extractors_restricted = self.params.get('allowed_extractors') not in (None, ['default'])
             self.report_error(f'No suitable extractor{format_field(ie_key, None, " (%s)")} found for URL {url}',
@@ -1861,6 +1893,7 @@ def _apply_header_cookies(self, url, cookies=None):
     @_handle_extraction_exceptions
     def __extract_info(self, url, ie, download, extra_info, process):
         self._apply_header_cookies(url)
+        self._m3u8_playlists.clear()
 
         try:
             ie_result = ie.extract(url)
@@ -3481,7 +3514,9 @@ def existing_video_file(*filepaths):
                 fd, success = None, True
                 if info_dict.get('protocol') or info_dict.get('url'):
                     fd = get_suitable_downloader(info_dict, self.params, to_stdout=temp_filename == '-')
-                    if fd != FFmpegFD and 'no-direct-merge' not in self.params['compat_opts'] and (
+                    # Native downloaders select the fragments of the section and trim them with ffmpeg
+                    can_download_section = fd == FFmpegFD or (fd in (HlsFD, DashSegmentsFD) and FFmpegFD.available())
+                    if not can_download_section and 'no-direct-merge' not in self.params['compat_opts'] and (
                             info_dict.get('section_start') or info_dict.get('section_end')):
                         msg = ('This format cannot be partially downloaded' if FFmpegFD.available()
                                else 'You have requested downloading the video partially, but ffmpeg is not installed')
@@ -3525,7 +3560,7 @@ def correct_ext(filename, ext=new_ext):
                     if dl_filename is not None:
                         self.report_file_already_downloaded(dl_filename)
                     elif fd:
-                        if fd != FFmpegFD and temp_filename != '-':
+                        if not issubclass(fd, FFmpegFD) and temp_filename != '-':
                             for f in info_dict['requested_formats']:
                                 f['filepath'] = fname = prepend_extension(
                                     correct_ext(temp_filename, info_dict['ext']),
@@ -3684,7 +3719,8 @@ def __download_wrapper(self, func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
-                res = func(*args, **kwargs)
+                with self._proxy_session():
+                    res = func(*args, **kwargs)
             except CookieLoadError:
                 raise
             except UnavailableVideoError as e:
@@ -3766,6 +3802,8 @@ def filter_fn(obj):
                 return {k: filter_fn(v) for k, v in obj.items() if not reject(k, v)}
             elif isinstance(obj, (list, tuple, set, LazyList)):
                 return list(map(filter_fn, obj))
+            elif isinstance(obj, DashFragments):
+                return filter_fn(obj.to_json())
             elif isinstance(obj, ImpersonateTarget):
                 return str(obj)
             elif obj is None or isinstance(obj, (str, int, float, bool)):
@@ -4180,6 +4218,8 @@ def get_encoding(stream):
             )) or 'none'))
 
         write_debug(f'Proxy map: {self.proxies}')
+        if proxy_pool := self._request_director.proxy_pool:
+            write_debug(f'Proxy pool ({proxy_pool.strategy}): {", ".join(p.name for p in proxy_pool.proxies)}')
         write_debug(f'Request Handlers: {", ".join(rh.RH_NAME for rh in self._request_director.handlers.values())}')
 
         for plugin_type, plugins in (('Extractor', plugin_ies), ('Post-Processor', plugin_pps)):
@@ -4351,7 +4391,21 @@ def build_request_director(self, handlers, preferences=None):
         clean_headers(headers)
         clean_proxies(proxies, headers)
 
-        director = RequestDirector(logger=logger, verbose=self.params.get('debug_printtraffic'))
+        proxy_pool = None
+        if self.params.get('proxy_pool'):
+            pool_proxies = dict(enumerate(self.params['proxy_pool']))
+            clean_proxies(pool_proxies, HTTPHeaderDict())
+            proxy_pool = ProxyPool(
+                list(pool_proxies.values()), self.params.get('proxy_pool_strategy') or 'round_robin', logger=logger)
+
+        replaying = bool(self.params.get('replay_requests'))
+        director = RequestDirector(
+            logger=logger, verbose=self.params.get('debug_printtraffic'),
+            # Replayed responses come back immediately, there is no need to hold back
+            retry_coordinator=HostRetryCoordinator.shared() if self.params.get('host_backoff') and not replaying else None,
+            proxy_pool=proxy_pool,
+            recorder=RequestRecorder(self.params['record_requests']) if self.params.get('record_requests') else None,
+            http_cache=self._http_cache(logger))
         for handler in handlers:
             director.add_handler(handler(
                 logger=logger,
@@ -4366,7 +4420,10 @@ def build_request_director(self, handlers, preferences=None):
                     'timeout': 'socket_timeout',
                     'legacy_ssl_support': 'legacyserverconnect',
                     'enable_file_urls': 'enable_file_urls',
+                    'pool_size': 'concurrent_fragment_downloads',
+                    'max_connections_per_host': 'max_connections_per_host',
                     'impersonate': 'impersonate',
+                    'replay_archive': 'replay_requests',
                     'client_cert': {
                         'client_certificate': 'client_certificate',
                         'client_certificate_key': 'client_certificate_key',
@@ -4381,8 +4438,26 @@ def build_request_director(self, handlers, preferences=None):
 
     @functools.cached_property
     def _request_director(self):
+        if self.params.get('replay_requests'):
+            # Other URLs (data:, file:) are still handled locally
+            return self.build_request_director(
+                [ReplayRH, _REQUEST_HANDLERS['Urllib']], [lambda rh, _: 1000 if isinstance(rh, ReplayRH) else 0])
         return self.build_request_director(_REQUEST_HANDLERS.values(), _RH_PREFERENCES)
 
+    def _http_cache(self, logger):
+        max_size = self.params.get('http_cache_size')
+        if max_size is None:
+            max_size = HTTPCache.DEFAULT_MAX_SIZE
+        # Recordings have to contain every response, and replaying must not depend on the cache
+        if not (self.cache.enabled and max_size) or self.params.get('record_requests') or self.params.get('replay_requests'):
+            return None
+        return HTTPCache(os.path.join(self.cache._get_root_dir(), 'http'), max_size, logger=logger)
+
+    def _proxy_session(self):
+        """Send all the requests made within this context through the same proxy of the proxy pool"""
+        proxy_pool = self._request_director.proxy_pool
+        return proxy_pool.session() if proxy_pool else contextlib.nullcontext()
+
     def encode(self, s):
         if isinstance(s, bytes):
             return s  # Already encoded
@@ -217,7 +217,14 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     # Numbers
     validate_positive('autonumber start', opts.autonumber_start)
     validate_positive('autonumber size', opts.autonumber_size, True)
+    opts.adaptive_fragment_concurrency = False
+    if isinstance(opts.concurrent_fragment_downloads, str):
+        mobj = re.fullmatch(r'(?P<auto>auto)(?::(?P<max>\d+))?|(?P<n>\d+)', opts.concurrent_fragment_downloads)
+        validate(mobj, 'concurrent fragments', opts.concurrent_fragment_downloads)
+        opts.adaptive_fragment_concurrency = bool(mobj.group('auto'))
+        opts.concurrent_fragment_downloads = int(mobj.group('n') or mobj.group('max') or 16)
     validate_positive('concurrent fragments', opts.concurrent_fragment_downloads, True)
+    validate_positive('max connections per host', opts.max_connections_per_host, True)
     validate_positive('playlist start', opts.playliststart, True)
     if opts.playlistend != -1:
         validate_minmax(opts.playliststart, opts.playlistend, 'playlist start', 'playlist end')
@@ -225,6 +232,7 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     # Time ranges
     validate_positive('subtitles sleep interval', opts.sleep_interval_subtitles)
     validate_positive('requests sleep interval', opts.sleep_interval_requests)
+    validate_positive('concurrent requests', opts.concurrent_requests, True)
     validate_positive('sleep interval', opts.sleep_interval)
     validate_positive('max sleep interval', opts.max_sleep_interval)
     if opts.sleep_interval is None:
@@ -316,11 +324,13 @@ def validate_bytes(name, value, strict_positive=False):
         return numeric_limit
 
     opts.ratelimit = validate_bytes('rate limit', opts.ratelimit, True)
+    opts.ratelimit_per_host = validate_bytes('rate limit per host', opts.ratelimit_per_host, True)
     opts.throttledratelimit = validate_bytes('throttled rate limit', opts.throttledratelimit)
     opts.min_filesize = validate_bytes('min filesize', opts.min_filesize)
     opts.max_filesize = validate_bytes('max filesize', opts.max_filesize)
     opts.buffersize = validate_bytes('buffer size', opts.buffersize, True)
     opts.http_chunk_size = validate_bytes('http chunk size', opts.http_chunk_size)
+    opts.http_cache_size = validate_bytes('http cache size', opts.http_cache_size)
 
     # Output templates
     def validate_outtmpl(tmpl, msg):
@@ -837,6 +847,7 @@ def parse_options(argv=None):
         'force_generic_extractor': opts.force_generic_extractor,
         'allowed_extractors': opts.allowed_extractors or ['default'],
         'ratelimit': opts.ratelimit,
+        'ratelimit_per_host': opts.ratelimit_per_host,
         'throttledratelimit': opts.throttledratelimit,
         'overwrites': opts.overwrites,
         'retries': opts.retries,
@@ -844,9 +855,11 @@ def parse_options(argv=None):
         'fragment_retries': opts.fragment_retries,
         'extractor_retries': opts.extractor_retries,
         'retry_sleep_functions': opts.retry_sleep,
+        'host_backoff': opts.host_backoff,
         'skip_unavailable_fragments': opts.skip_unavailable_fragments,
         'keep_fragments': opts.keep_fragments,
         'concurrent_fragment_downloads': opts.concurrent_fragment_downloads,
+        'adaptive_fragment_concurrency': opts.adaptive_fragment_concurrency,
         'buffersize': opts.buffersize,
         'noresizebuffer': opts.noresizebuffer,
         'http_chunk_size': opts.http_chunk_size,
@@ -891,6 +904,8 @@ def parse_options(argv=None):
         'dump_intermediate_pages': opts.dump_intermediate_pages,
         'write_pages': opts.write_pages,
         'load_pages': opts.load_pages,
+        'record_requests': opts.record_requests,
+        'replay_requests': opts.replay_requests,
         'test': opts.test,
         'keepvideo': opts.keepvideo,
         'min_filesize': opts.min_filesize,
@@ -899,6 +914,7 @@ def parse_options(argv=None):
         'max_views': opts.max_views,
         'daterange': opts.date,
         'cachedir': opts.cachedir,
+        'http_cache_size': opts.http_cache_size,
         'age_limit': opts.age_limit,
         'download_archive': opts.download_archive,
         'break_on_existing': opts.break_on_existing,
@@ -929,8 +945,12 @@ def parse_options(argv=None):
         'postprocessors': postprocessors,
         'fixup': opts.fixup,
         'source_address': opts.source_address,
+        'max_connections_per_host': opts.max_connections_per_host,
+        'proxy_pool': opts.proxy_pool,
+        'proxy_pool_strategy': opts.proxy_pool_strategy,
         'impersonate': opts.impersonate,
         'sleep_interval_requests': opts.sleep_interval_requests,
+        'concurrent_requests': opts.concurrent_requests,
         'sleep_interval': opts.sleep_interval,
         'max_sleep_interval': opts.max_sleep_interval,
         'sleep_interval_subtitles': opts.sleep_interval_subtitles,
@@ -944,6 +964,7 @@ def parse_options(argv=None):
         'ffmpeg_location': opts.ffmpeg_location,
         'hls_prefer_native': opts.hls_prefer_native,
         'hls_use_mpegts': opts.hls_use_mpegts,
+        'stream_merge': opts.stream_merge,
         'hls_split_discontinuity': opts.hls_split_discontinuity,
         'external_downloader_args': opts.external_downloader_args,
         'postprocessor_args': opts.postprocessor_args,
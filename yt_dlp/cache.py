@@ -6,7 +6,7 @@
 import traceback
 import urllib.parse
 
-from .utils import expand_path, traverse_obj, version_tuple, write_json_file
+from .utils import expand_path, locked_file, traverse_obj, version_tuple, write_json_file
 from .version import __version__
 
 
@@ -74,6 +74,28 @@ def load(self, section, key, dtype='json', default=None, *, min_ver=None):
 
         return default
 
+    def update(self, section, key, func, dtype='json', *, min_ver=None):
+        """
+        Store func(<cached data or None>) and return it
+
+        The update holds a lock, so that concurrent updates from other processes are not lost
+        """
+        assert dtype in ('json',)
+
+        if not self.enabled:
+            return func(None)
+
+        fn = self._get_cache_fn(section, key, dtype)
+        with contextlib.ExitStack() as stack:
+            try:
+                os.makedirs(os.path.dirname(fn), exist_ok=True)
+                stack.enter_context(locked_file(f'{fn}.lock', 'a'))
+            except OSError as e:
+                self._ydl.write_debug(f'Unable to lock {section}.{key} in cache; updating without locking: {e}')
+            data = func(self.load(section, key, dtype, min_ver=min_ver))
+            self.store(section, key, data, dtype)
+        return data
+
     def remove(self):
         if not self.enabled:
             self._ydl.to_screen('Cache is disabled (Did you combine --no-cache-dir and --rm-cache-dir?)')
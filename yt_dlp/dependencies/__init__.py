@@ -11,6 +11,15 @@
         brotli = None
 
 
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+
 try:
     import certifi
 except ImportError:
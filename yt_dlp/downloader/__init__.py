@@ -13,8 +13,12 @@ def get_suitable_downloader(info_dict, params={}, default=NO_DEFAULT, protocol=N
         return FFmpegFD
     elif (set(downloaders) == {DashSegmentsFD}
           and not (to_stdout and len(protocols) > 1)
-          and set(protocols) == {'http_dash_segments_generator'}):
+          and (set(protocols) == {'http_dash_segments_generator'} or info_copy.get('is_live'))):
         return DashSegmentsFD
+    elif (params.get('stream_merge') and len(downloaders) > 1
+          and set(downloaders) <= {HttpFD, HlsFD, DashSegmentsFD}
+          and FFmpegStreamMergeFD.can_merge_formats(info_copy, params)):
+        return FFmpegStreamMergeFD
     elif len(downloaders) == 1:
         return downloaders[0]
     return None
@@ -29,6 +33,7 @@ def get_suitable_downloader(info_dict, params={}, default=NO_DEFAULT, protocol=N
 from .hls import HlsFD
 from .http import HttpFD
 from .ism import IsmFD
+from .merge import FFmpegStreamMergeFD
 from .mhtml import MhtmlFD
 from .niconico import NiconicoLiveFD
 from .rtmp import RtmpFD
@@ -81,13 +86,24 @@ def shorten_protocol_name(proto, simplify=False):
     return short_protocol_names.get(proto, proto)
 
 
+def _can_download_sections_natively(info_dict, protocol, params):
+    """Whether the fragments overlapping the sections can be selected by the native downloader"""
+    return (protocol in ('m3u8_native', 'http_dash_segments') and '+' not in info_dict['protocol']
+            and not info_dict.get('is_live') and not info_dict['to_stdout']
+            and not (protocol == 'm3u8_native' and params.get('hls_prefer_native') is False)
+            and FFmpegFD.available())  # for trimming the boundary fragments
+
+
 def _get_suitable_downloader(info_dict, protocol, params, default):
     """Get the downloader class that can handle the info dict."""
     if default is NO_DEFAULT:
         default = HttpFD
 
-    if (info_dict.get('section_start') or info_dict.get('section_end')) and FFmpegFD.can_download(info_dict):
-        return FFmpegFD
+    if info_dict.get('section_start') or info_dict.get('section_end'):
+        if _can_download_sections_natively(info_dict, protocol, params):
+            return PROTOCOL_MAP[protocol]
+        elif FFmpegFD.can_download(info_dict):
+            return FFmpegFD
 
     info_dict['protocol'] = protocol
     downloaders = params.get('external_downloader')
@@ -108,10 +124,10 @@ def _get_suitable_downloader(info_dict, protocol, params, default):
             return FFmpegFD
 
     if protocol in ('m3u8', 'm3u8_native'):
-        if info_dict.get('is_live'):
-            return FFmpegFD
-        elif (external_downloader or '').lower() == 'native':
+        if (external_downloader or '').lower() == 'native':
             return HlsFD
+        elif info_dict.get('is_live'):
+            return HlsFD if params.get('hls_prefer_native') else FFmpegFD
         elif protocol == 'm3u8_native' and get_suitable_downloader(
                 info_dict, params, None, protocol='m3u8_frag_urls', to_stdout=info_dict['to_stdout']):
             return HlsFD
@@ -32,6 +32,7 @@
     try_call,
 )
 from ..utils._utils import _ProgressState
+from ..utils.ratelimit import RateLimiter
 
 
 class FileDownloader:
@@ -49,6 +50,10 @@ class FileDownloader:
     verbose:            Print additional info to stdout.
     quiet:              Do not print messages to stdout.
     ratelimit:          Download speed limit, in bytes/sec.
+                        Shared by all the downloads and fragments of the process
+    ratelimit_per_host: Download speed limit for each host, in bytes/sec.
+                        External downloaders are only given the lower of the two limits,
+                        and do not share them with the rest of the process
     throttledratelimit: Assume the download is being throttled below this speed (bytes/sec)
     retries:            Number of times to retry for expected network errors.
                         Default is 0 for API, but 10 for CLI
@@ -69,6 +74,8 @@ class FileDownloader:
                         passed to all downloaders. For compatibility with youtube-dl,
                         a single list of args can also be used
     hls_use_mpegts:     Use the mpegts container for HLS videos.
+    stream_merge:       Merge the requested formats with ffmpeg while they are
+                        being downloaded, instead of after downloading them
     http_chunk_size:    Size of a chunk for chunk-based HTTP downloading. May be
                         useful for bypassing bandwidth throttling imposed by
                         a webserver (experimental)
@@ -198,21 +205,22 @@ def parse_bytes(bytestr):
                             'may be removed in the future. Use yt_dlp.utils.parse_bytes instead')
         return parse_bytes(bytestr)
 
+    @functools.cached_property
+    def rate_limiter(self):
+        """The limiter shared by everything being downloaded in the process with the same limits"""
+        return RateLimiter.shared(self.params.get('ratelimit'), self.params.get('ratelimit_per_host'))
+
     def slow_down(self, start_time, now, byte_counter):
         """Sleep if the download speed is over the rate limit."""
-        rate_limit = self.params.get('ratelimit')
-        if rate_limit is None or byte_counter == 0:
-            return
-        if now is None:
-            now = time.time()
-        elapsed = now - start_time
-        if elapsed <= 0.0:
+        # byte_counter is the total since start_time, so only what is new since the last call is drawn
+        if not self.rate_limiter:
             return
-        speed = float(byte_counter) / elapsed
-        if speed > rate_limit:
-            sleep_time = float(byte_counter) / rate_limit - elapsed
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+        last_start_time, last_byte_counter = getattr(self, '_slow_down_progress', (None, 0))
+        if start_time != last_start_time:
+            last_byte_counter = 0
+        self._slow_down_progress = (start_time, byte_counter)
+        if byte_counter > last_byte_counter:
+            self.rate_limiter.consume(byte_counter - last_byte_counter)
 
     def temp_name(self, filename):
         """Returns a temporary filename for the given filename."""
@@ -1,9 +1,18 @@
+import functools
 import time
 import urllib.parse
 
 from . import get_suitable_downloader
+from .external import FFmpegFD
 from .fragment import FragmentFD
-from ..utils import ReExtractInfo, update_url_query, urljoin
+from ..utils import (
+    DashFragments,
+    ReExtractInfo,
+    float_or_none,
+    traverse_obj,
+    update_url_query,
+    urljoin,
+)
 
 
 class DashSegmentsFD(FragmentFD):
@@ -14,12 +23,18 @@ class DashSegmentsFD(FragmentFD):
 
     FD_NAME = 'dashsegments'
 
+    # Number of fragments before the live edge to start downloading a live stream from
+    _LIVE_EDGE_FRAGMENTS = 3
+    # Consider a live stream as ended if its manifest has no new fragments for this many updates
+    _LIVE_IDLE_UPDATES = 10
+
     def real_download(self, filename, info_dict):
-        if 'http_dash_segments_generator' in info_dict['protocol'].split('+'):
-            real_downloader = None  # No external FD can support --live-from-start
+        is_section = not info_dict.get('is_live') and bool(info_dict.get('section_start') or info_dict.get('section_end'))
+        if 'http_dash_segments_generator' in info_dict['protocol'].split('+') or info_dict.get('is_live'):
+            real_downloader = None  # No external FD can support --live-from-start or refresh the manifest
+        elif is_section:
+            real_downloader = None  # The fragments have to be trimmed to the section after downloading
         else:
-            if info_dict.get('is_live'):
-                self.report_error('Live DASH videos are not supported')
             real_downloader = get_suitable_downloader(
                 info_dict, self.params, None, protocol='dash_frag_urls', to_stdout=(filename == '-'))
 
@@ -32,6 +47,19 @@ def real_download(self, filename, info_dict):
             # See https://github.com/yt-dlp/yt-dlp/issues/13906
             if isinstance(fmt['fragments'], str):
                 raise ReExtractInfo('the stream needs to be re-extracted', expected=True)
+            fmt['fragments'] = DashFragments.from_json(fmt['fragments'])
+            # The refresh function is not kept in .info.json, so only the listed fragments are downloaded then
+            if fmt.get('is_live') and callable(fmt.get('__refresh_mpd_format')) and not callable(fmt['fragments']):
+                fmt['fragments'] = functools.partial(self._live_fragments, fmt, fmt['fragments'])
+            section = None
+            if is_section and not callable(fmt['fragments']):
+                section = self._select_section_fragments(fmt['fragments'], fmt)
+                if not section:
+                    fd = FFmpegFD(self.ydl, self.params)
+                    self.report_warning(
+                        f'The duration of some fragments is unknown; the section will be downloaded by {fd.get_basename()}')
+                    return fd.real_download(filename, info_dict)
+                fmt = {**fmt, 'fragments': section[0]}
 
             try:
                 fragment_count = 1 if self.params.get('test') else len(fmt['fragments'])
@@ -41,6 +69,7 @@ def real_download(self, filename, info_dict):
                 'filename': fmt.get('filepath') or filename,
                 'live': 'is_from_start' if fmt.get('is_from_start') else fmt.get('is_live'),
                 'total_frags': fragment_count,
+                'section_offset': traverse_obj(section, 1),
             }
 
             if real_downloader:
@@ -65,7 +94,11 @@ def real_download(self, filename, info_dict):
 
             args.append([ctx, fragments_to_download, fmt])
 
-        return self.download_and_append_fragments_multiple(*args, is_fatal=lambda idx: idx == 0)
+        success = self.download_and_append_fragments_multiple(*args, is_fatal=lambda idx: idx == 0)
+        for ctx, _, fmt in args:
+            if success and ctx['section_offset'] is not None:
+                success = self._trim_section(ctx['filename'], fmt, ctx['section_offset'])
+        return success
 
     def _resolve_fragments(self, fragments, ctx):
         fragments = fragments(ctx) if callable(fragments) else fragments
@@ -93,3 +126,61 @@ def _get_fragments(self, fmt, ctx, extra_query):
                 'index': i,
                 'url': fragment_url,
             }
+
+    def _live_fragments(self, fmt, fragments, ctx):
+        """
+        Yield the fragments of a dynamic MPD, refreshing it every minimumUpdatePeriod
+
+        Fragments are deduplicated by their URL, which is unique for every segment of a
+        SegmentTemplate. Unless the format is 'is_from_start', the download starts
+        near the live edge instead of at the beginning of the time shift buffer.
+        The manifest is parsed again by the extractor, through fmt['__refresh_mpd_format']
+        """
+        fragment_base_url = fmt.get('fragment_base_url')
+        update_period, is_dynamic = None, True
+        seen, first_refresh = set(), True
+        idle_since = time.monotonic()
+        while True:
+            fragments = [{
+                **fragment,
+                'url': fragment.get('url') or urljoin(fragment_base_url, fragment['path']),
+            } for fragment in fragments]
+            # The initialization segment is the only one without a duration
+            init = [f for f in fragments[:1] if 'duration' not in f]
+            media = fragments[len(init):]
+            if first_refresh and not fmt.get('is_from_start'):
+                media = media[-self._LIVE_EDGE_FRAGMENTS:]
+            first_refresh = False
+
+            has_new = False
+            for fragment in init + media:
+                if fragment['url'] in seen:
+                    continue
+                seen.add(fragment['url'])
+                has_new = True
+                yield fragment
+            # Segments that have left the time shift buffer will not be listed again
+            seen.intersection_update(f['url'] for f in fragments)
+
+            if not is_dynamic:
+                return
+            interval = update_period or traverse_obj(media, (-1, 'duration', {float_or_none})) or 2
+            if has_new:
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since > self._LIVE_IDLE_UPDATES * interval:
+                self.to_screen(f'[{self.FD_NAME}] No new fragments were added to the manifest; '
+                               'assuming the live stream has ended')
+                return
+            time.sleep(interval if has_new else interval / 2)
+
+            refreshed = fmt['__refresh_mpd_format'](fmt.get('id'), fmt.get('http_headers') or {})
+            if not refreshed:
+                self.report_warning('Unable to refresh the live manifest; stopping the download')
+                return
+            is_dynamic, update_period = refreshed['is_dynamic'], refreshed['update_period']
+            refreshed_fmt = refreshed['format']
+            if not refreshed_fmt:
+                self.report_warning(f'Format {fmt["format_id"]} is no longer in the live manifest; stopping the download')
+                return
+            fragments = refreshed_fmt.get('fragments') or []
+            fragment_base_url = refreshed_fmt.get('fragment_base_url')
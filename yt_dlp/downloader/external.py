@@ -124,6 +124,11 @@ def _bool_option(self, command_option, param, true_value='true', false_value='fa
     def _valueless_option(self, command_option, param, expected_value=True):
         return cli_valueless_option(self.params, command_option, param, expected_value)
 
+    def _rate_limit_option(self, command_option):
+        # The downloader only fetches from a single host, so the lower of the limits applies to it
+        rate_limit = min(filter(None, (self.params.get('ratelimit'), self.params.get('ratelimit_per_host'))), default=None)
+        return cli_option({'ratelimit': rate_limit}, command_option, 'ratelimit')
+
     def _configuration_args(self, keys=None, *args, **kwargs):
         return _configuration_args(
             self.get_basename(), self.params.get('external_downloader_args'), self.EXE_NAME,
@@ -234,7 +239,7 @@ def _make_cmd(self, tmpfilename, info_dict):
         cmd += self._bool_option('--continue-at', 'continuedl', '-', '0')
         cmd += self._valueless_option('--silent', 'noprogress')
         cmd += self._valueless_option('--verbose', 'verbose')
-        cmd += self._option('--limit-rate', 'ratelimit')
+        cmd += self._rate_limit_option('--limit-rate')
         retry = self._option('--retry', 'retries')
         if len(retry) == 2:
             if retry[1] in ('inf', 'infinite'):
@@ -284,7 +289,7 @@ def _make_cmd(self, tmpfilename, info_dict):
         if info_dict.get('http_headers') is not None:
             for key, val in info_dict['http_headers'].items():
                 cmd += ['--header', f'{key}: {val}']
-        cmd += self._option('--limit-rate', 'ratelimit')
+        cmd += self._rate_limit_option('--limit-rate')
         retry = self._option('--tries', 'retries')
         if len(retry) == 2:
             if retry[1] in ('inf', 'infinite'):
@@ -319,7 +324,7 @@ def _make_cmd(self, tmpfilename, info_dict):
         if info_dict.get('http_headers') is not None:
             for key, val in info_dict['http_headers'].items():
                 cmd += ['--header', f'{key}: {val}']
-        cmd += self._option('--max-overall-download-limit', 'ratelimit')
+        cmd += self._rate_limit_option('--max-overall-download-limit')
         cmd += self._option('--interface', 'source_address')
         cmd += self._option('--all-proxy', 'proxy')
         cmd += self._bool_option('--check-certificate', 'nocheckcertificate', 'false', 'true', '=')
@@ -558,8 +563,7 @@ def _call_downloader(self, tmpfilename, info_dict):
 
         piped = any(fmt['url'] in ('-', 'pipe:') for fmt in selected_formats)
         with Popen(args, stdin=subprocess.PIPE, env=env) as proc:
-            if piped:
-                self.on_process_started(proc, proc.stdin)
+            self.on_process_started(proc, proc.stdin)
             try:
                 retval = proc.wait()
             except BaseException as e:
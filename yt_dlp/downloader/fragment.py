@@ -1,9 +1,13 @@
+import collections
 import concurrent.futures
 import contextlib
+import contextvars
+import functools
 import json
 import math
 import os
 import struct
+import threading
 import time
 
 from .common import FileDownloader
@@ -11,7 +15,8 @@
 from ..aes import aes_cbc_decrypt_bytes, unpad_pkcs7
 from ..networking import Request
 from ..networking.exceptions import HTTPError, IncompleteRead
-from ..utils import DownloadError, RetryManager, traverse_obj
+from ..postprocessor.ffmpeg import FFmpegPostProcessor, FFmpegPostProcessorError
+from ..utils import DownloadError, RetryManager, prepend_extension, traverse_obj
 from ..utils.networking import HTTPHeaderDict
 from ..utils.progress import ProgressCalculator
 
@@ -23,6 +28,202 @@ def to_screen(self, *args, **kargs):
     to_console_title = to_screen
 
 
+class _ConcurrencyController:
+    """
+    Adjust the number of fragments downloaded at once (AIMD).
+    The level is raised by one while the combined throughput keeps improving,
+    and halved on errors that indicate an overloaded or throttling server,
+    or when the throughput drops well below the best one seen so far
+    """
+
+    # Throughput has to improve by this factor for the level to be raised
+    IMPROVEMENT = 1.05
+    # A throughput below this fraction of the best one is treated as throttling
+    THROTTLED = 0.75
+
+    def __init__(self, max_level, min_level=1, on_change=None):
+        self.max_level = max_level
+        self.min_level = min(min_level, max_level)
+        self.level = self.peak = min(max(2, self.min_level), max_level)
+        self._on_change = on_change
+        self._last = self._best = None
+        # Errors of the fragments that were already running when the level was lowered are not counted again
+        self._backed_off = False
+        self._reset_window()
+
+    def _reset_window(self):
+        self._window_start = time.monotonic()
+        self._window_bytes = self._window_frags = 0
+
+    def _set_level(self, level, reason):
+        level = min(max(level, self.min_level), self.max_level)
+        if level != self.level:
+            self.level, self.peak = level, max(level, self.peak)
+            if self._on_change:
+                self._on_change(level, reason)
+
+    @staticmethod
+    def is_overload_error(err):
+        if isinstance(err, IncompleteRead):
+            return True
+        return isinstance(err, HTTPError) and (
+            err.status == 429 or err.status >= 500 or bool(err.response.get_header('Retry-After')))
+
+    def fragment_downloaded(self, size):
+        self._window_bytes += size or 0
+        self._window_frags += 1
+        # Every worker should complete a couple of fragments for the measurement to be meaningful
+        if self._window_frags < 2 * self.level:
+            return
+        throughput = self._window_bytes / max(time.monotonic() - self._window_start, 1e-3)
+        self._reset_window()
+        self._backed_off = False
+        if self._best and throughput < self._best * self.THROTTLED:
+            self._back_off('throughput dropped')
+            return
+        if self._last is None or throughput > self._last * self.IMPROVEMENT:
+            self._set_level(self.level + 1, 'throughput improved')
+        self._last, self._best = throughput, max(throughput, self._best or 0)
+
+    def fragment_failed(self, err):
+        if not self._backed_off and self.is_overload_error(err):
+            self._back_off(f'HTTP Error {err.status}' if isinstance(err, HTTPError) else 'incomplete read')
+
+    def _back_off(self, reason):
+        self._set_level(self.level // 2, reason)
+        self._backed_off = True
+        self._last = self._best = None
+        self._reset_window()
+
+
+class _FragmentQueue:
+    """The fragments of one format, to be downloaded by a _FragmentScheduler"""
+
+    def __init__(self, scheduler, remaining):
+        self.max_workers = scheduler.max_workers
+        self.remaining = remaining
+        self.pending = collections.deque()
+        self.running = 0
+        self._scheduler = scheduler
+
+    def submit(self, fn, /, *args):
+        return self._scheduler._submit(self, fn, args)
+
+    def fragment_downloaded(self, size):
+        self._scheduler._adjust('fragment_downloaded', size)
+
+    def fragment_failed(self, err):
+        self._scheduler._adjust('fragment_failed', err)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        # The workers are shut down along with the scheduler
+        if cancel_futures:
+            self._scheduler._cancel(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class _FragmentScheduler:
+    """
+    A pool of workers shared by the fragment downloads of several formats.
+    Free workers pick the next fragment of the format with the most remaining
+    bytes, so that no worker is left idle while any format is still downloading.
+    With a _ConcurrencyController, only as many workers as its level run at once
+    """
+
+    def __init__(self, max_workers, controller=None):
+        self.max_workers = max_workers
+        self.controller = controller
+        self._queues = []
+        self._workers = []
+        self._shutdown = False
+        self._cond = threading.Condition()
+
+    def queue(self, remaining=lambda: math.inf):
+        """@param remaining   A function returning the estimated bytes left to download for the format"""
+        queue = _FragmentQueue(self, remaining)
+        with self._cond:
+            self._queues.append(queue)
+        return queue
+
+    def _submit(self, queue, fn, args):
+        future = concurrent.futures.Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+            queue.pending.append((future, fn, args))
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            self._cond.notify()
+        return future
+
+    def _adjust(self, event, arg):
+        if not self.controller:
+            return
+        with self._cond:
+            level = self.controller.level
+            getattr(self.controller, event)(arg)
+            if self.controller.level > level:
+                self._cond.notify_all()
+
+    def _cancel(self, queue):
+        with self._cond:
+            for future, _, _ in queue.pending:
+                future.cancel()
+            queue.pending.clear()
+
+    def _next_job(self):
+        queues = [queue for queue in self._queues if queue.pending]
+        if not queues or (self.controller and sum(q.running for q in self._queues) >= self.controller.level):
+            return None, None
+        # Formats without an estimate yet are served first and in turns
+        queue = max(queues, key=lambda q: (q.remaining(), -q.running))
+        queue.running += 1
+        return queue, queue.pending.popleft()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                queue, job = self._next_job()
+                while not job:
+                    if self._shutdown:
+                        return
+                    self._cond.wait()
+                    queue, job = self._next_job()
+            future, fn, args = job
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        result = fn(*args)
+                    except BaseException as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result(result)
+            finally:
+                with self._cond:
+                    queue.running -= 1
+
+    def shutdown(self, wait=True):
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
 class FragmentFD(FileDownloader):
     """
     A base file downloader class for fragmented media (e.g. f4m/m3u8 manifests).
@@ -36,6 +237,8 @@ class FragmentFD(FileDownloader):
     keep_fragments:     Keep downloaded fragments on disk after downloading is
                         finished
     concurrent_fragment_downloads:  The number of threads to use for native hls and dash downloads
+    adaptive_fragment_concurrency:  Adjust the number of fragments downloaded at once to the
+                        throughput of the server, up to concurrent_fragment_downloads
     _no_ytdl_file:      Don't use .ytdl file
 
     For each incomplete fragment download yt-dlp keeps on disk a special
@@ -288,7 +491,9 @@ def _finish_frag_download(self, ctx, info_dict):
             self.try_remove(self.ytdl_filename(ctx['filename']))
         elapsed = time.time() - ctx['started']
 
-        to_file = ctx['tmpfilename'] != '-'
+        # Neither stdout nor a named pipe can be measured or renamed
+        to_file = ctx['tmpfilename'] != '-' and (
+            not os.path.exists(ctx['tmpfilename']) or os.path.isfile(ctx['tmpfilename']))
         if to_file:
             downloaded_bytes = self.filesize_or_none(ctx['tmpfilename'])
         else:
@@ -338,6 +543,54 @@ def _prepare_external_frag_download(self, ctx):
             'fragment_index': 0,
         })
 
+    @staticmethod
+    def _select_section_fragments(fragments, info_dict):
+        """
+        Select the fragments that overlap the section between section_start and section_end
+        @returns (fragments, offset), where offset is the time at which the first selected
+                 media fragment starts; or None if the duration of a fragment is unknown
+        """
+        start, end = info_dict.get('section_start') or 0, info_dict.get('section_end') or math.inf
+        selected, offset, time = [], None, 0
+        for fragment in fragments:
+            duration = fragment.get('duration')
+            if duration is None:
+                # Initialization fragments have no duration and must precede the media fragments
+                if fragment.get('init') or not (time or selected):
+                    selected.append(fragment)
+                    continue
+                return None
+            if time < end and time + duration > start:
+                if offset is None:
+                    offset = time
+                selected.append(fragment)
+            time += duration
+        return selected, offset or 0
+
+    def _trim_section(self, filename, info_dict, offset, out_opts=()):
+        """Cut the fragments that overlap the section down to the exact section with ffmpeg"""
+        if self.params.get('test'):
+            return True
+        start, end = info_dict.get('section_start') or 0, info_dict.get('section_end')
+        opts = ['-ss', str(max(start - offset, 0))]
+        if end:
+            opts += ['-t', str(end - start)]
+
+        ffpp = FFmpegPostProcessor(downloader=self)
+        temp_filename = prepend_extension(filename, 'temp')
+        self.to_screen(f'[{self.FD_NAME}] Trimming the downloaded fragments to the requested section')
+        try:
+            ffpp.real_run_ffmpeg([(filename, opts)], [(temp_filename, [
+                *ffpp.stream_copy_opts(not self.params.get('force_keyframes_at_cuts'), ext=info_dict.get('ext')),
+                *out_opts])])
+        except FFmpegPostProcessorError as e:
+            self.try_remove(temp_filename)
+            self.try_remove(filename)
+            self.report_error(f'Unable to trim the downloaded fragments: {e.msg}')
+            return False
+        self.try_rename(temp_filename, filename)
+        return True
+
     def decrypter(self, info_dict):
         _key_cache = {}
 
@@ -364,6 +617,43 @@ def decrypt_fragment(fragment, frag_content):
 
         return decrypt_fragment
 
+    def _fragment_scheduler(self, max_workers, min_workers=1):
+        controller = None
+        if self.params.get('adaptive_fragment_concurrency'):
+            controller = _ConcurrencyController(
+                max_workers, min_workers, lambda level, reason: self.write_debug(
+                    f'Downloading {level} fragments concurrently ({reason})'))
+        return _FragmentScheduler(max_workers, controller)
+
+    def _report_concurrency(self, scheduler):
+        if scheduler.controller:
+            self.to_screen(
+                f'[{self.FD_NAME}] Adaptive concurrency settled at {scheduler.controller.level} fragments '
+                f'(highest {scheduler.controller.peak}, maximum {scheduler.controller.max_level})')
+
+    @staticmethod
+    def _map_ordered(pool, func, iterable, lookahead, futures=None):
+        """
+        Like pool.map, but submits at most @param lookahead jobs ahead of the consumer.
+        This allows the fragments to be produced lazily (e.g. by refreshing a live manifest)
+
+        @param futures  Deque of the submitted jobs whose results have not been yielded yet
+        """
+        if futures is None:
+            futures = collections.deque()
+        for item in iterable:
+            # The job runs in a copy of the current context, so that it stays in e.g. the proxy session
+            futures.append(pool.submit(contextvars.copy_context().run, func, item))
+            if len(futures) >= lookahead:
+                # Only remove the job once it has a result, so that it is not lost on interruption
+                result = futures[0].result()
+                futures.popleft()
+                yield result
+        while futures:
+            result = futures[0].result()
+            futures.popleft()
+            yield result
+
     def download_and_append_fragments_multiple(self, *args, **kwargs):
         """
         @params (ctx1, fragments1, info_dict1), (ctx2, fragments2, info_dict2), ...
@@ -373,7 +663,8 @@ def download_and_append_fragments_multiple(self, *args, **kwargs):
         max_progress = len(args)
         if max_progress == 1:
             return self.download_and_append_fragments(*args[0], **kwargs)
-        max_workers = self.params.get('concurrent_fragment_downloads', 1)
+        # Every format needs at least one worker to make progress
+        max_workers = max(self.params.get('concurrent_fragment_downloads', 1), max_progress)
         if max_progress > 1:
             self._prepare_multiline_status(max_progress)
         is_live = any(traverse_obj(args, (..., 2, 'is_live')))
@@ -384,10 +675,11 @@ def thread_func(idx, ctx, fragments, info_dict, tpe):
             return self.download_and_append_fragments(
                 ctx, fragments, info_dict, **kwargs, tpe=tpe, interrupt_trigger=interrupt_trigger)
 
-        class FTPE(concurrent.futures.ThreadPoolExecutor):
-            # has to stop this or it's going to wait on the worker thread itself
-            def __exit__(self, exc_type, exc_val, exc_tb):
-                pass
+        def remaining_bytes(ctx):
+            downloaded, frag_index = ctx.get('complete_frags_downloaded_bytes'), ctx.get('fragment_index')
+            if not (downloaded and frag_index and ctx.get('total_frags')):
+                return math.inf
+            return downloaded / frag_index * (ctx['total_frags'] - frag_index)
 
         if os.name == 'nt':
             def future_result(future):
@@ -408,20 +700,26 @@ def interrupt_trigger_iter(fg):
                     break
                 yield f
 
-        spins = []
-        for idx, (ctx, fragments, info_dict) in enumerate(args):
-            tpe = FTPE(math.ceil(max_workers / max_progress))
-            job = tpe.submit(thread_func, idx, ctx, interrupt_trigger_iter(fragments), info_dict, tpe)
-            spins.append((tpe, job))
+        # The formats are appended by their own threads, but share the threads downloading the fragments
+        scheduler = self._fragment_scheduler(max_workers, max_progress)
+        appenders = concurrent.futures.ThreadPoolExecutor(max_progress)
+        jobs = [
+            appenders.submit(
+                contextvars.copy_context().run, thread_func, idx, ctx, interrupt_trigger_iter(fragments), info_dict,
+                scheduler.queue(functools.partial(remaining_bytes, ctx)))
+            for idx, (ctx, fragments, info_dict) in enumerate(args)]
 
         result = True
-        for tpe, job in spins:
-            try:
-                result = result and future_result(job)
-            except KeyboardInterrupt:
-                interrupt_trigger[0] = False
-            finally:
-                tpe.shutdown(wait=True)
+        try:
+            for job in jobs:
+                try:
+                    result = result and future_result(job)
+                except KeyboardInterrupt:
+                    interrupt_trigger[0] = False
+        finally:
+            appenders.shutdown(wait=True)
+            scheduler.shutdown(wait=True)
+        self._report_concurrency(scheduler)
         if not interrupt_trigger[0] and not is_live:
             raise KeyboardInterrupt
         # we expect the user wants to stop and DO WANT the preceding postprocessors to run;
@@ -436,6 +734,12 @@ def download_and_append_fragments(
         if not self.params.get('skip_unavailable_fragments', True):
             is_fatal = lambda _: True
 
+        max_workers = tpe.max_workers if tpe else self.params.get('concurrent_fragment_downloads', 1)
+        scheduler = None
+        if not tpe and max_workers > 1 and self.params.get('adaptive_fragment_concurrency'):
+            scheduler = self._fragment_scheduler(max_workers)
+            tpe = scheduler.queue()
+
         def download_fragment(fragment, ctx):
             if not interrupt_trigger[0]:
                 return
@@ -451,6 +755,8 @@ def download_fragment(fragment, ctx):
             fatal = is_fatal(fragment.get('index') or (frag_index - 1))
 
             def error_callback(err, count, retries):
+                if tpe:
+                    tpe.fragment_failed(err)
                 if fatal and count > retries:
                     ctx['dest_stream'].close()
                 self.report_retry(err, count, retries, frag_index, fatal)
@@ -462,6 +768,8 @@ def error_callback(err, count, retries):
                     if not self._download_fragment(
                             ctx, fragment['url'], info_dict, headers, info_dict.get('request_data')):
                         return
+                    if tpe:
+                        tpe.fragment_downloaded(self.filesize_or_none(ctx['fragment_filename_sanitized']))
                 except (HTTPError, IncompleteRead) as err:
                     retry.error = err
                     continue
@@ -482,29 +790,45 @@ def append_fragment(frag_content, frag_index, ctx):
 
         decrypt_fragment = self.decrypter(info_dict)
 
-        max_workers = math.ceil(
-            self.params.get('concurrent_fragment_downloads', 1) / ctx.get('max_progress', 1))
         if max_workers > 1:
             def _download_fragment(fragment):
                 ctx_copy = ctx.copy()
                 download_fragment(fragment, ctx_copy)
                 return fragment, fragment['frag_index'], ctx_copy.get('fragment_filename_sanitized')
 
-            with tpe or concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+            def append_downloaded_fragment(fragment, frag_index, frag_filename):
+                ctx.update({
+                    'fragment_filename_sanitized': frag_filename,
+                    'fragment_index': frag_index,
+                })
+                return append_fragment(decrypt_fragment(fragment, self._read_fragment(ctx)), frag_index, ctx)
+
+            pending = collections.deque()
+            with scheduler or contextlib.nullcontext(), \
+                    tpe or concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
                 try:
-                    for fragment, frag_index, frag_filename in pool.map(_download_fragment, fragments):
-                        ctx.update({
-                            'fragment_filename_sanitized': frag_filename,
-                            'fragment_index': frag_index,
-                        })
-                        if not append_fragment(decrypt_fragment(fragment, self._read_fragment(ctx)), frag_index, ctx):
+                    for result in self._map_ordered(
+                            pool, _download_fragment, fragments, max_workers * 2, pending):
+                        if not append_downloaded_fragment(*result):
                             return False
                 except KeyboardInterrupt:
                     self._finish_multiline_status()
-                    self.report_error(
-                        'Interrupted by user. Waiting for all threads to shutdown...', is_error=False, tb=False)
-                    pool.shutdown(wait=False)
-                    raise
+                    if ctx.get('live'):
+                        # Keep what has been appended so far, and the fragments that are already being downloaded
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        concurrent.futures.wait(pending)
+                        for future in pending:
+                            if future.cancelled() or future.exception():
+                                break
+                            if not append_downloaded_fragment(*future.result()):
+                                return False
+                    else:
+                        self.report_error(
+                            'Interrupted by user. Waiting for all threads to shutdown...', is_error=False, tb=False)
+                        pool.shutdown(wait=False)
+                        raise
+            if scheduler:
+                self._report_concurrency(scheduler)
         else:
             for fragment in fragments:
                 if not interrupt_trigger[0]:
@@ -514,7 +838,7 @@ def _download_fragment(fragment):
                     result = append_fragment(
                         decrypt_fragment(fragment, self._read_fragment(ctx)), fragment['frag_index'], ctx)
                 except KeyboardInterrupt:
-                    if info_dict.get('is_live'):
+                    if ctx.get('live'):
                         break
                     raise
                 if not result:
@@ -1,6 +1,8 @@
 import binascii
 import io
+import itertools
 import re
+import time
 import urllib.parse
 
 from . import get_suitable_downloader
@@ -8,9 +10,11 @@
 from .fragment import FragmentFD
 from .. import webvtt
 from ..dependencies import Cryptodome
+from ..networking.exceptions import HTTPError, IncompleteRead, TransportError
 from ..utils import (
+    M3U8Playlist,
+    RetryManager,
     bug_reports_message,
-    parse_m3u8_attributes,
     remove_start,
     traverse_obj,
     update_url_query,
@@ -28,6 +32,11 @@ class HlsFD(FragmentFD):
 
     FD_NAME = 'hlsnative'
 
+    # Number of fragments before the live edge to start downloading a live stream from
+    _LIVE_EDGE_FRAGMENTS = 3
+    # Consider a live stream as ended if its playlist is not updated for this many target durations
+    _LIVE_IDLE_TARGET_DURATIONS = 10
+
     @staticmethod
     def _has_drm(manifest):  # TODO: https://github.com/yt-dlp/yt-dlp/pull/5039
         return bool(re.search('|'.join((
@@ -64,17 +73,167 @@ def can_download(cls, manifest, info_dict, allow_unplayable_formats=False):
             ]
 
         def check_results():
-            yield not info_dict.get('is_live')
             for feature in UNSUPPORTED_FEATURES:
                 yield not re.search(feature, manifest)
             if not allow_unplayable_formats:
                 yield not cls._has_drm(manifest)
         return all(check_results())
 
+    def _parse_fragments(self, playlist, man_url, info_dict):
+        """
+        Parse the media playlist into a list of fragments (without 'frag_index')
+
+        Besides the keys used by the fragment downloader, each fragment has
+        'duration' (from EXTINF) and either 'init' (for EXT-X-MAP) or
+        'sequence', the media sequence number of the segment in the playlist
+        """
+        format_index = info_dict.get('format_index')
+        extra_segment_query = None
+        if extra_param_to_segment_url := info_dict.get('extra_param_to_segment_url'):
+            extra_segment_query = urllib.parse.parse_qs(extra_param_to_segment_url)
+        extra_key_query = None
+        if extra_param_to_key_url := info_dict.get('extra_param_to_key_url'):
+            extra_key_query = urllib.parse.parse_qs(extra_param_to_key_url)
+        external_aes_key = traverse_obj(info_dict, ('hls_aes', 'key'))
+        if external_aes_key:
+            external_aes_key = binascii.unhexlify(remove_start(external_aes_key, '0x'))
+            assert len(external_aes_key) in (16, 24, 32), 'Invalid length for HLS AES-128 key'
+        external_aes_iv = traverse_obj(info_dict, ('hls_aes', 'iv'))
+        if external_aes_iv:
+            external_aes_iv = binascii.unhexlify(remove_start(external_aes_iv, '0x').zfill(32))
+
+        fragments = []
+        media_sequence = playlist.media_sequence
+        decrypt_info = {'METHOD': 'NONE'}
+        key = None
+        for segment in playlist.segments:
+            if segment.key is not key:
+                key, decrypt_url = segment.key, decrypt_info.get('URI')
+                decrypt_info = dict(key)
+                if decrypt_info['METHOD'] == 'AES-128':
+                    if external_aes_iv:
+                        decrypt_info['IV'] = external_aes_iv
+                    elif 'IV' in decrypt_info:
+                        decrypt_info['IV'] = binascii.unhexlify(decrypt_info['IV'][2:].zfill(32))
+                    if external_aes_key:
+                        decrypt_info['KEY'] = external_aes_key
+                    else:
+                        decrypt_info['URI'] = urljoin(man_url, decrypt_info['URI'])
+                        if extra_key_query or extra_segment_query:
+                            # Fall back to extra_segment_query to key for backwards compat
+                            decrypt_info['URI'] = update_url_query(
+                                decrypt_info['URI'], extra_key_query or extra_segment_query)
+                        if decrypt_url != decrypt_info['URI']:
+                            decrypt_info['KEY'] = None
+
+            if format_index is not None and segment.discontinuity != format_index:
+                continue
+            if segment.ad:
+                continue
+            frag_url = urljoin(man_url, segment.uri)
+            if extra_segment_query:
+                frag_url = update_url_query(frag_url, extra_segment_query)
+
+            byte_range = {}
+            if segment.byte_range:
+                byte_range = {'start': segment.byte_range[0], 'end': segment.byte_range[1]}
+            fragment = {
+                'url': frag_url,
+                'decrypt_info': decrypt_info,
+                'byte_range': byte_range,
+                'media_sequence': media_sequence,
+            }
+            if segment.init:
+                fragment['init'] = True
+            else:
+                fragment.update({
+                    'sequence': segment.sequence,
+                    'duration': segment.duration,
+                })
+            fragments.append(fragment)
+            media_sequence += 1
+
+        return fragments
+
+    def _live_fragments(self, ctx, info_dict, man_url, s):
+        """
+        Yield the fragments of a live media playlist, refreshing it as per RFC 8216 section 6.3.4
+
+        Segments are deduplicated by their media sequence number. Unless the format is
+        'is_from_start', the download starts near the live edge instead of at the
+        beginning of the DVR window
+        """
+        last_sequence = last_init = None
+        last_media_sequence = last_discontinuity_sequence = 0
+        frag_index = ctx['fragment_index']
+        idle_since = time.monotonic()
+        while True:
+            playlist = M3U8Playlist.parse(s)
+            target_duration = playlist.target_duration or 10
+            discontinuity_sequence = playlist.discontinuity_sequence
+            fragments = self._parse_fragments(playlist, man_url, info_dict)
+            sequences = [f['sequence'] for f in fragments if not f.get('init')]
+
+            if last_sequence is None:
+                if not info_dict.get('is_from_start') and len(sequences) > self._LIVE_EDGE_FRAGMENTS:
+                    # Start a few segments behind the edge, like players do (RFC 8216 section 6.3.3)
+                    last_sequence = sequences[-self._LIVE_EDGE_FRAGMENTS - 1]
+            # The media sequence number never decreases (RFC 8216 section 6.2.2), unless the stream was restarted
+            elif sequences and (playlist.media_sequence < last_media_sequence or (
+                    sequences[-1] < last_sequence and discontinuity_sequence > last_discontinuity_sequence)):
+                self.report_warning('The media sequence of the live stream has been reset')
+                last_sequence = None
+            last_media_sequence, last_discontinuity_sequence = playlist.media_sequence, discontinuity_sequence
+
+            pending_init = None
+            has_new = False
+            for fragment in fragments:
+                if fragment.get('init'):
+                    pending_init = fragment
+                    continue
+                if last_sequence is not None and fragment['sequence'] <= last_sequence:
+                    continue
+                if pending_init:
+                    init_key = (pending_init['url'], pending_init['byte_range'].get('start'))
+                    if init_key != last_init:
+                        last_init = init_key
+                        frag_index += 1
+                        yield {**pending_init, 'frag_index': frag_index}
+                    pending_init = None
+                has_new = True
+                last_sequence = fragment['sequence']
+                frag_index += 1
+                yield {**fragment, 'frag_index': frag_index}
+
+            if not playlist.is_live:
+                return
+            if has_new:
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since > self._LIVE_IDLE_TARGET_DURATIONS * target_duration:
+                self.to_screen(f'[{self.FD_NAME}] No new fragments were added to the playlist; '
+                               'assuming the live stream has ended')
+                return
+
+            # If the playlist has not changed, wait for half the target duration before reloading
+            time.sleep(target_duration if has_new else target_duration / 2)
+            retry_manager = RetryManager(self.params.get('fragment_retries'), self.report_retry, fatal=False)
+            for retry in retry_manager:
+                try:
+                    with self.ydl.urlopen(self._prepare_url(info_dict, man_url)) as urlh:
+                        man_url = urlh.url
+                        s = urlh.read().decode('utf-8', 'ignore')
+                except (HTTPError, TransportError, IncompleteRead) as err:
+                    retry.error = err
+            if retry_manager.error:
+                self.report_warning('Unable to refresh the live playlist; stopping the download')
+                return
+
     def real_download(self, filename, info_dict):
         man_url = info_dict['url']
 
         s = info_dict.get('hls_media_playlist_data')
+        if not s and (shared := self.ydl._m3u8_playlists.pop(man_url, None)):
+            s, man_url = shared
         if s:
             self.to_screen(f'[{self.FD_NAME}] Using m3u8 manifest from extracted info')
         else:
@@ -91,6 +250,13 @@ def real_download(self, filename, info_dict):
                     outf.write(s_bytes)
             s = s_bytes.decode('utf-8', 'ignore')
 
+        playlist = M3U8Playlist.parse(s)
+        live = bool(info_dict.get('is_live') or (
+            info_dict.get('extractor_key') == 'Generic' and playlist.is_live and playlist.media_sequence))
+        if live and not playlist.is_live:
+            live = False
+            self.to_screen(f'[{self.FD_NAME}] The live stream has ended; downloading it as a VOD')
+
         can_download, message = self.can_download(s, info_dict, self.params.get('allow_unplayable_formats')), None
         if can_download:
             has_ffmpeg = FFmpegFD.available()
@@ -107,10 +273,6 @@ def real_download(self, filename, info_dict):
                     can_download = False
                 else:
                     message += '; decryption will be performed natively, but will be extremely slow'
-            elif info_dict.get('extractor_key') == 'Generic' and re.search(r'(?m)#EXT-X-MEDIA-SEQUENCE:(?!0$)', s):
-                install_ffmpeg = '' if has_ffmpeg else 'install ffmpeg and '
-                message = ('Live HLS streams are not supported by the native downloader. If this is a livestream, '
-                           f'please {install_ffmpeg}add "--downloader ffmpeg --hls-use-mpegts" to your command')
         if not can_download:
             if self._has_drm(s) and not self.params.get('allow_unplayable_formats'):
                 if info_dict.get('has_drm') and self.params.get('test'):
@@ -128,8 +290,19 @@ def real_download(self, filename, info_dict):
             self.report_warning(message)
 
         is_webvtt = info_dict['ext'] == 'vtt'
-        if is_webvtt:
-            real_downloader = None  # Packing the fragments is not currently supported for external downloader
+        section = None
+        if not (live or is_webvtt) and (info_dict.get('section_start') or info_dict.get('section_end')):
+            section = self._select_section_fragments(self._parse_fragments(playlist, man_url, info_dict), info_dict)
+            if not section:
+                fd = FFmpegFD(self.ydl, self.params)
+                self.report_warning(
+                    f'The duration of some fragments is unknown; the section will be downloaded by {fd.get_basename()}')
+                return fd.real_download(filename, info_dict)
+
+        if is_webvtt or live or section:
+            # Packing the fragments is not currently supported for external downloader,
+            # nor is refreshing the playlist of a live stream or trimming a section
+            real_downloader = None
         else:
             real_downloader = get_suitable_downloader(
                 info_dict, self.params, None, protocol='m3u8_frag_urls', to_stdout=(filename == '-'))
@@ -138,38 +311,16 @@ def real_download(self, filename, info_dict):
         if real_downloader:
             self.to_screen(f'[{self.FD_NAME}] Fragment downloads will be delegated to {real_downloader.get_basename()}')
 
-        def is_ad_fragment_start(s):
-            return ((s.startswith('#ANVATO-SEGMENT-INFO') and 'type=ad' in s)
-                    or (s.startswith('#UPLYNK-SEGMENT') and s.endswith(',ad')))
-
-        def is_ad_fragment_end(s):
-            return ((s.startswith('#ANVATO-SEGMENT-INFO') and 'type=master' in s)
-                    or (s.startswith('#UPLYNK-SEGMENT') and s.endswith(',segment')))
-
-        fragments = []
-
-        media_frags = 0
-        ad_frags = 0
-        ad_frag_next = False
-        for line in s.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith('#'):
-                if is_ad_fragment_start(line):
-                    ad_frag_next = True
-                elif is_ad_fragment_end(line):
-                    ad_frag_next = False
-                continue
-            if ad_frag_next:
-                ad_frags += 1
-                continue
-            media_frags += 1
+        ad_frags = sum(segment.ad for segment in playlist.segments)
+        media_frags = sum(not segment.init for segment in playlist.segments) - ad_frags
+        if section:
+            media_frags, ad_frags = sum(not frag.get('init') for frag in section[0]), 0
 
         ctx = {
             'filename': filename,
             'total_frags': media_frags,
             'ad_frags': ad_frags,
+            'live': live,
         }
 
         if real_downloader:
@@ -179,128 +330,24 @@ def is_ad_fragment_end(s):
 
         extra_state = ctx.setdefault('extra_state', {})
 
-        format_index = info_dict.get('format_index')
-        extra_segment_query = None
-        if extra_param_to_segment_url := info_dict.get('extra_param_to_segment_url'):
-            extra_segment_query = urllib.parse.parse_qs(extra_param_to_segment_url)
-        extra_key_query = None
-        if extra_param_to_key_url := info_dict.get('extra_param_to_key_url'):
-            extra_key_query = urllib.parse.parse_qs(extra_param_to_key_url)
-        i = 0
-        media_sequence = 0
-        decrypt_info = {'METHOD': 'NONE'}
-        external_aes_key = traverse_obj(info_dict, ('hls_aes', 'key'))
-        if external_aes_key:
-            external_aes_key = binascii.unhexlify(remove_start(external_aes_key, '0x'))
-            assert len(external_aes_key) in (16, 24, 32), 'Invalid length for HLS AES-128 key'
-        external_aes_iv = traverse_obj(info_dict, ('hls_aes', 'iv'))
-        if external_aes_iv:
-            external_aes_iv = binascii.unhexlify(remove_start(external_aes_iv, '0x').zfill(32))
-        byte_range = {}
-        byte_range_offset = 0
-        discontinuity_count = 0
-        frag_index = 0
-        ad_frag_next = False
-        for line in s.splitlines():
-            line = line.strip()
-            if line:
-                if not line.startswith('#'):
-                    if format_index is not None and discontinuity_count != format_index:
-                        continue
-                    if ad_frag_next:
-                        continue
-                    frag_index += 1
-                    if frag_index <= ctx['fragment_index']:
-                        continue
-                    frag_url = urljoin(man_url, line)
-                    if extra_segment_query:
-                        frag_url = update_url_query(frag_url, extra_segment_query)
-
-                    fragments.append({
-                        'frag_index': frag_index,
-                        'url': frag_url,
-                        'decrypt_info': decrypt_info,
-                        'byte_range': byte_range,
-                        'media_sequence': media_sequence,
-                    })
-                    media_sequence += 1
-
-                    # If the byte_range is truthy, reset it after appending a fragment that uses it
-                    if byte_range:
-                        byte_range_offset = byte_range['end']
-                        byte_range = {}
-
-                elif line.startswith('#EXT-X-MAP'):
-                    if format_index is not None and discontinuity_count != format_index:
-                        continue
-                    if frag_index > 0:
-                        self.report_error(
-                            'Initialization fragment found after media fragments, unable to download')
-                        return False
-                    frag_index += 1
-                    map_info = parse_m3u8_attributes(line[11:])
-                    frag_url = urljoin(man_url, map_info.get('URI'))
-                    if extra_segment_query:
-                        frag_url = update_url_query(frag_url, extra_segment_query)
-
-                    map_byte_range = {}
-
-                    if map_info.get('BYTERANGE'):
-                        splitted_byte_range = map_info.get('BYTERANGE').split('@')
-                        sub_range_start = int(splitted_byte_range[1]) if len(splitted_byte_range) == 2 else 0
-                        map_byte_range = {
-                            'start': sub_range_start,
-                            'end': sub_range_start + int(splitted_byte_range[0]),
-                        }
-
-                    fragments.append({
-                        'frag_index': frag_index,
-                        'url': frag_url,
-                        'decrypt_info': decrypt_info,
-                        'byte_range': map_byte_range,
-                        'media_sequence': media_sequence,
-                    })
-                    media_sequence += 1
-
-                elif line.startswith('#EXT-X-KEY'):
-                    decrypt_url = decrypt_info.get('URI')
-                    decrypt_info = parse_m3u8_attributes(line[11:])
-                    if decrypt_info['METHOD'] == 'AES-128':
-                        if external_aes_iv:
-                            decrypt_info['IV'] = external_aes_iv
-                        elif 'IV' in decrypt_info:
-                            decrypt_info['IV'] = binascii.unhexlify(decrypt_info['IV'][2:].zfill(32))
-                        if external_aes_key:
-                            decrypt_info['KEY'] = external_aes_key
-                        else:
-                            decrypt_info['URI'] = urljoin(man_url, decrypt_info['URI'])
-                            if extra_key_query or extra_segment_query:
-                                # Fall back to extra_segment_query to key for backwards compat
-                                decrypt_info['URI'] = update_url_query(
-                                    decrypt_info['URI'], extra_key_query or extra_segment_query)
-                            if decrypt_url != decrypt_info['URI']:
-                                decrypt_info['KEY'] = None
-
-                elif line.startswith('#EXT-X-MEDIA-SEQUENCE'):
-                    media_sequence = int(line[22:])
-                elif line.startswith('#EXT-X-BYTERANGE'):
-                    splitted_byte_range = line[17:].split('@')
-                    sub_range_start = int(splitted_byte_range[1]) if len(splitted_byte_range) == 2 else byte_range_offset
-                    byte_range = {
-                        'start': sub_range_start,
-                        'end': sub_range_start + int(splitted_byte_range[0]),
-                    }
-                elif is_ad_fragment_start(line):
-                    ad_frag_next = True
-                elif is_ad_fragment_end(line):
-                    ad_frag_next = False
-                elif line.startswith('#EXT-X-DISCONTINUITY'):
-                    discontinuity_count += 1
-                i += 1
+        if live:
+            fragments = self._live_fragments(ctx, info_dict, man_url, s)
+        else:
+            fragments = []
+            frag_index = 0
+            for fragment in section[0] if section else self._parse_fragments(playlist, man_url, info_dict):
+                if fragment.get('init') and frag_index > 0:
+                    self.report_error(
+                        'Initialization fragment found after media fragments, unable to download')
+                    return False
+                frag_index += 1
+                if frag_index <= ctx['fragment_index']:
+                    continue
+                fragments.append({**fragment, 'frag_index': frag_index})
 
         # We only download the first fragment during the test
         if self.params.get('test', False):
-            fragments = fragments[:1]
+            fragments = list(itertools.islice(fragments, 1))
 
         if real_downloader:
             info_dict['fragments'] = fragments
@@ -400,10 +447,14 @@ def fin_fragments():
 
                 return output.getvalue().encode()
 
-            if len(fragments) == 1:
+            if not live and len(fragments) == 1:
                 self.download_and_append_fragments(ctx, fragments, info_dict)
             else:
                 self.download_and_append_fragments(
                     ctx, fragments, info_dict, pack_func=pack_fragment, finish_func=fin_fragments)
+        elif section:
+            return self.download_and_append_fragments(ctx, fragments, info_dict) and self._trim_section(
+                ctx['filename'], info_dict, section[1],
+                ['-f', 'mpegts'] if self.params.get('hls_use_mpegts') else [])
         else:
             return self.download_and_append_fragments(ctx, fragments, info_dict)
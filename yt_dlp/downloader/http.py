@@ -38,6 +38,10 @@ class DownloadContext(dict):
         ctx.filename = filename
         ctx.tmpfilename = self.temp_name(filename)
         ctx.stream = None
+        # Data that has been written to a pipe cannot be taken back, so the pipe is kept
+        # open across retries, and the download can only continue where it stopped
+        ctx.is_pipe = ctx.tmpfilename == '-' or (
+            os.path.exists(ctx.tmpfilename) and not os.path.isfile(ctx.tmpfilename))
 
         # Disable compression
         headers = HTTPHeaderDict({'Accept-Encoding': 'identity'}, info_dict.get('http_headers'))
@@ -227,28 +231,41 @@ def download():
                     return False
 
             byte_counter = 0 + ctx.resume_len
-            block_size = ctx.block_size
+            # Smaller reads keep the rate steady instead of alternating bursts and long waits
+            max_block_size = self.rate_limiter.max_block_size if self.rate_limiter else float('inf')
+            block_size = min(ctx.block_size, max_block_size)
             start = time.time()
 
-            # measure time over whole while-loop, so slow_down() and best_block_size() work together properly
-            now = None  # needed for slow_down() in the first loop run
+            # measure time over whole while-loop, so the rate limit and best_block_size() work together properly
             before = start  # start measuring
 
             def retry(e):
-                close_stream()
-                if ctx.tmpfilename == '-':
+                if ctx.is_pipe:
                     ctx.resume_len = byte_counter
                 else:
+                    close_stream()
                     try:
                         ctx.resume_len = os.path.getsize(ctx.tmpfilename)
                     except FileNotFoundError:
                         ctx.resume_len = 0
                 raise RetryDownload(e)
 
+            if ctx.is_pipe and ctx.stream is not None and ctx.open_mode == 'wb':
+                close_stream()
+                self.to_stderr('\n')
+                self.report_error('Unable to resume the download, and the data already written cannot be replaced')
+                return False
+
+            # Every block is read into the same buffer, which only grows along with the block size
+            buffer = memoryview(bytearray(0))
+
             while True:
+                read_size = block_size if not is_test else min(block_size, data_len - byte_counter)
+                if read_size > len(buffer):
+                    buffer = memoryview(bytearray(read_size))
                 try:
                     # Download and write
-                    data_block = ctx.data.read(block_size if not is_test else min(block_size, data_len - byte_counter))
+                    data_block = buffer[:ctx.data.readinto(buffer[:read_size])]
                 except TransportError as err:
                     retry(err)
 
@@ -278,7 +295,8 @@ def retry(e):
                     return False
 
                 # Apply rate limit
-                self.slow_down(start, now, byte_counter - ctx.resume_len)
+                if self.rate_limiter:
+                    self.rate_limiter.consume(len(data_block), url)
 
                 # end measuring of one loop run
                 now = time.time()
@@ -286,7 +304,7 @@ def retry(e):
 
                 # Adjust block size
                 if not self.params.get('noresizebuffer', False):
-                    block_size = self.best_block_size(after - before, len(data_block))
+                    block_size = min(self.best_block_size(after - before, len(data_block)), max_block_size)
 
                 before = after
 
@@ -333,13 +351,13 @@ def retry(e):
                 ctx.resume_len = byte_counter
                 raise NextFragment
 
-            if ctx.tmpfilename != '-':
-                ctx.stream.close()
-
             if data_len is not None and byte_counter != data_len:
                 err = ContentTooShortError(byte_counter, int(data_len))
                 retry(err)
 
+            if ctx.tmpfilename != '-':
+                ctx.stream.close()
+
             self.try_rename(ctx.tmpfilename, ctx.filename)
 
             # Update file modification time
@@ -373,4 +391,5 @@ def retry(e):
             except:  # noqa: E722
                 close_stream()
                 raise
+        close_stream()
         return False
@@ -0,0 +1,103 @@
+import contextlib
+import contextvars
+import os
+import tempfile
+import threading
+
+from .external import FFmpegFD
+
+
+class FFmpegStreamMergeFD(FFmpegFD):
+    """
+    Merge the requested formats with ffmpeg while they are being downloaded.
+
+    Every format is downloaded by its native downloader into a named pipe, and a
+    single ffmpeg process muxes the pipes into the output file. Unlike downloading
+    the formats separately and merging them with FFmpegMergerPP, the formats are
+    never written to disk on their own. This is only available where os.mkfifo is
+    (i.e. not on Windows), and interrupted downloads cannot be resumed.
+    Since ffmpeg cannot seek in a pipe, MP4 formats that have their index at the
+    end of the file (i.e. that are not "faststart") cannot be merged this way
+    """
+
+    SUPPORTED_PROTOCOLS = ('http', 'https', 'm3u8_native', 'http_dash_segments')
+
+    @classmethod
+    def get_basename(cls):
+        return FFmpegFD.get_basename()
+
+    @classmethod
+    def supports(cls, info_dict):
+        return all((
+            hasattr(os, 'mkfifo'),
+            not info_dict.get('to_stdout'),
+            not info_dict.get('is_live'),
+            not (info_dict.get('section_start') or info_dict.get('section_end')),
+            len(info_dict.get('requested_formats') or []) > 1,
+            all(proto in cls.SUPPORTED_PROTOCOLS for proto in info_dict['protocol'].split('+')),
+        ))
+
+    def _call_downloader(self, tmpfilename, info_dict):
+        from . import get_suitable_downloader
+
+        requested_formats = info_dict['requested_formats']
+        with tempfile.TemporaryDirectory(prefix='yt-dlp-merge-') as tmpdir:
+            self._jobs, pipe_formats = [], []
+            for idx, fmt in enumerate(requested_formats):
+                fmt_info = {**info_dict, **fmt}
+                fmt_info.pop('requested_formats', None)
+                pipe_name = os.path.join(tmpdir, f'{idx}.{fmt["ext"]}')
+                os.mkfifo(pipe_name)
+                fd_cls = get_suitable_downloader(fmt_info, self.params)
+                fd = fd_cls(self.ydl, {
+                    **self.params,
+                    # A pipe can neither be resumed nor be checked for its size
+                    'continuedl': False,
+                    'noprogress': True,
+                    '_no_ytdl_file': True,
+                })
+                fd.add_progress_hook(
+                    lambda s, idx=idx: s['status'] == 'downloading' and self._hook_progress({
+                        **s,
+                        'filename': tmpfilename,
+                        'progress_idx': idx,
+                        'max_progress': len(requested_formats),
+                    }, info_dict))
+                self._jobs.append({'fd': fd, 'pipe': pipe_name, 'info_dict': fmt_info, 'success': False})
+                # ffmpeg reads a single stream from every pipe
+                pipe_formats.append({**fmt, 'url': pipe_name, 'protocol': None, 'manifest_stream_number': 0})
+
+            self.to_screen(
+                f'[{self.get_basename()}] Merging {len(requested_formats)} formats while downloading them')
+            self._prepare_multiline_status(len(requested_formats))
+            try:
+                retval = super()._call_downloader(tmpfilename, {**info_dict, 'requested_formats': pipe_formats})
+            finally:
+                self._finish_multiline_status()
+                for job in filter(lambda job: job.get('thread'), self._jobs):
+                    # Unblock the writers that are still waiting for ffmpeg to open their pipe
+                    if job['thread'].is_alive():
+                        with contextlib.suppress(OSError):
+                            os.close(os.open(job['pipe'], os.O_RDONLY | os.O_NONBLOCK))
+                    job['thread'].join()
+        if retval == 0 and not all(job['success'] for job in self._jobs):
+            self.report_error('Unable to download all the formats being merged')
+            return 1
+        return retval
+
+    def on_process_started(self, proc, stdin):
+        def download(job):
+            try:
+                job['success'] = job['fd'].real_download(job['pipe'], job['info_dict'])
+            except BrokenPipeError:
+                pass  # ffmpeg has exited; its return code is reported instead
+            except Exception as e:
+                self.report_warning(f'Unable to download {job["info_dict"]["format_id"]}: {e}')
+            if not job['success'] and proc.poll() is None:
+                # Otherwise ffmpeg could wait for data that will never arrive
+                proc.kill()
+
+        for job in self._jobs:
+            job['thread'] = threading.Thread(
+                target=contextvars.copy_context().run, args=(download, job), daemon=True)
+            job['thread'].start()
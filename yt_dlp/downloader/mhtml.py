@@ -5,7 +5,7 @@
 
 from .fragment import FragmentFD
 from ..compat import imghdr
-from ..utils import escapeHTML, formatSeconds, srt_subtitles_timecode, urljoin
+from ..utils import DashFragments, escapeHTML, formatSeconds, srt_subtitles_timecode, urljoin
 from ..version import __version__ as YT_DLP_VERSION
 
 
@@ -95,8 +95,8 @@ def _gen_stub(self, *, fragments, frag_boundary, title):
 
     def real_download(self, filename, info_dict):
         fragment_base_url = info_dict.get('fragment_base_url')
-        fragments = info_dict['fragments'][:1] if self.params.get(
-            'test', False) else info_dict['fragments']
+        fragments = DashFragments.from_json(info_dict['fragments'])
+        fragments = fragments[:1] if self.params.get('test', False) else fragments
         title = info_dict.get('title', info_dict['format_id'])
         origin = info_dict.get('webpage_url', info_dict['url'])
 
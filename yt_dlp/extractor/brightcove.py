@@ -37,6 +37,7 @@
 class BrightcoveLegacyIE(InfoExtractor):
     IE_NAME = 'brightcove:legacy'
     _VALID_URL = r'(?:https?://.*brightcove\.com/(services|viewer).*?\?|brightcove:)(?P<query>.*)'
+    _EMBED_KEYWORDS = ('brightcove', 'custombc')
 
     _TESTS = [
         {
@@ -1,6 +1,8 @@
 import base64
 import collections
+import concurrent.futures
 import contextlib
+import contextvars
 import functools
 import getpass
 import http.cookiejar
@@ -40,12 +42,14 @@
     IDENTITY,
     JSON_LD_RE,
     NO_DEFAULT,
+    DashFragments,
     ExtractorError,
     FormatSorter,
     GeoRestrictedError,
     GeoUtils,
     ISO639Utils,
     LenientJSONDecoder,
+    M3U8Playlist,
     Popen,
     RegexNotFoundError,
     RetryManager,
@@ -74,7 +78,6 @@
     parse_codecs,
     parse_duration,
     parse_iso8601,
-    parse_m3u8_attributes,
     parse_resolution,
     qualities,
     sanitize_url,
@@ -101,6 +104,57 @@
 from ..utils._utils import _request_dump_filename
 from ..utils.jslib import devalue
 
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+def _regex_keywords(regex, min_length=4):
+    """
+    Get lowercase strings, one of which is in (the lowercased) text of every match of regex,
+    or None if there are no such strings that are at least min_length long
+    """
+    def best(alternatives):
+        # The most selective alternatives: those whose shortest string is the longest
+        return max(alternatives, key=lambda keywords: min(map(len, keywords)), default=None)
+
+    def sequence(pattern):
+        candidates, literal = [], []
+
+        def end_literal():
+            if len(literal) >= min_length:
+                candidates.append({''.join(literal)})
+            literal.clear()
+
+        def walk(pattern):
+            for op, arg in pattern:
+                if op is sre_parse.LITERAL and arg < 128:
+                    literal.append(chr(arg).lower())
+                elif op is sre_parse.SUBPATTERN:
+                    # A group is matched right after what precedes it
+                    walk(arg[-1])
+                elif op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+                    # Zero-width, so the text around them is contiguous
+                    continue
+                else:
+                    end_literal()
+                    if op is sre_parse.BRANCH:
+                        keywords = [sequence(branch) for branch in arg[1]]
+                        if None not in keywords:
+                            candidates.append(set().union(*keywords))
+                    elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and arg[0] >= 1:
+                        keywords = sequence(arg[2])
+                        if keywords is not None:
+                            candidates.append(keywords)
+
+        walk(pattern)
+        end_literal()
+        return best(candidates)
+
+    keywords = sequence(sre_parse.parse(regex))
+    return tuple(sorted(keywords)) if keywords else None
+
 
 class InfoExtractor:
     """Information Extractor class.
@@ -201,6 +255,9 @@ class InfoExtractor:
                                             fragment_base_url
                                  * "duration" (optional, int or float)
                                  * "filesize" (optional, int)
+                                 DASH formats use utils.DashFragments, which generates
+                                 the fragments of a SegmentTemplate on demand and is
+                                 serialized compactly by its to_json
                     * hls_media_playlist_data
                                  The M3U8 media playlist data as a string.
                                  Only use if the data must be modified during extraction and
@@ -547,6 +604,11 @@ class InfoExtractor:
     when the extractor cannot reliably be matched using just the URL,
     e.g. invidious/peertube instances
 
+    Webpages are only searched for the embeds of an extractor if they contain
+    (case-insensitively) one of its _EMBED_KEYWORDS. By default, these are
+    derived from _EMBED_REGEX; extractors that override _extract_embed_urls or
+    _extract_from_webpage must define them explicitly, or every webpage is searched.
+
     Embed-only extractors can be defined by setting _VALID_URL = False.
 
     To support username + password (or netrc) login, the extractor must define a
@@ -592,6 +654,7 @@ class InfoExtractor:
     SEARCH_KEY = None
     _VALID_URL = None
     _EMBED_REGEX = []
+    _EMBED_KEYWORDS = None
 
     def _login_hint(self, method=NO_DEFAULT, netrc=None):
         password_hint = f'--username and --password, --netrc-cmd, or --netrc ({netrc or self._NETRC_MACHINE}) to provide account credentials'
@@ -1201,6 +1264,38 @@ def _download_webpage(
                     raise e
                 self._sleep(timeout, video_id)
 
+    def _download_concurrently(self, func, requests, *, fatal=True):
+        """
+        Call func with each of the requests concurrently and return the results, in order
+
+        func usually downloads the request, e.g.
+            seasons = self._download_concurrently(lambda season: self._download_json(
+                f'{api_url}/seasons/{season}', video_id, f'Downloading season {season}', fatal=False), [1, 2, 3])
+        The requests go through the same network stack (retries, rate limit, proxies) as any
+        other. At most concurrent_requests calls run at once, and the calls are made one at a
+        time when sleep_interval_requests is set, to keep the sleep between requests
+
+        @param fatal    Whether to raise the first error of the calls, in order, or to report
+                        the errors as warnings and return None for the calls that failed
+        """
+        def call(request):
+            try:
+                return func(request)
+            except ExtractorError as e:
+                self._error_or_warning(e, fatal=fatal)
+
+        requests = list(requests)
+        workers = 1 if self.get_param('sleep_interval_requests') else self.get_param('concurrent_requests') or 4
+        if min(workers, len(requests)) <= 1:
+            return list(map(call, requests))
+        with concurrent.futures.ThreadPoolExecutor(min(workers, len(requests))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, call, request) for request in requests]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
     def report_warning(self, msg, video_id=None, *args, only_once=False, **kwargs):
         idstr = format_field(video_id, None, '%s: ')
         msg = f'[{self.IE_NAME}] {idstr}{msg}'
@@ -2218,6 +2313,18 @@ def _extract_m3u8_formats_and_subtitles(
             note=note, errnote=errnote, fatal=fatal, live=live, data=data,
             headers=headers, query=query, video_id=video_id)
 
+    def _share_m3u8_playlist(self, url, data, final_url, playlist=None):
+        """
+        Keep a media playlist for HlsFD until the next extraction, unless it may still change (live)
+        or is encrypted (so that it can still be delegated to ffmpeg without pycryptodomex)
+
+        @param final_url    URL of the playlist after redirects, which its URIs are relative to
+        """
+        playlist = playlist or M3U8Playlist.parse(data)
+        if playlist.is_master or playlist.is_live or 'EXT-X-KEY' in playlist.tags:
+            return
+        self._downloader._m3u8_playlists[url] = (data, final_url)
+
     def _parse_m3u8_formats_and_subtitles(
             self, m3u8_doc, m3u8_url=None, ext=None, entry_protocol='m3u8_native',
             preference=None, quality=None, m3u8_id=None, live=False, note=None,
@@ -2225,21 +2332,39 @@ def _parse_m3u8_formats_and_subtitles(
             video_id=None):
         formats, subtitles = [], {}
         has_drm = HlsFD._has_drm(m3u8_doc)
+        playlist = M3U8Playlist.parse(m3u8_doc)
 
         def format_url(url):
             return url if re.match(r'https?://', url) else urllib.parse.urljoin(m3u8_url, url)
 
+        if m3u8_url:
+            # The downloader reuses the media playlist instead of downloading it again
+            self._share_m3u8_playlist(m3u8_url, m3u8_doc, m3u8_url, playlist)
+
         if self.get_param('hls_split_discontinuity', False):
+            def download_media_playlist(manifest_url):
+                res = self._download_webpage_handle(
+                    manifest_url, video_id, fatal=fatal, data=data, headers=headers,
+                    note=False, errnote='Failed to download m3u8 playlist information')
+                if res is False:
+                    return None
+                media_doc, urlh = res
+                self._share_m3u8_playlist(manifest_url, media_doc, urlh.url)
+                return media_doc
+
+            # The media playlists of all the renditions and variants are needed, so download them at once
+            media_urls = orderedSet(format_url(uri) for uri in (
+                *traverse_obj(playlist.media, (
+                    lambda _, v: v['TYPE'] in ('VIDEO', 'AUDIO') and v['GROUP-ID'] and v['NAME'], 'URI', {str})),
+                *(uri for _, uri in playlist.variants)))
+            media_docs = dict(zip(media_urls, self._download_concurrently(download_media_playlist, media_urls), strict=True))
+
             def _extract_m3u8_playlist_indices(manifest_url=None, m3u8_doc=None):
                 if not m3u8_doc:
-                    if not manifest_url:
-                        return []
-                    m3u8_doc = self._download_webpage(
-                        manifest_url, video_id, fatal=fatal, data=data, headers=headers,
-                        note=False, errnote='Failed to download m3u8 playlist information')
-                    if m3u8_doc is False:
+                    m3u8_doc = media_docs.get(manifest_url)
+                    if not m3u8_doc:
                         return []
-                return range(1 + sum(line.startswith('#EXT-X-DISCONTINUITY') for line in m3u8_doc.splitlines()))
+                return range(1 + M3U8Playlist.parse(m3u8_doc).discontinuities)
 
         else:
             def _extract_m3u8_playlist_indices(*args, **kwargs):
@@ -2261,7 +2386,7 @@ def _extract_m3u8_playlist_indices(*args, **kwargs):
         # media playlist and MUST NOT appear in master playlist thus we can
         # clearly detect media playlist with this criterion.
 
-        if '#EXT-X-TARGETDURATION' in m3u8_doc:  # media playlist, return as is
+        if not playlist.is_master:  # media playlist, return as is
             formats = [{
                 'format_id': join_nonempty(m3u8_id, idx),
                 'format_index': idx,
@@ -2276,10 +2401,8 @@ def _extract_m3u8_playlist_indices(*args, **kwargs):
             return formats, subtitles
 
         groups = {}
-        last_stream_inf = {}
 
-        def extract_media(x_media_line):
-            media = parse_m3u8_attributes(x_media_line)
+        def extract_media(media):
             # As per [1, 4.3.4.1] TYPE, GROUP-ID and NAME are REQUIRED
             media_type, group_id, name = media.get('TYPE'), media.get('GROUP-ID'), media.get('NAME')
             if not (media_type and group_id and name):
@@ -2354,100 +2477,92 @@ def build_stream_name():
         # parse EXT-X-MEDIA tags before EXT-X-STREAM-INF in order to have the
         # chance to detect video only formats when EXT-X-STREAM-INF tags
         # precede EXT-X-MEDIA tags in HLS manifest such as [3].
-        for line in m3u8_doc.splitlines():
-            if line.startswith('#EXT-X-MEDIA:'):
-                extract_media(line)
-
-        for line in m3u8_doc.splitlines():
-            if line.startswith('#EXT-X-STREAM-INF:'):
-                last_stream_inf = parse_m3u8_attributes(line)
-            elif line.startswith('#') or not line.strip():
-                continue
-            else:
-                tbr = float_or_none(
-                    last_stream_inf.get('AVERAGE-BANDWIDTH')
-                    or last_stream_inf.get('BANDWIDTH'), scale=1000)
-                manifest_url = format_url(line.strip())
-
-                for idx in _extract_m3u8_playlist_indices(manifest_url):
-                    format_id = [m3u8_id, None, idx]
-                    # Bandwidth of live streams may differ over time thus making
-                    # format_id unpredictable. So it's better to keep provided
-                    # format_id intact.
-                    if not live:
-                        stream_name = build_stream_name()
-                        format_id[1] = stream_name or '%d' % (tbr or len(formats))
-                    f = {
-                        'format_id': join_nonempty(*format_id),
-                        'format_index': idx,
-                        'url': manifest_url,
-                        'manifest_url': m3u8_url,
-                        'tbr': tbr,
-                        'ext': ext,
-                        'fps': float_or_none(last_stream_inf.get('FRAME-RATE')),
-                        'protocol': entry_protocol,
-                        'preference': preference,
-                        'quality': quality,
-                        'has_drm': has_drm,
-                    }
+        for media in playlist.media:
+            extract_media(media)
+
+        for last_stream_inf, variant_uri in playlist.variants:
+            tbr = float_or_none(
+                last_stream_inf.get('AVERAGE-BANDWIDTH')
+                or last_stream_inf.get('BANDWIDTH'), scale=1000)
+            manifest_url = format_url(variant_uri)
+
+            for idx in _extract_m3u8_playlist_indices(manifest_url):
+                format_id = [m3u8_id, None, idx]
+                # Bandwidth of live streams may differ over time thus making
+                # format_id unpredictable. So it's better to keep provided
+                # format_id intact.
+                if not live:
+                    stream_name = build_stream_name()
+                    format_id[1] = stream_name or '%d' % (tbr or len(formats))
+                f = {
+                    'format_id': join_nonempty(*format_id),
+                    'format_index': idx,
+                    'url': manifest_url,
+                    'manifest_url': m3u8_url,
+                    'tbr': tbr,
+                    'ext': ext,
+                    'fps': float_or_none(last_stream_inf.get('FRAME-RATE')),
+                    'protocol': entry_protocol,
+                    'preference': preference,
+                    'quality': quality,
+                    'has_drm': has_drm,
+                }
 
-                    # YouTube-specific
-                    if yt_audio_content_id := last_stream_inf.get('YT-EXT-AUDIO-CONTENT-ID'):
-                        f['language'] = yt_audio_content_id.split('.')[0]
-
-                    resolution = last_stream_inf.get('RESOLUTION')
-                    if resolution:
-                        mobj = re.search(r'(?P<width>\d+)[xX](?P<height>\d+)', resolution)
-                        if mobj:
-                            f['width'] = int(mobj.group('width'))
-                            f['height'] = int(mobj.group('height'))
-                    # Unified Streaming Platform
-                    mobj = re.search(
-                        r'audio.*?(?:%3D|=)(\d+)(?:-video.*?(?:%3D|=)(\d+))?', f['url'])
-                    if mobj:
-                        abr, vbr = mobj.groups()
-                        abr, vbr = float_or_none(abr, 1000), float_or_none(vbr, 1000)
-                        f.update({
-                            'vbr': vbr,
-                            'abr': abr,
-                        })
-                    codecs = parse_codecs(last_stream_inf.get('CODECS'))
-                    f.update(codecs)
-                    audio_group_id = last_stream_inf.get('AUDIO')
-                    # As per [1, 4.3.4.1.1] any EXT-X-STREAM-INF tag which
-                    # references a rendition group MUST have a CODECS attribute.
-                    # However, this is not always respected. E.g. [2]
-                    # contains EXT-X-STREAM-INF tag which references AUDIO
-                    # rendition group but does not have CODECS and despite
-                    # referencing an audio group it represents a complete
-                    # (with audio and video) format. So, for such cases we will
-                    # ignore references to rendition groups and treat them
-                    # as complete formats.
-                    if audio_group_id and codecs and f.get('vcodec') != 'none':
-                        # Save this to determine quality of audio formats that only have a GROUP-ID
-                        f['_audio_group_id'] = audio_group_id
-                        audio_group = groups.get(audio_group_id)
-                        if audio_group and audio_group[0].get('URI'):
-                            # TODO: update acodec for audio only formats with
-                            # the same GROUP-ID
-                            f['acodec'] = 'none'
-                    if not f.get('ext'):
-                        f['ext'] = 'm4a' if f.get('vcodec') == 'none' else 'mp4'
-                    formats.append(f)
-
-                    # for DailyMotion
-                    progressive_uri = last_stream_inf.get('PROGRESSIVE-URI')
-                    if progressive_uri:
-                        http_f = f.copy()
-                        del http_f['manifest_url']
-                        http_f.update({
-                            'format_id': f['format_id'].replace('hls-', 'http-'),
-                            'protocol': 'http',
-                            'url': progressive_uri,
-                        })
-                        formats.append(http_f)
+                # YouTube-specific
+                if yt_audio_content_id := last_stream_inf.get('YT-EXT-AUDIO-CONTENT-ID'):
+                    f['language'] = yt_audio_content_id.split('.')[0]
 
-                last_stream_inf = {}
+                resolution = last_stream_inf.get('RESOLUTION')
+                if resolution:
+                    mobj = re.search(r'(?P<width>\d+)[xX](?P<height>\d+)', resolution)
+                    if mobj:
+                        f['width'] = int(mobj.group('width'))
+                        f['height'] = int(mobj.group('height'))
+                # Unified Streaming Platform
+                mobj = re.search(
+                    r'audio.*?(?:%3D|=)(\d+)(?:-video.*?(?:%3D|=)(\d+))?', f['url'])
+                if mobj:
+                    abr, vbr = mobj.groups()
+                    abr, vbr = float_or_none(abr, 1000), float_or_none(vbr, 1000)
+                    f.update({
+                        'vbr': vbr,
+                        'abr': abr,
+                    })
+                codecs = parse_codecs(last_stream_inf.get('CODECS'))
+                f.update(codecs)
+                audio_group_id = last_stream_inf.get('AUDIO')
+                # As per [1, 4.3.4.1.1] any EXT-X-STREAM-INF tag which
+                # references a rendition group MUST have a CODECS attribute.
+                # However, this is not always respected. E.g. [2]
+                # contains EXT-X-STREAM-INF tag which references AUDIO
+                # rendition group but does not have CODECS and despite
+                # referencing an audio group it represents a complete
+                # (with audio and video) format. So, for such cases we will
+                # ignore references to rendition groups and treat them
+                # as complete formats.
+                if audio_group_id and codecs and f.get('vcodec') != 'none':
+                    # Save this to determine quality of audio formats that only have a GROUP-ID
+                    f['_audio_group_id'] = audio_group_id
+                    audio_group = groups.get(audio_group_id)
+                    if audio_group and audio_group[0].get('URI'):
+                        # TODO: update acodec for audio only formats with
+                        # the same GROUP-ID
+                        f['acodec'] = 'none'
+                if not f.get('ext'):
+                    f['ext'] = 'm4a' if f.get('vcodec') == 'none' else 'mp4'
+                formats.append(f)
+
+                # for DailyMotion
+                progressive_uri = last_stream_inf.get('PROGRESSIVE-URI')
+                if progressive_uri:
+                    http_f = f.copy()
+                    del http_f['manifest_url']
+                    http_f.update({
+                        'format_id': f['format_id'].replace('hls-', 'http-'),
+                        'protocol': 'http',
+                        'url': progressive_uri,
+                    })
+                    formats.append(http_f)
 
         # Some audio-only formats only have a GROUP-ID without any other quality/bitrate/codec info
         # Each audio GROUP-ID corresponds with one or more video formats' AUDIO attribute
@@ -2484,12 +2599,11 @@ def _extract_m3u8_vod_duration(
         return self._parse_m3u8_vod_duration(m3u8_vod or '', video_id)
 
     def _parse_m3u8_vod_duration(self, m3u8_vod, video_id):
-        if '#EXT-X-ENDLIST' not in m3u8_vod:
+        playlist = M3U8Playlist.parse(m3u8_vod)
+        if 'EXT-X-ENDLIST' not in playlist.tags:
             return None
 
-        return int(sum(
-            float(line[len('#EXTINF:'):].split(',')[0])
-            for line in m3u8_vod.splitlines() if line.startswith('#EXTINF:'))) or None
+        return int(sum(segment.duration or 0 for segment in playlist.segments if not segment.init)) or None
 
     def _extract_mpd_vod_duration(
             self, mpd_url, video_id, note=None, errnote=None, data=None, headers={}, query={}):
@@ -2849,11 +2963,11 @@ def _merge_mpd_periods(self, periods):
                 assert 'is_dash_periods' not in f, 'format already processed'
                 f['is_dash_periods'] = True
                 format_key = tuple(v for k, v in f.items() if k not in (
-                    ('format_id', 'fragments', 'manifest_stream_number')))
+                    ('format_id', 'fragments', 'manifest_stream_number', '__refresh_mpd_format')))
                 if format_key not in formats:
                     formats[format_key] = f
                 elif 'fragments' in f:
-                    formats[format_key].setdefault('fragments', []).extend(f['fragments'])
+                    formats[format_key].setdefault('fragments', DashFragments()).extend(f['fragments'])
 
             if subtitles and period['subtitles']:
                 self.report_warning(bug_reports_message(
@@ -2866,6 +2980,24 @@ def _merge_mpd_periods(self, periods):
 
         return list(formats.values()), subtitles
 
+    def _refresh_mpd_format(self, mpd_url, mpd_id, format_id, video_id, headers={}):
+        """
+        Download a dynamic MPD manifest again and find a format of it in the new version
+
+        @returns    {'format': the format or None, 'is_dynamic': bool, 'update_period': minimumUpdatePeriod}
+                    or None if the manifest could not be downloaded
+        """
+        res = self._download_xml_handle(mpd_url, video_id, note=False, fatal=False, headers=headers)
+        if not res:
+            return None
+        mpd_doc, urlh = res
+        formats, _ = self._parse_mpd_formats_and_subtitles(mpd_doc, mpd_id, base_url(urlh.url), urlh.url)
+        return {
+            'format': next((f for f in formats if f.get('format_id') == format_id), None),
+            'is_dynamic': mpd_doc.get('type') == 'dynamic',
+            'update_period': parse_duration(mpd_doc.get('minimumUpdatePeriod')),
+        }
+
     def _parse_mpd_periods(self, mpd_doc, mpd_id=None, mpd_base_url='', mpd_url=None):
         """
         Parse formats from MPD manifest.
@@ -2945,6 +3077,9 @@ def extract_Initialization(source):
             return ms_info
 
         mpd_duration = parse_duration(mpd_doc.get('mediaPresentationDuration'))
+        is_dynamic = mpd_doc.get('type') == 'dynamic'
+        availability_start_time = parse_iso8601(mpd_doc.get('availabilityStartTime'))
+        time_shift_buffer_depth = parse_duration(mpd_doc.get('timeShiftBufferDepth'))
         stream_numbers = collections.defaultdict(int)
         for period_idx, period in enumerate(mpd_doc.findall(_add_ns('Period'))):
             period_entry = {
@@ -2953,6 +3088,7 @@ def extract_Initialization(source):
                 'subtitles': collections.defaultdict(list),
             }
             period_duration = parse_duration(period.get('duration')) or mpd_duration
+            period_start = parse_duration(period.get('start')) or 0
             period_ms_info = extract_multisegment_info(period, {
                 'start_number': 1,
                 'timescale': 1,
@@ -3048,6 +3184,10 @@ def extract_Initialization(source):
                         }
                     if is_drm_protected(adaptation_set) or is_drm_protected(representation):
                         f['has_drm'] = True
+                    if is_dynamic and mpd_url and content_type != 'text':
+                        # DashSegmentsFD uses it to follow live streams
+                        f['__refresh_mpd_format'] = functools.partial(
+                            self._refresh_mpd_format, mpd_url, mpd_id, format_id)
                     representation_ms_info = extract_multisegment_info(representation, adaption_set_ms_info)
 
                     def prepare_template(template_name, identifiers):
@@ -3099,47 +3239,39 @@ def location_key(location):
                         # can't be used at the same time
                         if '%(Number' in media_template and 's' not in representation_ms_info:
                             segment_duration = None
+                            first_number = 0
                             if 'total_number' not in representation_ms_info and 'segment_duration' in representation_ms_info:
                                 segment_duration = float_or_none(representation_ms_info['segment_duration'], representation_ms_info['timescale'])
-                                representation_ms_info['total_number'] = math.ceil(float_or_none(period_duration, segment_duration, default=0))
-                            representation_ms_info['fragments'] = [{
-                                media_location_key: media_template % {
-                                    'Number': segment_number,
-                                    'Bandwidth': bandwidth,
-                                },
-                                'duration': segment_duration,
-                            } for segment_number in range(
-                                representation_ms_info['start_number'],
-                                representation_ms_info['total_number'] + representation_ms_info['start_number'])]
+                                if is_dynamic and not period_duration and availability_start_time is not None:
+                                    # The segments currently available are derived from the wall clock [1, 5.3.9.5.3]
+                                    elapsed = time.time() - availability_start_time - period_start
+                                    representation_ms_info['total_number'] = max(0, math.floor(elapsed / segment_duration))
+                                    first_number = max(0, representation_ms_info['total_number'] - max(1, math.ceil(
+                                        float_or_none(time_shift_buffer_depth, segment_duration, default=0))))
+                                else:
+                                    representation_ms_info['total_number'] = math.ceil(float_or_none(period_duration, segment_duration, default=0))
+                            first_number += representation_ms_info['start_number']
+                            # The fragments are generated from the template on demand
+                            representation_ms_info['fragments'] = DashFragments.from_template(
+                                media_template, media_location_key, [[
+                                    first_number, 0, segment_duration,
+                                    representation_ms_info['total_number'] + representation_ms_info['start_number'] - first_number,
+                                ]], bandwidth=bandwidth)
                         else:
                             # $Number*$ or $Time$ in media template with S list available
                             # Example $Number*$: http://www.svtplay.se/klipp/9023742/stopptid-om-bjorn-borg
-                            representation_ms_info['fragments'] = []
+                            segments = []
                             segment_time = 0
-                            segment_d = None
                             segment_number = representation_ms_info['start_number']
-
-                            def add_segment_url():
-                                segment_url = media_template % {
-                                    'Time': segment_time,
-                                    'Bandwidth': bandwidth,
-                                    'Number': segment_number,
-                                }
-                                representation_ms_info['fragments'].append({
-                                    media_location_key: segment_url,
-                                    'duration': float_or_none(segment_d, representation_ms_info['timescale']),
-                                })
-
                             for s in representation_ms_info['s']:
                                 segment_time = s.get('t') or segment_time
-                                segment_d = s['d']
-                                add_segment_url()
-                                segment_number += 1
-                                for _ in range(s.get('r', 0)):
-                                    segment_time += segment_d
-                                    add_segment_url()
-                                    segment_number += 1
-                                segment_time += segment_d
+                                count = max(s.get('r', 0), 0) + 1
+                                segments.append([segment_number, segment_time, s['d'], count])
+                                segment_number += count
+                                segment_time += s['d'] * count
+                            representation_ms_info['fragments'] = DashFragments.from_template(
+                                media_template, media_location_key, segments,
+                                bandwidth=bandwidth, timescale=representation_ms_info['timescale'])
                     elif 'segment_urls' in representation_ms_info and 's' in representation_ms_info:
                         # No media template,
                         # e.g. https://www.youtube.com/watch?v=iXZV5uAYMJI
@@ -3182,7 +3314,7 @@ def add_segment_url():
                             # NB: mpd_url may be empty when MPD manifest is parsed from a string
                             'url': mpd_url or base_url,
                             'fragment_base_url': base_url,
-                            'fragments': [],
+                            'fragments': DashFragments(),
                             'protocol': 'mhtml' if mime_type in ('image/avif', 'image/jpeg') else 'http_dash_segments',
                         })
                         if 'initialization_url' in representation_ms_info:
@@ -3498,19 +3630,20 @@ def _extract_akamai_formats_and_subtitles(self, manifest_url, video_id, hosts={}
             f4m_url = re.sub(r'(https?://)[^/]+', r'\1' + hds_host, f4m_url)
         if 'hdcore=' not in f4m_url:
             f4m_url += ('&' if '?' in f4m_url else '?') + hdcore_sign
-        f4m_formats = self._extract_f4m_formats(
-            f4m_url, video_id, f4m_id='hds', fatal=False)
-        for entry in f4m_formats:
-            entry.update({'extra_param_to_segment_url': hdcore_sign})
-        formats.extend(f4m_formats)
 
         m3u8_url = re.sub(r'(https?://[^/]+)/z/', r'\1/i/', manifest_url).replace('/manifest.f4m', '/master.m3u8')
         hls_host = hosts.get('hls')
         if hls_host:
             m3u8_url = re.sub(r'(https?://)[^/]+', r'\1' + hls_host, m3u8_url)
-        m3u8_formats, m3u8_subtitles = self._extract_m3u8_formats_and_subtitles(
-            m3u8_url, video_id, 'mp4', 'm3u8_native',
-            m3u8_id='hls', fatal=False)
+
+        f4m_formats, (m3u8_formats, m3u8_subtitles) = self._download_concurrently(lambda extract: extract(), [
+            lambda: self._extract_f4m_formats(f4m_url, video_id, f4m_id='hds', fatal=False),
+            lambda: self._extract_m3u8_formats_and_subtitles(
+                m3u8_url, video_id, 'mp4', 'm3u8_native', m3u8_id='hls', fatal=False),
+        ])
+        for entry in f4m_formats:
+            entry.update({'extra_param_to_segment_url': hdcore_sign})
+        formats.extend(f4m_formats)
         formats.extend(m3u8_formats)
         subtitles = self._merge_subtitles(subtitles, m3u8_subtitles)
 
@@ -3553,24 +3686,27 @@ def manifest_url(manifest):
                 m_url += f'?{query}'
             return m_url
 
+        extract_manifests = []
         if 'm3u8' not in skip_protocols:
-            formats.extend(self._extract_m3u8_formats(
+            extract_manifests.append(lambda: self._extract_m3u8_formats(
                 manifest_url('playlist.m3u8'), video_id, 'mp4',
                 m3u8_entry_protocol, m3u8_id='hls', fatal=False))
         if 'f4m' not in skip_protocols:
-            formats.extend(self._extract_f4m_formats(
+            extract_manifests.append(lambda: self._extract_f4m_formats(
                 manifest_url('manifest.f4m'),
                 video_id, f4m_id='hds', fatal=False))
         if 'dash' not in skip_protocols:
-            formats.extend(self._extract_mpd_formats(
+            extract_manifests.append(lambda: self._extract_mpd_formats(
                 manifest_url('manifest.mpd'),
                 video_id, mpd_id='dash', fatal=False))
-        if re.search(r'(?:/smil:|\.smil)', url_base):
-            if 'smil' not in skip_protocols:
-                formats.extend(self._extract_smil_formats(
-                    manifest_url('jwplayer.smil'),
-                    video_id, fatal=False))
-        else:
+        is_smil = re.search(r'(?:/smil:|\.smil)', url_base)
+        if is_smil and 'smil' not in skip_protocols:
+            extract_manifests.append(lambda: self._extract_smil_formats(
+                manifest_url('jwplayer.smil'),
+                video_id, fatal=False))
+        for manifest_formats in self._download_concurrently(lambda extract: extract(), extract_manifests):
+            formats.extend(manifest_formats)
+        if not is_smil:
             if 'rtmp' not in skip_protocols:
                 formats.append({
                     'url': f'rtmp:{url_base}',
@@ -4108,6 +4244,31 @@ def _extract_embed_urls(cls, url, webpage):
                 if cls._VALID_URL is False or cls.suitable(embed_url):
                     yield embed_url
 
+    @classmethod
+    def embed_keywords(cls):
+        """
+        @returns lowercase strings, one of which is in every (lowercased) webpage that
+                 the extractor finds embeds in, or None if any webpage may have them
+        """
+        if '_EMBED_KEYWORDS_CACHE' not in cls.__dict__:
+            cls._EMBED_KEYWORDS_CACHE = cls._derive_embed_keywords()
+        return cls._EMBED_KEYWORDS_CACHE
+
+    @classmethod
+    def _derive_embed_keywords(cls):
+        if cls._EMBED_KEYWORDS is not None:
+            return tuple(keyword.lower() for keyword in cls._EMBED_KEYWORDS)
+        for name in ('_extract_from_webpage', '_extract_embed_urls'):
+            if getattr(getattr(cls, name), '__func__', None) is not getattr(InfoExtractor, name).__func__:
+                return None
+        keywords = set()
+        for regex in cls._EMBED_REGEX:
+            regex_keywords = _regex_keywords(regex)
+            if regex_keywords is None:
+                return None
+            keywords.update(regex_keywords)
+        return tuple(sorted(keywords))
+
     class StopExtraction(Exception):
         pass
 
@@ -117,6 +117,7 @@ class DailymotionIE(DailymotionBaseInfoExtractor):
     '''
     IE_NAME = 'dailymotion'
     _EMBED_REGEX = [rf'(?ix)<(?:(?:embed|iframe)[^>]+?src=|input[^>]+id=[\'"]dmcloudUrlEmissionSelect[\'"][^>]+value=)["\'](?P<url>{_VALID_URL[5:]})']
+    _EMBED_KEYWORDS = ('dailymotion', 'dai.ly', 'lequipe', 'dm.player')
     _TESTS = [{
         'url': 'http://www.dailymotion.com/video/x5kesuj_office-christmas-party-review-jason-bateman-olivia-munn-t-j-miller_news',
         'info_dict': {
@@ -8,6 +8,7 @@ class FoxNewsIE(AMPIE):
     IE_NAME = 'foxnews'
     IE_DESC = 'Fox News and Fox Business Video'
     _VALID_URL = r'https?://video\.(?:insider\.)?fox(?:news|business)\.com/v/(?:video-embed\.html\?video_id=)?(?P<id>\d+)'
+    _EMBED_KEYWORDS = ('foxnews',)
     _TESTS = [
         {
             'url': 'https://video.foxnews.com/v/6320653836112',
@@ -40,6 +40,7 @@ class GediDigitalIE(InfoExtractor):
                 <iframe[^\n]+src=
             )
             (["'])(?P<url>{_VALID_URL})\1''']
+    _EMBED_KEYWORDS = ('repubblica', 'lastampa', 'ilsecoloxix', 'huffingtonpost', 'gelocal')
     _TESTS = [{
         'url': 'https://video.lastampa.it/politica/il-paradosso-delle-regionali-la-lega-vince-ma-sembra-aver-perso/121559/121683',
         'md5': '84658d7fb9e55a6e57ecc77b73137494',
@@ -1,3 +1,5 @@
+import functools
+import itertools
 import os
 import re
 import types
@@ -9,12 +11,14 @@
 from .youtube import YoutubeIE
 from ..compat import compat_etree_fromstring
 from ..cookies import LenientSimpleCookie
+from ..downloader.hls import HlsFD
 from ..networking.exceptions import HTTPError
 from ..networking.impersonate import ImpersonateTarget
 from ..utils import (
     KNOWN_EXTENSIONS,
     MEDIA_EXTENSIONS,
     ExtractorError,
+    M3U8Playlist,
     UnsupportedError,
     determine_ext,
     determine_protocol,
@@ -50,6 +54,54 @@
 from ..utils._utils import _UnsafeExtensionError
 
 
+class _KeywordIndex:
+    """Find which of a set of keywords are in a text with a single scan of it"""
+
+    def __init__(self, keywords):
+        self._regex = re.compile(self._trie_regex(keywords)) if keywords else None
+        # The keywords in a text also include those contained in each match
+        self._contained = {keyword: {other for other in keywords if other in keyword} for keyword in keywords}
+
+    @staticmethod
+    def _trie_regex(keywords):
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            regex = branches[0] if len(branches) == 1 else '(?:{})'.format('|'.join(branches))
+            # Optional, so that the longest keyword at a position is matched
+            return f'(?:{regex})?' if '' in node else regex
+
+        return build(trie)
+
+    def search(self, text):
+        """@returns the keywords that are in the lowercased text"""
+        found = set()
+        if not self._regex:
+            return found
+        text = text.lower()
+        pos = 0
+        # Resume right after the start of each match, since keywords may overlap
+        while mobj := self._regex.search(text, pos):
+            found |= self._contained[mobj.group()]
+            if len(found) == len(self._contained):
+                break
+            pos = mobj.start() + 1
+        return found
+
+
+@functools.cache
+def _embed_keyword_index(keywords):
+    return _KeywordIndex(keywords)
+
+
 class GenericIE(InfoExtractor):
     IE_DESC = 'Generic downloader that works on some sites'
     _VALID_URL = r'.*'
@@ -634,6 +686,13 @@ def hex_or_none(value):
             duration = self._parse_m3u8_vod_duration(m3u8_doc, display_id)
             if not duration:
                 info['live_status'] = 'is_live'
+                # A playlist that reaches further back than the live edge has a DVR window to start from
+                media_segments = sum(not segment.init for segment in M3U8Playlist.parse(m3u8_doc).segments)
+                if self.get_param('live_from_start') and media_segments > HlsFD._LIVE_EDGE_FRAGMENTS:
+                    for fmt in self._downloader._get_formats(info):
+                        if determine_protocol(fmt) == 'm3u8_native':
+                            fmt.setdefault('downloader_options', {}).update({'ffmpeg_args': ['-live_start_index', '0']})
+                            fmt['is_from_start'] = True
             info['duration'] = info.get('duration') or duration
 
     def _extract_rss(self, url, video_id, doc):
@@ -997,10 +1056,18 @@ def _extract_embeds(self, url, webpage, *, urlh=None, info_dict={}):
         # There probably should be a second run of generic extractor on unescaped webpage.
         # webpage = urllib.parse.unquote(webpage)
 
+        # Only search for the embeds of the extractors whose keywords are in the webpage
+        ies = self._downloader._ies.values()
+        found_keywords = _embed_keyword_index(frozenset(itertools.chain.from_iterable(
+            filter(None, (ie.embed_keywords() for ie in ies))))).search(webpage)
+
         embeds = []
-        for ie in self._downloader._ies.values():
+        for ie in ies:
             if ie.ie_key() in smuggled_data.get('block_ies', []):
                 continue
+            keywords = ie.embed_keywords()
+            if keywords is not None and found_keywords.isdisjoint(keywords):
+                continue
             gen = ie.extract_from_webpage(self._downloader, url, webpage)
             current_embeds = []
             try:
@@ -38,6 +38,7 @@ class QuotedHTMLIE(InfoExtractor):
     _VALID_URL = False
     IE_NAME = 'generic:quoted-html'
     IE_DESC = False  # Do not list
+    _EMBED_KEYWORDS = ('data-html',)
     _WEBPAGE_TESTS = [{
         # 2 YouTube embeds in data-html
         'url': 'https://24tv.ua/bronetransporteri-ozbroyenni-zsu-shho-vidomo-pro-bronovik-wolfhound_n2167966',
@@ -138,6 +138,7 @@ class GlomexEmbedIE(GlomexBaseIE):
     _BASE_PLAYER_URL = '//player.glomex.com/integration/1/iframe-player.html'
     _BASE_PLAYER_URL_RE = re.escape(_BASE_PLAYER_URL).replace('/1/', r'/[^/]/')
     _VALID_URL = rf'https?:{_BASE_PLAYER_URL_RE}\?([^#]+&)?playlistId=(?P<id>[^#&]+)'
+    _EMBED_KEYWORDS = ('glomex', 'integrationid')
 
     _TESTS = [{
         'url': 'https://player.glomex.com/integration/1/iframe-player.html?integrationId=4059a013k56vb2yd&playlistId=v-cfa6lye0dkdd-sf',
@@ -41,6 +41,7 @@ class KalturaIE(InfoExtractor):
         2: 'ttml',
         3: 'vtt',
     }
+    _EMBED_KEYWORDS = ('kaltura', 'kwidget')
     _TESTS = [{
         'url': 'kaltura:269692:1_1jc2y3e4',
         'md5': '3adcbdb3dcc02d647539e53f284ba171',
@@ -94,6 +94,7 @@ class MedialaanIE(MedialaanBaseIE):
                         )
                         (?P<id>\d+)
                     '''
+    _EMBED_KEYWORDS = ('data-mychannels-type',)
     _TESTS = [{
         'url': 'https://www.bndestem.nl/video/de-terugkeer-van-ally-de-aap-en-wie-vertrekt-er-nog-bij-nac~p193993',
         'info_dict': {
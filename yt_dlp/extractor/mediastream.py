@@ -43,6 +43,7 @@ def _extract_mediastream_urls(self, webpage):
 
 class MediaStreamIE(MediaStreamBaseIE):
     _VALID_URL = MediaStreamBaseIE._BASE_URL_RE + r'/(?P<id>\w+)'
+    _EMBED_KEYWORDS = ('mdstrm', 'mdstream', 'mediastreamvideoplayer')
 
     _TESTS = [{
         'url': 'https://mdstrm.com/embed/6318e3f1d1d316083ae48831',
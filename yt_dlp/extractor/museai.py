@@ -14,6 +14,7 @@
 
 class MuseAIIE(InfoExtractor):
     _VALID_URL = r'https?://(?:www\.)?muse\.ai/(?:v|embed)/(?P<id>\w+)'
+    _EMBED_KEYWORDS = ('muse',)
     _TESTS = [{
         'url': 'https://muse.ai/embed/YdTWvUW',
         'md5': 'f994f9a38be1c3aaf9e37cbd7d76fe7c',
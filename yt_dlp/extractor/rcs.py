@@ -227,6 +227,7 @@ class RCSEmbedsIE(RCSBaseIE):
                     )
                 \.it/video-embed/.+?)
             \1''']
+    _EMBED_KEYWORDS = ('rcs', 'corriere', 'gazzetta')
     _TESTS = [{
         'url': 'https://video.rcs.it/video-embed/iodonna-0001585037',
         'md5': '0faca97df525032bb9847f690bc3720c',
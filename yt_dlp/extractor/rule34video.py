@@ -2,6 +2,7 @@
 
 from .common import InfoExtractor
 from ..utils import (
+    HTMLDocument,
     clean_html,
     extract_attributes,
     get_element_by_attribute,
@@ -68,7 +69,8 @@ class Rule34VideoIE(InfoExtractor):
 
     def _real_extract(self, url):
         video_id = self._match_id(url)
-        webpage = self._download_webpage(url, video_id)
+        # The page is looked up many times
+        webpage = HTMLDocument(self._download_webpage(url, video_id))
 
         formats = []
 
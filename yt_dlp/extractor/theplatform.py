@@ -130,6 +130,7 @@ class ThePlatformIE(ThePlatformBaseIE):
                 content=(["'])(?P<url>https?://player\.theplatform\.com/p/.+?)\2''',
         r'(?s)<(?:iframe|script)[^>]+src=(["\'])(?P<url>(?:https?:)?//player\.theplatform\.com/p/.+?)\1',
     ]
+    _EMBED_KEYWORDS = ('theplatform',)
 
     _TESTS = [{
         # from http://www.metacafe.com/watch/cb-e9I_cZgTgIPd/blackberrys_big_bold_z30/
@@ -106,6 +106,7 @@ class VidyardIE(VidyardBaseIE):
         r'https?://play\.vidyard\.com/(?:player/)?(?P<id>[\w-]+)',
     ]
     _EMBED_REGEX = [r'<iframe[^>]* src=["\'](?P<url>(?:https?:)?//play\.vidyard\.com/[\w-]+)']
+    _EMBED_KEYWORDS = ('vidyard',)
     _TESTS = [{
         'url': 'https://vyexample03.hubs.vidyard.com/watch/oTDMPlUv--51Th455G5u7Q',
         'info_dict': {
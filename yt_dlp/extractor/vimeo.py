@@ -567,6 +567,7 @@ class VimeoIE(VimeoBaseInfoExtractor):
         # Non-standard embedded Vimeo player
         r'<video[^>]+src=(["\'])(?P<url>(?:https?:)?//(?:www\.)?vimeo\.com/[0-9]+)\1',
     ]
+    _EMBED_KEYWORDS = ('vimeo',)
     _TESTS = [{
         'url': 'http://vimeo.com/56015672#at=0',
         'md5': '8879b6cc097e987f02484baf890129e5',
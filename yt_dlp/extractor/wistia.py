@@ -23,6 +23,7 @@ class WistiaBaseIE(InfoExtractor):
     _VALID_ID_REGEX = r'(?P<id>[a-z0-9]{10})'
     _VALID_URL_BASE = r'https?://(?:\w+\.)?wistia\.(?:net|com)/(?:embed/)?'
     _EMBED_BASE_URL = 'http://fast.wistia.net/embed/'
+    _EMBED_KEYWORDS = ('wistia',)
 
     def _download_embed_config(self, config_type, config_id, referer):
         base_url = self._EMBED_BASE_URL + f'{config_type}/{config_id}'
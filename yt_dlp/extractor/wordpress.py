@@ -15,6 +15,7 @@
 class WordpressPlaylistEmbedIE(InfoExtractor):
     _VALID_URL = False
     IE_NAME = 'wordpress:playlist'
+    _EMBED_KEYWORDS = ('wp-playlist-script',)
     _WEBPAGE_TESTS = [{
         # 5 WordPress playlists. This is using wpse-playlist, which is similar.
         # See: https://github.com/birgire/wpse-playlist
@@ -5,6 +5,7 @@
 import functools
 import itertools
 import math
+import os
 import random
 import re
 import sys
@@ -28,7 +29,7 @@
 from .jsc.provider import JsChallengeRequest, JsChallengeType, NChallengeInput, SigChallengeInput
 from .pot._director import initialize_pot_director
 from .pot.provider import PoTokenContext, PoTokenRequest
-from ...networking import HEADRequest
+from ...networking import HEADRequest, Request
 from ...utils import (
     NO_DEFAULT,
     ExtractorError,
@@ -137,6 +138,7 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
             <a\s[^>]*\bhref="(?P<url>https://www\.youtube\.com/watch\?v=[0-9A-Za-z_-]{11})"
             \s[^>]*\bclass="[^"]*\blazy-load-youtube''',
     ]
+    _EMBED_KEYWORDS = ('youtu', 'yvii_single_video_player')
     _RETURN_TYPE = 'video'  # XXX: How to handle multifeed?
 
     _SUBTITLE_FORMATS = ('json3', 'srv1', 'srv2', 'srv3', 'ttml', 'srt', 'vtt')
@@ -1896,6 +1898,10 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         'house': 'house_brand_player.vflset/en_US/base.js',  # Used by Google Drive
     }
     _INVERSE_PLAYER_JS_VARIANT_MAP = {v: k for k, v in _PLAYER_JS_VARIANT_MAP.items()}
+    # The disk cache of player data only keeps the most recently used players,
+    # and a limited number of entries (e.g. solved n challenges) for each of them
+    _PLAYER_DATA_CACHE_MAX_PLAYERS = 4
+    _PLAYER_DATA_CACHE_MAX_ENTRIES = 1000
 
     @functools.cached_property
     def _player_js_version(self):
@@ -1932,6 +1938,7 @@ def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._code_cache = {}
         self._player_cache = {}
+        self._player_disk_cache = {}
         self._pot_director = None
 
     def _real_initialize(self):
@@ -2198,7 +2205,8 @@ def _load_player(self, video_id, player_url, fatal=True):
         player_js_key = self._player_js_cache_key(player_url)
         if player_js_key not in self._code_cache:
             code = self._download_webpage(
-                player_url, video_id, fatal=fatal,
+                # Player scripts are large and change rarely
+                Request(player_url, extensions={'cache': True}), video_id, fatal=fatal,
                 note=f'Downloading player {player_js_key}',
                 errnote=f'Download of {player_js_key} failed')
             if code:
@@ -2213,18 +2221,60 @@ def _load_player_data_from_cache(self, name, player_url, *cache_keys, use_disk_c
         if not use_disk_cache:
             return None
 
-        data = self.cache.load(cache_id[0], join_nonempty(*cache_id[1:]), min_ver='2025.07.21')
+        data = traverse_obj(self._load_player_disk_cache(name), (cache_id[1], join_nonempty(*cache_id[2:])))
         if data:
             self._player_cache[cache_id] = data
 
         return data
 
+    def _player_disk_cache_mtime(self, name):
+        try:
+            return os.stat(self.cache._get_cache_fn(f'youtube-{name}', 'players', 'json')).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_player_disk_cache(self, name):
+        # The data of all the cached players is stored together; see _store_player_data_list_to_cache.
+        # It is loaded again when it has been modified, e.g. by another process
+        mtime = self._player_disk_cache_mtime(name)
+        if name not in self._player_disk_cache or self._player_disk_cache[name][0] != mtime:
+            self._player_disk_cache[name] = (
+                mtime, self.cache.load(f'youtube-{name}', 'players', min_ver='2025.07.21') or {})
+        return self._player_disk_cache[name][1]
+
     def _store_player_data_to_cache(self, data, name, player_url, *cache_keys, use_disk_cache=False):
-        cache_id = (f'youtube-{name}', self._player_js_cache_key(player_url), *map(str_or_none, cache_keys))
-        if cache_id not in self._player_cache:
-            self._player_cache[cache_id] = data
-            if use_disk_cache:
-                self.cache.store(cache_id[0], join_nonempty(*cache_id[1:]), data)
+        self._store_player_data_list_to_cache(name, player_url, {cache_keys: data}, use_disk_cache=use_disk_cache)
+
+    def _store_player_data_list_to_cache(self, name, player_url, results, use_disk_cache=False):
+        """Store {cache_keys: data} of a player, updating the disk cache only once"""
+        player_js_key = self._player_js_cache_key(player_url)
+        new_entries = {}
+        for cache_keys, data in results.items():
+            cache_id = (f'youtube-{name}', player_js_key, *map(str_or_none, cache_keys))
+            if cache_id not in self._player_cache:
+                self._player_cache[cache_id] = data
+                new_entries[join_nonempty(*cache_id[2:])] = data
+        if not use_disk_cache or not new_entries:
+            return
+
+        def update(players):
+            players = players if isinstance(players, dict) else {}
+            # Re-insert the player and entries so that the least recently stored ones are evicted first
+            entries = players.pop(player_js_key, None)
+            entries = entries if isinstance(entries, dict) else {}
+            for key, data in new_entries.items():
+                entries.pop(key, None)
+                entries[key] = data
+            while len(entries) > self._PLAYER_DATA_CACHE_MAX_ENTRIES:
+                del entries[next(iter(entries))]
+            players[player_js_key] = entries
+            # Players are only replaced by newer ones, so the data of the old ones is not needed anymore
+            while len(players) > self._PLAYER_DATA_CACHE_MAX_PLAYERS:
+                del players[next(iter(players))]
+            return players
+
+        players = self.cache.update(f'youtube-{name}', 'players', update, min_ver='2025.07.21')
+        self._player_disk_cache[name] = (self._player_disk_cache_mtime(name), players)
 
     def _extract_signature_timestamp(self, video_id, player_url, ytcfg=None, fatal=False):
         """
@@ -2247,8 +2297,7 @@ def _extract_signature_timestamp(self, video_id, player_url, ytcfg=None, fatal=F
             self.report_warning(error_msg)
             return None
 
-        # TODO: Pass `use_disk_cache=True` when preprocessed player JS cache is solved
-        if sts := self._load_player_data_from_cache('sts', player_url):
+        if sts := self._load_player_data_from_cache('sts', player_url, use_disk_cache=True):
             return sts
 
         if code := self._load_player(video_id, player_url, fatal=fatal):
@@ -2256,8 +2305,7 @@ def _extract_signature_timestamp(self, video_id, player_url, ytcfg=None, fatal=F
                 r'(?:signatureTimestamp|sts)\s*:\s*(?P<sts>[0-9]{5})', code,
                 'JS player signature timestamp', group='sts', fatal=fatal))
             if sts:
-                # TODO: Pass `use_disk_cache=True` when preprocessed player JS cache is solved
-                self._store_player_data_to_cache(sts, 'sts', player_url)
+                self._store_player_data_to_cache(sts, 'sts', player_url, use_disk_cache=True)
 
         return sts
 
@@ -2911,7 +2959,7 @@ def _is_unplayable(player_response):
     def _is_error_response(player_response):
         return traverse_obj(player_response, ('playabilityStatus', 'status')) == 'ERROR'
 
-    def _extract_player_response(self, client, video_id, webpage_ytcfg, player_ytcfg, player_url, initial_pr, visitor_data, data_sync_id, po_token):
+    def _extract_player_response(self, client, video_id, webpage_ytcfg, player_ytcfg, sts, initial_pr, visitor_data, data_sync_id, po_token):
         headers = self.generate_api_headers(
             ytcfg=player_ytcfg,
             default_client=client,
@@ -2939,8 +2987,6 @@ def _extract_player_response(self, client, video_id, webpage_ytcfg, player_ytcfg
         if po_token:
             yt_query['serviceIntegrityDimensions'] = {'poToken': po_token}
 
-        sts = self._extract_signature_timestamp(video_id, player_url, webpage_ytcfg, fatal=False) if player_url else None
-
         use_ad_playback_context = (
             self._configuration_arg('use_ad_playback_context', ['false'])[0] != 'false'
             and traverse_obj(INNERTUBE_CLIENTS, (client, 'SUPPORTS_AD_PLAYBACK_CONTEXT', {bool})))
@@ -3043,7 +3089,11 @@ def _extract_player_responses(self, clients, video_id, webpage, webpage_client,
             prs.append({**initial_pr, 'streamingData': None})
 
         all_clients = set(clients)
-        clients = clients[::-1]
+        # The clients are requested concurrently, in batches of all the clients known so far.
+        # Their player responses are ordered as if the clients had been requested one by one:
+        # each client is followed by the clients that it added, the last added first
+        client_keys = {client: (idx,) for idx, client in enumerate(clients)}
+        client_prs = []
 
         def append_client(*client_names):
             """ Append the first client name that exists but not already used """
@@ -3053,129 +3103,163 @@ def append_client(*client_names):
                     if actual_client not in all_clients:
                         clients.append(client_name)
                         all_clients.add(actual_client)
+                        client_keys[client_name] = (*client_keys[current_client], -len(clients))
                         return
 
-        tried_iframe_fallback = False
-        player_url = visitor_data = data_sync_id = None
-        skipped_clients = {}
-        while clients:
-            deprioritize_pr = False
-            client, base_client, variant = _split_innertube_client(clients.pop())
-            player_ytcfg = webpage_ytcfg if client == webpage_client else {}
+        def download_ytcfg(client):
+            client = _split_innertube_client(client)[0]
             if 'configs' not in self._configuration_arg('player_skip') and client != webpage_client:
-                player_ytcfg = self._download_ytcfg(client, video_id) or player_ytcfg
-
-            player_url = player_url or self._extract_player_url(webpage_ytcfg, player_ytcfg, webpage=webpage)
-            require_js_player = self._get_default_ytcfg(client).get('REQUIRE_JS_PLAYER')
-            if 'js' in self._configuration_arg('player_skip'):
-                require_js_player = False
-                player_url = None
-
-            if not player_url and not tried_iframe_fallback and require_js_player:
-                player_url = self._download_player_url(video_id)
-                tried_iframe_fallback = True
-
-            pr = None
-            if client == webpage_client and 'player_response' not in self._skipped_webpage_data:
-                pr = initial_pr
-
-            visitor_data = visitor_data or self._extract_visitor_data(webpage_ytcfg, initial_pr, player_ytcfg)
-            data_sync_id = data_sync_id or self._extract_data_sync_id(webpage_ytcfg, initial_pr, player_ytcfg)
-
-            fetch_po_token_args = {
-                'client': client,
-                'visitor_data': visitor_data,
-                'video_id': video_id,
-                'data_sync_id': data_sync_id if self.is_authenticated else None,
-                'player_url': player_url if require_js_player else None,
-                'webpage': webpage,
-                'session_index': self._extract_session_index(webpage_ytcfg, player_ytcfg),
-                'ytcfg': player_ytcfg or self._get_default_ytcfg(client),
-            }
-
-            # Don't need a player PO token for WEB if using player response from webpage
-            player_pot_policy: PlayerPoTokenPolicy = self._get_default_ytcfg(client)['PLAYER_PO_TOKEN_POLICY']
-            player_po_token = None if pr else self.fetch_po_token(
-                context=_PoTokenContext.PLAYER, **fetch_po_token_args,
-                required=player_pot_policy.required or player_pot_policy.recommended)
-
-            fetch_gvs_po_token_func = functools.partial(
-                self.fetch_po_token, context=_PoTokenContext.GVS, **fetch_po_token_args)
-
-            fetch_subs_po_token_func = functools.partial(
-                self.fetch_po_token, context=_PoTokenContext.SUBS, **fetch_po_token_args)
+                return self._download_ytcfg(client, video_id)
 
+        def fetch_player_response(request):
+            # Only the innertube request is made here, concurrently. Everything that it needs,
+            # including the PO token and the player, is prepared beforehand on the calling thread
             try:
-                pr = pr or self._extract_player_response(
-                    client, video_id,
-                    webpage_ytcfg=player_ytcfg or webpage_ytcfg,
-                    player_ytcfg=player_ytcfg,
-                    player_url=player_url,
+                return request['pr'] or self._extract_player_response(
+                    request['client'], video_id,
+                    webpage_ytcfg=request['player_ytcfg'] or webpage_ytcfg,
+                    player_ytcfg=request['player_ytcfg'],
+                    sts=request['sts'],
                     initial_pr=initial_pr,
-                    visitor_data=visitor_data,
-                    data_sync_id=data_sync_id,
-                    po_token=player_po_token)
+                    visitor_data=request['visitor_data'],
+                    data_sync_id=request['data_sync_id'],
+                    po_token=request['player_po_token']), None
             except ExtractorError as e:
-                self.report_warning(e)
-                continue
+                return None, e
 
-            if pr_id := self._invalid_player_response(pr, video_id):
-                skipped_clients[client] = pr_id
-            elif pr:
-                # Save client details for introspection later
-                innertube_context = traverse_obj(player_ytcfg or self._get_default_ytcfg(client), 'INNERTUBE_CONTEXT')
-                sd = pr.setdefault('streamingData', {})
-                sd[STREAMING_DATA_CLIENT_NAME] = client
-                sd[STREAMING_DATA_FETCH_GVS_PO_TOKEN] = fetch_gvs_po_token_func
-                sd[STREAMING_DATA_PLAYER_TOKEN_PROVIDED] = bool(player_po_token)
-                sd[STREAMING_DATA_INNERTUBE_CONTEXT] = innertube_context
-                sd[STREAMING_DATA_FETCH_SUBS_PO_TOKEN] = fetch_subs_po_token_func
-                sd[STREAMING_DATA_IS_PREMIUM_SUBSCRIBER] = is_premium_subscriber
-                sd[STREAMING_DATA_AVAILABLE_AT_TIMESTAMP] = self._get_available_at_timestamp(pr, video_id, client)
-                for f in traverse_obj(sd, (('formats', 'adaptiveFormats'), ..., {dict})):
-                    f[STREAMING_DATA_CLIENT_NAME] = client
-                    f[STREAMING_DATA_FETCH_GVS_PO_TOKEN] = fetch_gvs_po_token_func
-                    f[STREAMING_DATA_IS_PREMIUM_SUBSCRIBER] = is_premium_subscriber
-                    f[STREAMING_DATA_PLAYER_TOKEN_PROVIDED] = bool(player_po_token)
-                if deprioritize_pr:
-                    deprioritized_prs.append(pr)
-                else:
-                    prs.append(pr)
-
-            if (
-                # Is this a "made for kids" video that can't be downloaded with android_vr/visionos?
-                client in {'android_vr', 'visionos'}
-                and (self._is_unplayable(pr) or self._is_error_response(pr))
-                and webpage and 'made for kids' in webpage
-                # ...and is a JS runtime is available?
-                and any(p.is_available() for p in self._jsc_director.providers.values())
-            ):
-                append_client('web_embedded')
-                append_client('tv_downgraded')
-
-            # web_embedded can work around age-gate and age-verification for some embeddable videos
-            if self._is_agegated(pr) and variant != 'web_embedded':
-                append_client(f'web_embedded.{base_client}')
-            # Unauthenticated users will only get web_embedded client formats if age-gated
-            if self._is_agegated(pr) and not self.is_authenticated:
-                self.to_screen(
-                    f'{video_id}: This video is age-restricted; some formats may be missing '
-                    f'without authentication. {self._youtube_login_hint}', only_once=True)
+        tried_iframe_fallback = False
+        player_url = visitor_data = data_sync_id = None
+        skipped_clients = {}
+        while clients:
+            batch, clients = clients, []
+            requests = []
+            for client_name, player_ytcfg in zip(
+                    batch, self._download_concurrently(download_ytcfg, batch), strict=True):
+                client = _split_innertube_client(client_name)[0]
+                player_ytcfg = player_ytcfg or (webpage_ytcfg if client == webpage_client else {})
+
+                player_url = player_url or self._extract_player_url(webpage_ytcfg, player_ytcfg, webpage=webpage)
+                require_js_player = self._get_default_ytcfg(client).get('REQUIRE_JS_PLAYER')
+                if 'js' in self._configuration_arg('player_skip'):
+                    require_js_player = False
+                    player_url = None
+
+                if not player_url and not tried_iframe_fallback and require_js_player:
+                    player_url = self._download_player_url(video_id)
+                    tried_iframe_fallback = True
+
+                pr = sts = None
+                if client == webpage_client and 'player_response' not in self._skipped_webpage_data:
+                    pr = initial_pr
+                elif player_url:
+                    sts = self._extract_signature_timestamp(video_id, player_url, player_ytcfg or webpage_ytcfg, fatal=False)
+
+                # The visitor data and data sync ID only ever come from the webpage and the client configs,
+                # never from the player responses, so they are the same as when requesting the clients one by one
+                visitor_data = visitor_data or self._extract_visitor_data(webpage_ytcfg, initial_pr, player_ytcfg)
+                data_sync_id = data_sync_id or self._extract_data_sync_id(webpage_ytcfg, initial_pr, player_ytcfg)
+
+                fetch_po_token_args = {
+                    'client': client,
+                    'visitor_data': visitor_data,
+                    'video_id': video_id,
+                    'data_sync_id': data_sync_id if self.is_authenticated else None,
+                    'player_url': player_url if require_js_player else None,
+                    'webpage': webpage,
+                    'session_index': self._extract_session_index(webpage_ytcfg, player_ytcfg),
+                    'ytcfg': player_ytcfg or self._get_default_ytcfg(client),
+                }
 
-            # EU countries require age-verification for accounts to access age-restricted videos
-            # If account is not age-verified, _is_agegated() will be truthy for non-embedded clients
-            embedding_is_disabled = variant == 'web_embedded' and self._is_unplayable(pr)
-            if self.is_authenticated and (self._is_agegated(pr) or embedding_is_disabled):
-                self.to_screen(
-                    f'{video_id}: This video is age-restricted and YouTube is requiring '
-                    'account age-verification; some formats may be missing', only_once=True)
-                # web_creator may work around age-verification for all videos but requires PO token
-                append_client('web_creator')
+                # Don't need a player PO token for WEB if using player response from webpage
+                player_pot_policy: PlayerPoTokenPolicy = self._get_default_ytcfg(client)['PLAYER_PO_TOKEN_POLICY']
+                player_po_token = None if pr else self.fetch_po_token(
+                    context=_PoTokenContext.PLAYER, **fetch_po_token_args,
+                    required=player_pot_policy.required or player_pot_policy.recommended)
+
+                requests.append({
+                    'client': client,
+                    'player_ytcfg': player_ytcfg,
+                    'sts': sts,
+                    'pr': pr,
+                    'visitor_data': visitor_data,
+                    'data_sync_id': data_sync_id,
+                    'player_po_token': player_po_token,
+                    'fetch_po_token_args': fetch_po_token_args,
+                })
 
-            status = traverse_obj(pr, ('playabilityStatus', 'status', {str}))
-            if status not in ('OK', 'LIVE_STREAM_OFFLINE', 'AGE_CHECK_REQUIRED', 'AGE_VERIFICATION_REQUIRED'):
-                self.write_debug(f'{video_id}: {client} player response playability status: {status}')
+            for current_client, request, (pr, error) in zip(
+                    batch, requests, self._download_concurrently(fetch_player_response, requests), strict=True):
+                deprioritize_pr = False
+                client, base_client, variant = _split_innertube_client(current_client)
+                player_ytcfg, player_po_token = request['player_ytcfg'], request['player_po_token']
+                if error:
+                    self.report_warning(error)
+                    continue
 
+                fetch_gvs_po_token_func = functools.partial(
+                    self.fetch_po_token, context=_PoTokenContext.GVS, **request['fetch_po_token_args'])
+
+                fetch_subs_po_token_func = functools.partial(
+                    self.fetch_po_token, context=_PoTokenContext.SUBS, **request['fetch_po_token_args'])
+
+                if pr_id := self._invalid_player_response(pr, video_id):
+                    skipped_clients[client] = pr_id
+                elif pr:
+                    # Save client details for introspection later
+                    innertube_context = traverse_obj(player_ytcfg or self._get_default_ytcfg(client), 'INNERTUBE_CONTEXT')
+                    sd = pr.setdefault('streamingData', {})
+                    sd[STREAMING_DATA_CLIENT_NAME] = client
+                    sd[STREAMING_DATA_FETCH_GVS_PO_TOKEN] = fetch_gvs_po_token_func
+                    sd[STREAMING_DATA_PLAYER_TOKEN_PROVIDED] = bool(player_po_token)
+                    sd[STREAMING_DATA_INNERTUBE_CONTEXT] = innertube_context
+                    sd[STREAMING_DATA_FETCH_SUBS_PO_TOKEN] = fetch_subs_po_token_func
+                    sd[STREAMING_DATA_IS_PREMIUM_SUBSCRIBER] = is_premium_subscriber
+                    sd[STREAMING_DATA_AVAILABLE_AT_TIMESTAMP] = self._get_available_at_timestamp(pr, video_id, client)
+                    for f in traverse_obj(sd, (('formats', 'adaptiveFormats'), ..., {dict})):
+                        f[STREAMING_DATA_CLIENT_NAME] = client
+                        f[STREAMING_DATA_FETCH_GVS_PO_TOKEN] = fetch_gvs_po_token_func
+                        f[STREAMING_DATA_IS_PREMIUM_SUBSCRIBER] = is_premium_subscriber
+                        f[STREAMING_DATA_PLAYER_TOKEN_PROVIDED] = bool(player_po_token)
+                    if deprioritize_pr:
+                        deprioritized_prs.append(pr)
+                    else:
+                        client_prs.append((client_keys[current_client], pr))
+
+                if (
+                    # Is this a "made for kids" video that can't be downloaded with android_vr/visionos?
+                    client in {'android_vr', 'visionos'}
+                    and (self._is_unplayable(pr) or self._is_error_response(pr))
+                    and webpage and 'made for kids' in webpage
+                    # ...and is a JS runtime is available?
+                    and any(p.is_available() for p in self._jsc_director.providers.values())
+                ):
+                    append_client('web_embedded')
+                    append_client('tv_downgraded')
+
+                # web_embedded can work around age-gate and age-verification for some embeddable videos
+                if self._is_agegated(pr) and variant != 'web_embedded':
+                    append_client(f'web_embedded.{base_client}')
+                # Unauthenticated users will only get web_embedded client formats if age-gated
+                if self._is_agegated(pr) and not self.is_authenticated:
+                    self.to_screen(
+                        f'{video_id}: This video is age-restricted; some formats may be missing '
+                        f'without authentication. {self._youtube_login_hint}', only_once=True)
+
+                # EU countries require age-verification for accounts to access age-restricted videos
+                # If account is not age-verified, _is_agegated() will be truthy for non-embedded clients
+                embedding_is_disabled = variant == 'web_embedded' and self._is_unplayable(pr)
+                if self.is_authenticated and (self._is_agegated(pr) or embedding_is_disabled):
+                    self.to_screen(
+                        f'{video_id}: This video is age-restricted and YouTube is requiring '
+                        'account age-verification; some formats may be missing', only_once=True)
+                    # web_creator may work around age-verification for all videos but requires PO token
+                    append_client('web_creator')
+
+                status = traverse_obj(pr, ('playabilityStatus', 'status', {str}))
+                if status not in ('OK', 'LIVE_STREAM_OFFLINE', 'AGE_CHECK_REQUIRED', 'AGE_VERIFICATION_REQUIRED'):
+                    self.write_debug(f'{video_id}: {client} player response playability status: {status}')
+
+        prs.extend(pr for _, pr in sorted(client_prs, key=lambda client_pr: client_pr[0]))
         prs.extend(deprioritized_prs)
 
         if skipped_clients:
@@ -3304,18 +3388,18 @@ def get_manifest_n_challenge(manifest_url):
         def solve_js_challenges():
             # Solve all n/sig challenges in bulk and store the results in self._player_cache
             challenge_requests = []
+            n_challenges.difference_update([
+                challenge for challenge in n_challenges
+                if self._load_player_data_from_cache('n', player_url, challenge, use_disk_cache=True)])
             if n_challenges:
                 challenge_requests.append(JsChallengeRequest(
                     type=JsChallengeType.N,
                     video_id=video_id,
                     input=NChallengeInput(challenges=list(n_challenges), player_url=player_url)))
+            s_challenges.difference_update([
+                spec_id for spec_id in s_challenges
+                if self._load_player_data_from_cache('sigfuncs', player_url, spec_id, use_disk_cache=True)])
             if s_challenges:
-                cached_sigfuncs = set()
-                for spec_id in s_challenges:
-                    if self._load_player_data_from_cache('sigfuncs', player_url, spec_id, use_disk_cache=True):
-                        cached_sigfuncs.add(spec_id)
-                s_challenges.difference_update(cached_sigfuncs)
-
                 challenge_requests.append(JsChallengeRequest(
                     type=JsChallengeType.SIG,
                     video_id=video_id,
@@ -3324,21 +3408,23 @@ def solve_js_challenges():
                         player_url=player_url)))
 
             if challenge_requests:
+                # The results are stored together, so that the disk cache is only updated once per type
+                sig_results, n_results = {}, {}
                 for _challenge_request, challenge_response in self._jsc_director.bulk_solve(challenge_requests):
                     if challenge_response.type == JsChallengeType.SIG:
                         for challenge, result in challenge_response.output.results.items():
                             spec_id = len(challenge)
-                            self._store_player_data_to_cache(
-                                [ord(c) for c in result], 'sigfuncs',
-                                player_url, spec_id, use_disk_cache=True)
+                            sig_results[(spec_id,)] = [ord(c) for c in result]
                             if spec_id in s_challenges:
                                 s_challenges.remove(spec_id)
 
                     elif challenge_response.type == JsChallengeType.N:
                         for challenge, result in challenge_response.output.results.items():
-                            self._store_player_data_to_cache(result, 'n', player_url, challenge)
+                            n_results[(challenge,)] = result
                             if challenge in n_challenges:
                                 n_challenges.remove(challenge)
+                self._store_player_data_list_to_cache('sigfuncs', player_url, sig_results, use_disk_cache=True)
+                self._store_player_data_list_to_cache('n', player_url, n_results, use_disk_cache=True)
 
                 # Raise warning if any challenge requests remain
                 # Depending on type of challenge request
@@ -47,6 +47,7 @@ class BunJCP(EJSBaseJCP, BuiltinIEContentProvider):
     SUPPORTED_PROXY_SCHEMES = ['http', 'https']
     _BUN_MAX_SUPPORTED_VERSION = (1, 3, 14)
     _BUN_DEPRECATION_URL = 'https://github.com/yt-dlp/yt-dlp/issues/16766'
+    _SUPPORTS_WORKER = True
 
     def _iter_script_sources(self):
         yield from super()._iter_script_sources()
@@ -113,9 +114,8 @@ def _get_env_options(self) -> dict[str, str]:
 
         return options
 
-    def _run_js_runtime(self, stdin: str, /) -> str:
-        is_unsupported_version = self.runtime_info.version_tuple > self._BUN_MAX_SUPPORTED_VERSION
-        if is_unsupported_version:
+    def _bun_command(self, script: str) -> list[str]:
+        if self._is_unsupported_version:
             self.logger.warning(
                 f'bun version {".".join(map(str, self.runtime_info.version_tuple))} is not supported! '
                 f'{".".join(map(str, self._BUN_MAX_SUPPORTED_VERSION))} is the last supported bun version. '
@@ -134,7 +134,14 @@ def _run_js_runtime(self, stdin: str, /) -> str:
             options.append('--install=fallback')
         else:
             options.append('--no-install')
-        cmd = [self.runtime_info.path, '--bun', 'run', *options, '-']
+        return [self.runtime_info.path, '--bun', 'run', *options, script]
+
+    @property
+    def _is_unsupported_version(self):
+        return self.runtime_info.version_tuple > self._BUN_MAX_SUPPORTED_VERSION
+
+    def _run_js_runtime(self, stdin: str, /) -> str:
+        cmd = self._bun_command('-')
         self.logger.debug(f'Running bun: {shlex.join(cmd)}')
 
         with Popen(
@@ -151,9 +158,12 @@ def _run_js_runtime(self, stdin: str, /) -> str:
                 msg = f'Error running bun process (returncode: {proc.returncode})'
                 if stderr:
                     msg = f'{msg}: {stderr.strip()}'
-                raise JsChallengeProviderError(msg, expected=is_unsupported_version)
+                raise JsChallengeProviderError(msg, expected=self._is_unsupported_version)
         return stdout
 
+    def _worker_command(self, script_path: str, /) -> list[str]:
+        return self._bun_command(script_path)
+
     def _clean_stderr(self, stderr):
         return '\n'.join(
             line for line in stderr.splitlines()
@@ -9,6 +9,7 @@
 
 from yt_dlp.dependencies import yt_dlp_ejs as _has_ejs
 from yt_dlp.extractor.youtube.jsc._builtin import vendor
+from yt_dlp.extractor.youtube.jsc._builtin.worker import JsRuntimeWorker
 from yt_dlp.extractor.youtube.jsc.provider import (
     JsChallengeProvider,
     JsChallengeProviderError,
@@ -106,9 +107,13 @@ class EJSBaseJCP(JsChallengeProvider):
     # currently disabled as files are large and we do not support rotation
     _ENABLE_PREPROCESSED_PLAYER_CACHE = False
 
+    # Whether the runtime can run the solver in a long-lived worker (see `_worker_command`)
+    _SUPPORTS_WORKER = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._available = True
+        self._worker = None
         self.ejs_settings = self.ie.get_param('extractor_args', {}).get('youtube-ejs', {})
 
         # Note: The following 3 args are for developer use only & intentionally not documented.
@@ -145,6 +150,28 @@ def _run_js_runtime(self, stdin: str, /) -> str:
         """To be implemented by subclasses"""
         raise NotImplementedError
 
+    def _worker_command(self, script_path: str, /) -> list[str]:
+        """To be implemented by subclasses supporting the worker"""
+        raise NotImplementedError
+
+    def _get_env_options(self) -> dict[str, str] | None:
+        return None
+
+    def _clean_stderr(self, stderr: str, /) -> str:
+        return stderr
+
+    def _get_worker(self, /) -> JsRuntimeWorker | None:
+        if self._SUPPORTS_WORKER and not self._worker:
+            self._worker = JsRuntimeWorker(
+                self._worker_command, self._solver_code, name=self.JS_RUNTIME_NAME, logger=self.logger,
+                env=self._get_env_options(), clean_stderr=self._clean_stderr)
+        return self._worker
+
+    def close(self):
+        if self._worker:
+            self._worker.close()
+            self._worker = None
+
     def _real_bulk_solve(self, /, requests: list[JsChallengeRequest]):
         grouped: dict[str, list[JsChallengeRequest]] = collections.defaultdict(list)
         for request in requests:
@@ -165,9 +192,14 @@ def _real_bulk_solve(self, /, requests: list[JsChallengeRequest]):
             # NB: This output belongs after the player request
             self.logger.info(f'Solving JS challenges using {self.JS_RUNTIME_NAME}')
 
-            stdin = self._construct_stdin(player, cached, grouped_requests)
-            stdout = self._run_js_runtime(stdin)
-            output = json.loads(stdout)
+            if worker := self._get_worker():
+                json_input = self._construct_input(player, cached, grouped_requests)
+                json_input['output_preprocessed'] = self._ENABLE_PREPROCESSED_PLAYER_CACHE
+                output = worker.solve(player_url, json_input, json_input.pop('requests'))
+            else:
+                stdin = self._construct_stdin(player, cached, grouped_requests)
+                stdout = self._run_js_runtime(stdin)
+                output = json.loads(stdout)
             if output['type'] == 'error':
                 raise JsChallengeProviderError(output['error'])
 
@@ -182,12 +214,12 @@ def _real_bulk_solve(self, /, requests: list[JsChallengeRequest]):
                         NChallengeOutput(response_data['data']) if request.type is JsChallengeType.N
                         else SigChallengeOutput(response_data['data']))))
 
-    def _construct_stdin(self, player: str, preprocessed: bool, requests: list[JsChallengeRequest], /) -> str:
+    def _construct_input(self, player: str, preprocessed: bool, requests: list[JsChallengeRequest], /) -> dict:
         json_requests = [{
             'type': request.type.value,
             'challenges': request.input.challenges,
         } for request in requests]
-        data = {
+        return {
             'type': 'preprocessed',
             'preprocessed_player': player,
             'requests': json_requests,
@@ -197,15 +229,24 @@ def _construct_stdin(self, player: str, preprocessed: bool, requests: list[JsCha
             'requests': json_requests,
             'output_preprocessed': True,
         }
+
+    def _construct_stdin(self, player: str, preprocessed: bool, requests: list[JsChallengeRequest], /) -> str:
+        data = self._construct_input(player, preprocessed, requests)
         return f'''\
-        {self._lib_script.code}
-        Object.assign(globalThis, lib);
-        {self._core_script.code}
+        {self._solver_code}
         console.log(JSON.stringify(jsc({json.dumps(data)})));
         '''
 
     # region: challenge solver script
 
+    @property
+    def _solver_code(self, /) -> str:
+        return f'''\
+        {self._lib_script.code}
+        Object.assign(globalThis, lib);
+        {self._core_script.code}
+        '''
+
     @functools.cached_property
     def _lib_script(self, /):
         return self._get_script(ScriptType.LIB)
@@ -22,8 +22,9 @@ class NodeJCP(EJSBaseJCP, BuiltinIEContentProvider):
     JS_RUNTIME_NAME = 'node'
 
     _ARGS = ['-']
+    _SUPPORTS_WORKER = True
 
-    def _run_js_runtime(self, stdin: str, /) -> str:
+    def _node_args(self) -> list[str]:
         args = []
 
         if self.ejs_setting('jitless', ['false']) != ['false']:
@@ -36,7 +37,10 @@ def _run_js_runtime(self, stdin: str, /) -> str:
         else:
             args.append('--permission')
 
-        cmd = [self.runtime_info.path, *args, *self._ARGS]
+        return args
+
+    def _run_js_runtime(self, stdin: str, /) -> str:
+        cmd = [self.runtime_info.path, *self._node_args(), *self._ARGS]
         self.logger.debug(f'Running node: {shlex.join(cmd)}')
         with Popen(
             cmd,
@@ -55,6 +59,10 @@ def _run_js_runtime(self, stdin: str, /) -> str:
 
         return stdout
 
+    def _worker_command(self, script_path: str, /) -> list[str]:
+        # The permission model only allows reading the worker script
+        return [self.runtime_info.path, *self._node_args(), f'--allow-fs-read={script_path}', script_path]
+
     def _clean_stderr(self, stderr):
         return '\n'.join(
             line for line in stderr.splitlines()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import pathlib
+import shlex
+import subprocess
+import tempfile
+import threading
+
+from yt_dlp.extractor.youtube.jsc.provider import JsChallengeProviderError
+from yt_dlp.utils import Popen
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from yt_dlp.extractor.youtube.pot._provider import IEContentProviderLogger
+
+# Reads one JSON input per line from stdin and writes one JSON output per line to stdout.
+# Preprocessed players are kept by id, so that an input only has to include its player once;
+# `{"type": "missing"}` is returned for an input without a player whose player is not loaded.
+_WORKER_SCRIPT = '''
+const MAX_PLAYERS = 4;
+const players = new Map();
+
+async function* readLines() {
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for await (const chunk of globalThis.Deno ? Deno.stdin.readable : process.stdin) {
+    buffer += decoder.decode(chunk, { stream: true });
+    let index;
+    while ((index = buffer.indexOf('\\n')) !== -1) {
+      yield buffer.slice(0, index);
+      buffer = buffer.slice(index + 1);
+    }
+  }
+}
+
+function solve(input) {
+  let preprocessed = players.get(input.id);
+  if (input.type === undefined) {
+    if (preprocessed === undefined) {
+      return { type: 'missing' };
+    }
+    players.delete(input.id);
+    players.set(input.id, preprocessed);
+    return jsc({ type: 'preprocessed', preprocessed_player: preprocessed, requests: input.requests });
+  }
+  const output = jsc({ ...input, output_preprocessed: true });
+  preprocessed = input.type === 'player' ? output.preprocessed_player : input.preprocessed_player;
+  if (!input.output_preprocessed) {
+    delete output.preprocessed_player;
+  }
+  players.delete(input.id);
+  players.set(input.id, preprocessed);
+  if (players.size > MAX_PLAYERS) {
+    players.delete(players.keys().next().value);
+  }
+  return output;
+}
+
+(async () => {
+  for await (const line of readLines()) {
+    let output;
+    try {
+      output = solve(JSON.parse(line));
+    } catch (error) {
+      output = {
+        type: 'error',
+        error: error instanceof Error ? `${error.message}\\n${error.stack}` : `${error}`,
+      };
+    }
+    console.log(JSON.stringify(output));
+  }
+})();
+'''
+
+
+class JsRuntimeWorker:
+    """
+    A long-lived JS runtime process that solves the challenges of many requests
+
+    The solver script is only loaded once, and the preprocessed players stay loaded in the worker.
+    A worker that exits is restarted on the next request.
+
+    @param command      Function returning the command that runs the script at the given path
+    @param solver       Script defining `jsc`; the worker loop is appended to it
+    @param name         Name of the JS runtime, for messages
+    @param env          Environment of the runtime process
+    @param clean_stderr Function removing the expected output from the stderr of the runtime
+    """
+
+    def __init__(
+        self, command: Callable[[str], list[str]], solver: str, *, name: str,
+        logger: IEContentProviderLogger, env: dict[str, str] | None = None,
+        clean_stderr: Callable[[str], str] = lambda stderr: stderr,
+    ):
+        self._command = command
+        self._solver = solver
+        self._name = name
+        self._logger = logger
+        self._env = env
+        self._clean_stderr = clean_stderr
+        self._lock = threading.Lock()
+        self._script_path = None
+        self._process = None
+        self._stderr = None
+
+    def solve(self, player_id: str, player_input: dict, requests: list[dict], /) -> dict:
+        """
+        Solve the challenges of the requests with one player
+
+        @param player_input The player fields of the solver input, only sent if the worker does not have the player
+        """
+        with self._lock:
+            for restart in (True, False):
+                try:
+                    output = self._communicate({'id': player_id, 'requests': requests})
+                    if output['type'] == 'missing':
+                        output = self._communicate({'id': player_id, **player_input, 'requests': requests})
+                    return output
+                except JsChallengeProviderError as e:
+                    if not restart:
+                        raise
+                    self._logger.debug(f'{e}; restarting {self._name} worker')
+
+    def _communicate(self, message: dict, /) -> dict:
+        if not self._process:
+            self._start()
+        try:
+            self._process.stdin.write(f'{json.dumps(message)}\n')
+            self._process.stdin.flush()
+            line = self._process.stdout.readline()
+        except OSError:
+            line = ''
+        if not line:
+            raise self._crashed()
+        return json.loads(line)
+
+    def _start(self):
+        if not self._script_path:
+            with tempfile.NamedTemporaryFile(
+                    mode='w', suffix='.js', delete=False, encoding='utf-8') as script_file:
+                script_file.write(f'{self._solver}\n{_WORKER_SCRIPT}')
+            self._script_path = script_file.name
+
+        cmd = self._command(self._script_path)
+        self._logger.debug(f'Starting {self._name} worker: {shlex.join(cmd)}')
+        # stderr is only read once the process exits, so a file avoids filling up a pipe
+        self._stderr = tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace')
+        self._process = Popen(
+            cmd,
+            text=True,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            env=self._env,
+        )
+
+    def _crashed(self) -> JsChallengeProviderError:
+        returncode = self._stop()
+        self._stderr.seek(0)
+        stderr = self._clean_stderr(self._stderr.read())
+        self._stderr.close()
+        msg = f'Error running {self._name} process (returncode: {returncode})'
+        if stderr:
+            msg = f'{msg}: {stderr.strip()}'
+        return JsChallengeProviderError(msg)
+
+    def _stop(self) -> int | None:
+        process, self._process = self._process, None
+        if not process:
+            return None
+        # The worker exits once its stdin is closed
+        with contextlib.suppress(OSError):
+            process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        return process.returncode
+
+    def close(self):
+        with self._lock:
+            self._stop()
+            if self._stderr:
+                self._stderr.close()
+            if self._script_path:
+                pathlib.Path(self._script_path).unlink(missing_ok=True)
+                self._script_path = None
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import contextlib
+import email.utils
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.parse
+from email.message import Message
+
+from ._helper import decoded_body_headers
+from .common import Request, Response
+from .exceptions import HTTPError
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header into a dict of directive: argument"""
+    directives = {}
+    for mobj in re.finditer(r'([\w-]+)\s*(?:=\s*(?:"([^"]*)"|([^\s,]*)))?', value or ''):
+        name, quoted, token = mobj.groups()
+        directives[name.lower()] = quoted if quoted is not None else token
+    return directives
+
+
+def _parse_http_date(value: str | None) -> float | None:
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class _CacheEntry:
+    # Headers of a 304 response that update the stored response
+    UPDATED_HEADERS = ('Cache-Control', 'Date', 'Expires', 'ETag', 'Last-Modified', 'Age', 'Vary')
+
+    def __init__(self, metadata: dict, body: bytes):
+        self.metadata = metadata
+        self.body = body
+        self.headers = Message()
+        for name, value in metadata['headers']:
+            self.headers[name] = value
+
+    @property
+    def freshness_lifetime(self) -> float:
+        cache_control = parse_cache_control(self.headers.get('Cache-Control'))
+        if 'no-cache' in cache_control:
+            return 0
+        max_age = cache_control.get('max-age')
+        if max_age and max_age.isdecimal():
+            return int(max_age)
+        expires = _parse_http_date(self.headers.get('Expires'))
+        if expires is None:
+            return 0
+        return expires - (_parse_http_date(self.headers.get('Date')) or self.metadata['stored_at'])
+
+    @property
+    def age(self) -> float:
+        age = (self.headers.get('Age') or '').strip()
+        return (int(age) if age.isdecimal() else 0) + time.time() - self.metadata['stored_at']
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.age < self.freshness_lifetime
+
+    def update(self, response: Response):
+        for name in self.UPDATED_HEADERS:
+            if name in response.headers:
+                del self.headers[name]
+                self.headers[name] = response.headers[name]
+        self.metadata['headers'] = list(self.headers.items())
+        self.metadata['stored_at'] = time.time()
+
+    def matches(self, request: Request) -> bool:
+        return all(request.headers.get(name) == value for name, value in self.metadata['vary'].items())
+
+    def response(self) -> Response:
+        return Response(
+            io.BytesIO(self.body), url=self.metadata['url'], headers=self.headers,
+            status=self.metadata['status'], reason=self.metadata['reason'])
+
+
+class _CachingResponse(Response):
+    def __init__(self, response: Response, cache: HTTPCache, request: Request):
+        super().__init__(
+            fp=response, url=response.url, headers=response.headers,
+            status=response.status, reason=response.reason, extensions=response.extensions)
+        self._cache = cache
+        self._request = request
+        self._body = bytearray()
+
+    def _add(self, data, requested):
+        if self._body is None:
+            return
+        self._body += data
+        if len(self._body) > self._cache.max_entry_size:
+            self._body = None
+        elif self.fp.closed or requested is None or requested < 0 or (requested and not data):
+            # Fully read
+            self._cache._store(self._request, self, bytes(self._body))
+            self._body = None
+
+    def read(self, amt=None):
+        data = self.fp.read(amt)
+        self._add(data, amt)
+        if self.fp.closed:
+            self.close()
+        return data
+
+    def readinto(self, b):
+        size = self.fp.readinto(b)
+        with memoryview(b) as view:
+            self._add(view[:size], len(view))
+        if self.fp.closed:
+            self.close()
+        return size
+
+
+class HTTPCache:
+    """
+    A size bounded, on-disk cache of HTTP responses that honours Cache-Control, Expires,
+    ETag and Last-Modified, as a private cache would.
+
+    Only GET requests that opt in with the `cache` extension use it. A stored response
+    that is still fresh is served without a request, and a stale one is revalidated with
+    a conditional request, so that an unchanged resource only costs a 304 response.
+    Responses are stored once they have been fully read. When the cache grows larger
+    than max_size, the least recently used responses are removed.
+    """
+
+    DEFAULT_MAX_SIZE = 100 * 1024 ** 2
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE, logger=None):
+        self.path = path
+        self.max_size = max_size
+        # So that a single response cannot flush out the whole cache
+        self.max_entry_size = max_size // 4
+        self._logger = logger
+        self._lock = threading.Lock()
+
+    def _debug(self, message):
+        if self._logger:
+            self._logger.debug(f'[http-cache] {message}')
+
+    def _filename(self, url):
+        return os.path.join(self.path, hashlib.sha256(url.encode()).hexdigest())
+
+    def _load(self, request: Request) -> _CacheEntry | None:
+        filename = self._filename(request.url)
+        try:
+            with open(filename, 'rb') as f:
+                metadata = json.loads(f.readline())
+                entry = _CacheEntry(metadata, f.read())
+            # Keep track of when it was last used, for the eviction
+            os.utime(filename)
+        except (OSError, ValueError):
+            return None
+        if entry.metadata['request_url'] != request.url or not entry.matches(request):
+            return None
+        return entry
+
+    def _write(self, url, metadata, body):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.path, prefix='.', delete=False) as f:
+                f.write(json.dumps(metadata).encode() + b'\n')
+                f.write(body)
+            os.replace(f.name, self._filename(url))
+        except OSError as e:
+            self._debug(f'Unable to store {url}: {e}')
+            return
+        self._evict()
+
+    def _evict(self):
+        with self._lock, contextlib.suppress(OSError):
+            files = sorted(
+                (entry for entry in os.scandir(self.path) if entry.is_file() and not entry.name.startswith('.')),
+                key=lambda entry: entry.stat().st_mtime)
+            size = sum(entry.stat().st_size for entry in files)
+            for entry in files:
+                if size <= self.max_size:
+                    break
+                size -= entry.stat().st_size
+                with contextlib.suppress(OSError):
+                    os.remove(entry.path)
+
+    @staticmethod
+    def _is_storable(response: Response) -> bool:
+        cache_control = parse_cache_control(response.headers.get('Cache-Control'))
+        if response.status != 200 or 'no-store' in cache_control or response.headers.get('Vary') == '*':
+            return False
+        return any(
+            name in response.headers for name in ('ETag', 'Last-Modified', 'Expires')) or 'max-age' in cache_control
+
+    def _store(self, request: Request, response: Response, body: bytes):
+        vary = [name.strip() for name in (response.headers.get('Vary') or '').split(',') if name.strip()]
+        self._write(request.url, {
+            'request_url': request.url,
+            'url': response.url,
+            'status': response.status,
+            'reason': response.reason,
+            'headers': decoded_body_headers(response.headers.items(), len(body)),
+            'vary': {name: request.headers.get(name) for name in vary},
+            'stored_at': time.time(),
+        }, body)
+        self._debug(f'Stored {request.url}')
+
+    def send(self, request: Request, send) -> Response:
+        """Get the response to request from the cache, using send to make the request when needed"""
+        if (request.method != 'GET' or 'no-store' in parse_cache_control(request.headers.get('Cache-Control'))
+                or urllib.parse.urlparse(request.url).scheme.lower() not in ('http', 'https')):
+            return send(request)
+
+        entry = self._load(request)
+        if entry and entry.is_fresh and 'no-cache' not in parse_cache_control(request.headers.get('Cache-Control')):
+            self._debug(f'Using the stored response for {request.url}')
+            return entry.response()
+
+        if entry:
+            etag, last_modified = entry.headers.get('ETag'), entry.headers.get('Last-Modified')
+            request = request.copy()
+            if etag and 'If-None-Match' not in request.headers:
+                request.headers['If-None-Match'] = etag
+            if last_modified and 'If-Modified-Since' not in request.headers:
+                request.headers['If-Modified-Since'] = last_modified
+        try:
+            response = send(request)
+        except HTTPError as e:
+            if not (entry and e.status == 304):
+                raise
+            e.response.close()
+            self._debug(f'The stored response for {request.url} is still valid')
+            entry.update(e.response)
+            self._write(request.url, entry.metadata, entry.body)
+            return entry.response()
+
+        if self._is_storable(response):
+            return _CachingResponse(response, self, request)
+        return response
@@ -51,16 +51,19 @@ def __init__(self, response: curl_cffi.requests.Response):
     def readable(self):
         return True
 
+    def _next_chunk(self):
+        chunk = next(self._iterator, None)
+        if chunk is None:
+            self._iterator = None
+            return b''
+        self.bytes_read += len(chunk)
+        return chunk
+
     def read(self, size=None):
         exception_raised = True
         try:
             while self._iterator and (size is None or len(self._buffer) < size):
-                chunk = next(self._iterator, None)
-                if chunk is None:
-                    self._iterator = None
-                    break
-                self._buffer += chunk
-                self.bytes_read += len(chunk)
+                self._buffer += self._next_chunk()
 
             if size is None:
                 size = len(self._buffer)
@@ -77,6 +80,29 @@ def read(self, size=None):
             if exception_raised:
                 self.close()
 
+    def readinto(self, b):
+        exception_raised = True
+        try:
+            size = 0
+            with memoryview(b) as view:
+                # Copy each chunk straight into b instead of joining them in the buffer first
+                while size < len(view) and (self._buffer or self._iterator):
+                    if not self._buffer:
+                        self._buffer = self._next_chunk()
+                        continue
+                    amount = min(len(view) - size, len(self._buffer))
+                    view[size:size + amount] = self._buffer[:amount]
+                    self._buffer = self._buffer[amount:]
+                    size += amount
+
+            if not self._iterator and not self._buffer:
+                self.close()
+            exception_raised = False
+            return size
+        finally:
+            if exception_raised:
+                self.close()
+
     def close(self):
         if not self.closed:
             self._response.close()
@@ -96,8 +122,14 @@ def __init__(self, response: curl_cffi.requests.Response):
             reason=response.reason)
 
     def read(self, amt=None):
+        return self._read(self.fp.read, amt)
+
+    def readinto(self, b):
+        return self._read(self.fp.readinto, b)
+
+    def _read(self, read, arg):
         try:
-            res = self.fp.read(amt)
+            res = read(arg)
             if self.fp.closed:
                 self.close()
             return res
@@ -187,6 +187,15 @@ def add_accept_encoding_header(headers: HTTPHeaderDict, supported_encodings: Ite
         headers['Accept-Encoding'] = ', '.join(supported_encodings) or 'identity'
 
 
+def decoded_body_headers(headers: Iterable[tuple[str, str]], body_size: int) -> list[list[str]]:
+    """Get the headers that describe the decoded (and possibly partial) body of a response, of body_size bytes"""
+    return [
+        *([name, value] for name, value in headers
+          if name.lower() not in ('content-encoding', 'content-length')),
+        ['Content-Length', str(body_size)],
+    ]
+
+
 def wrap_request_errors(func):
     @functools.wraps(func)
     def wrapper(self, *args, **kwargs):
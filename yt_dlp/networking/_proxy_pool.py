@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import itertools
+import re
+import threading
+import time
+
+from .exceptions import CertificateVerifyError, HTTPError, TransportError
+
+
+class PooledProxy:
+    def __init__(self, url: str):
+        self.url = url
+        # Without the credentials, for display
+        self.name = re.sub(r'(?<=//)[^/@]*@', '', url)
+        self.failures = 0
+        self.ejected_until = 0
+        # Exponentially weighted moving average of the response times (seconds)
+        self.latency = None
+
+    def __repr__(self):
+        return f'<PooledProxy {self.name}>'
+
+
+class ProxyPool:
+    """
+    A pool of proxies that requests are spread across.
+
+    Proxies are chosen either in turns ("round_robin") or by their lowest response
+    time ("latency"). A proxy that fails MAX_FAILURES requests in a row (proxy or
+    connection errors, or HTTP 429) is ejected from the pool for EJECT_TIME, after
+    which it is let back in on probation: a single further failure ejects it again.
+
+    Inside a session(), every request uses the same proxy (as long as it stays healthy),
+    since the data of an extraction (cookies, signed URLs, ...) is often bound to the IP.
+    The session is kept in a context variable, so it applies to the current thread and
+    to the threads that run a copy of its context (see contextvars.copy_context)
+    """
+
+    STRATEGIES = ('round_robin', 'latency')
+    MAX_FAILURES = 3
+    EJECT_TIME = 300
+    # Weight of the latest response time in the latency average
+    LATENCY_WEIGHT = 0.3
+
+    def __init__(self, proxies: list[str], strategy: str = 'round_robin', logger=None):
+        assert proxies, 'the pool needs at least one proxy'
+        assert strategy in self.STRATEGIES, f'unknown strategy {strategy}'
+        self.proxies = [PooledProxy(url) for url in proxies]
+        self.strategy = strategy
+        self._logger = logger
+        self._turns = itertools.cycle(self.proxies)
+        self._lock = threading.Lock()
+        # The session of the current context, holding the proxy it uses
+        self._session = contextvars.ContextVar(f'proxy_session_{id(self)}', default=None)
+
+    @contextlib.contextmanager
+    def session(self):
+        """Use the same proxy for all the requests made in this context. A nested session uses a proxy of its own"""
+        token = self._session.set({'proxy': None})
+        try:
+            yield
+        finally:
+            self._session.reset(token)
+
+    def _is_healthy(self, proxy, now):
+        return proxy.ejected_until <= now
+
+    def _next(self, now):
+        healthy = [proxy for proxy in self.proxies if self._is_healthy(proxy, now)]
+        if not healthy:
+            # Rather than failing, use the proxy that will be let back in first
+            return min(self.proxies, key=lambda p: p.ejected_until)
+        if self.strategy == 'latency':
+            # Untried proxies go first, so that every proxy gets measured
+            return min(healthy, key=lambda p: -1 if p.latency is None else p.latency)
+        return next(proxy for proxy in self._turns if self._is_healthy(proxy, now))
+
+    def select(self) -> PooledProxy:
+        """Get the proxy to use for the next request"""
+        session = self._session.get()
+        with self._lock:
+            now = time.monotonic()
+            proxy = session and session['proxy']
+            if not (proxy and self._is_healthy(proxy, now)):
+                proxy = self._next(now)
+                if session is not None:
+                    session['proxy'] = proxy
+            return proxy
+
+    @staticmethod
+    def is_proxy_failure(error: BaseException) -> bool | None:
+        """Whether error is a failure of the proxy, or None if it is unrelated to it"""
+        if isinstance(error, HTTPError):
+            return error.status == 429
+        if isinstance(error, CertificateVerifyError):
+            return None
+        if isinstance(error, TransportError):
+            return True
+        return None
+
+    def record(self, proxy: PooledProxy, latency: float, error: BaseException | None = None):
+        """Record the outcome of a request sent through proxy, which took latency seconds to be answered"""
+        failed = False if error is None else self.is_proxy_failure(error)
+        if failed is None:
+            return
+        with self._lock:
+            if not failed:
+                proxy.failures = proxy.ejected_until = 0
+                proxy.latency = latency if proxy.latency is None else (
+                    self.LATENCY_WEIGHT * latency + (1 - self.LATENCY_WEIGHT) * proxy.latency)
+                return
+            proxy.failures += 1
+            # A proxy that was let back in after being ejected is on probation
+            if proxy.failures < self.MAX_FAILURES and not proxy.ejected_until:
+                return
+            proxy.ejected_until = time.monotonic() + self.EJECT_TIME
+            proxy.failures = 0
+        if self._logger:
+            self._logger.warning(
+                f'Proxy {proxy.name} is failing ({error}); not using it for {self.EJECT_TIME} seconds')
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import base64
+import collections
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import urllib.parse
+import urllib.request
+import urllib.response
+import weakref
+from email.message import Message
+
+from ._helper import decoded_body_headers
+from .common import Request, RequestHandler, Response
+from .exceptions import HTTPError, RequestError, TransportError
+
+
+def _request_key(method: str, url: str, data) -> tuple:
+    # Streamed bodies (iterables and file-like objects) cannot be matched on
+    return method, url, hashlib.sha256(data).hexdigest() if isinstance(data, bytes) else None
+
+
+class _RecordingResponse(Response):
+    def __init__(self, response: Response, recorder: RequestRecorder, request: Request):
+        super().__init__(
+            fp=response, url=response.url, headers=response.headers,
+            status=response.status, reason=response.reason, extensions=response.extensions)
+        self._recorder = recorder
+        self._request = request
+        self._body = bytearray()
+        # Large bodies are streamed into a file of their own instead of being kept in memory
+        self._body_file = None
+        self._error = None
+
+    def _failed(self, error):
+        # Record right away, as the response is unusable from now on
+        self._error = str(error)
+        self.close()
+
+    def read(self, amt=None):
+        try:
+            data = self.fp.read(amt)
+        except RequestError as e:
+            self._failed(e)
+            raise
+        self._write(data)
+        if self.fp.closed:
+            self.close()
+        return data
+
+    def readinto(self, b):
+        try:
+            size = self.fp.readinto(b)
+        except RequestError as e:
+            self._failed(e)
+            raise
+        with memoryview(b) as view:
+            self._write(view[:size])
+        if self.fp.closed:
+            self.close()
+        return size
+
+    def _write(self, data):
+        if self._body_file is None:
+            if len(self._body) + len(data) <= self._recorder.MAX_INLINE_BODY_SIZE:
+                self._body += data
+                return
+            self._body_file = self._recorder._open_body_file()
+            self._body_file.write(self._body)
+            self._body = None
+        self._body_file.write(data)
+
+    def close(self):
+        if not self.closed:
+            if self._body_file is None:
+                self._recorder._record(self._request, response=self, body=bytes(self._body), read_error=self._error)
+            else:
+                self._body_file.close()
+                self._recorder._record(
+                    self._request, response=self, body_file=self._body_file.name, read_error=self._error)
+        return super().close()
+
+
+class _ReplayedResponse(Response):
+    def __init__(self, fp: io.IOBase, read_error: str | None, **kwargs):
+        super().__init__(fp=fp, **kwargs)
+        self._read_error = read_error
+
+    def _check_end(self, complete):
+        if complete:
+            return
+        # The whole body has been read: fail like the recorded response did, if it did
+        self.close()
+        if self._read_error:
+            raise TransportError(self._read_error)
+
+    def read(self, amt=None):
+        if self.closed:
+            return b''
+        data = self.fp.read(amt)
+        self._check_end(amt is not None and len(data) == amt)
+        return data
+
+    def readinto(self, b):
+        if self.closed:
+            return 0
+        size = self.fp.readinto(b)
+        self._check_end(size == len(b))
+        return size
+
+
+class RequestRecorder:
+    """
+    Record every HTTP request and its response (or the error it failed with) into an archive
+    that ReplayRH can serve back.
+
+    The archive is a JSON lines file with an entry per request. The response of an entry is
+    recorded once it has been fully read or closed, with the body as far as it was read
+    and the error that reading it failed with, if any.
+    Bodies larger than MAX_INLINE_BODY_SIZE are written as they are read into files of their
+    own, in the directory BODIES_DIR_SUFFIX appended to the path of the archive.
+    Appending to an existing archive extends it.
+    """
+
+    _SCHEMES = ('http', 'https')
+    MAX_INLINE_BODY_SIZE = 64 * 1024
+    BODIES_DIR_SUFFIX = '.bodies'
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bodies_dir = f'{path}{self.BODIES_DIR_SUFFIX}'
+        self._file = None
+        self._lock = threading.Lock()
+        self._open_responses = weakref.WeakSet()
+
+    def _should_record(self, request: Request):
+        return urllib.parse.urlparse(request.url).scheme.lower() in self._SCHEMES
+
+    def record(self, request: Request, response: Response) -> Response:
+        """Get a response to use in place of response, which records it as it is read"""
+        if not self._should_record(request):
+            return response
+        response = _RecordingResponse(response, self, request)
+        self._open_responses.add(response)
+        return response
+
+    def record_error(self, request: Request, error: Exception):
+        """Record the error that a request failed with"""
+        if not (isinstance(error, (HTTPError, TransportError)) and self._should_record(request)):
+            return
+        if isinstance(error, TransportError):
+            self._record(request, error=str(error))
+            return
+        # Error pages are small and rarely closed, so record them right away
+        response = error.response
+        try:
+            body = response.read()
+        except TransportError as e:
+            self._record(request, error=str(e))
+            return
+        error.response = Response(
+            io.BytesIO(body), url=response.url, headers=response.headers,
+            status=response.status, reason=response.reason, extensions=response.extensions)
+        self._record(request, response=response, body=body)
+
+    def _open_body_file(self):
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        return tempfile.NamedTemporaryFile(suffix='.bin', dir=self.bodies_dir, delete=False)  # noqa: SIM115
+
+    def _record(
+        self, request: Request, response: Response | None = None, body: bytes = b'',
+        error: str | None = None, read_error: str | None = None, body_file: str | None = None,
+    ):
+        """@param body_file   Path of the file that the body was written to, instead of body"""
+        method, url, data = _request_key(request.method, request.url, request.data)
+        entry = {'request': {'method': method, 'url': url, 'data': data, 'headers': dict(request.headers)}}
+        if error is not None:
+            entry['error'] = error
+        else:
+            body_size = os.path.getsize(body_file) if body_file else len(body)
+            entry['response'] = {
+                'url': response.url,
+                'status': response.status,
+                'reason': response.reason,
+                'headers': decoded_body_headers(response.headers.items(), body_size),
+                **({'body_file': os.path.basename(body_file)} if body_file
+                   else {'body': base64.b64encode(body).decode()}),
+                'error': read_error,
+            }
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')  # noqa: SIM115
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+
+    def close(self):
+        # Record the responses that were never fully read
+        for response in list(self._open_responses):
+            response.close()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class ReplayRH(RequestHandler):
+    """
+    Serve the responses recorded by RequestRecorder, without using the network.
+
+    Requests are matched on their method, URL and body. The responses recorded for the
+    same request are served in the order they were recorded, after which the last one
+    keeps being served. A request that was not recorded fails with a TransportError.
+
+    @param replay_archive: Path of the archive to serve the responses from.
+    """
+    _SUPPORTED_URL_SCHEMES = ('http', 'https')
+    _SUPPORTED_PROXY_SCHEMES = None
+    _SUPPORTED_FEATURES = None
+
+    def __init__(self, *, replay_archive: str, **kwargs):
+        super().__init__(**kwargs)
+        self._bodies_dir = f'{replay_archive}{RequestRecorder.BODIES_DIR_SUFFIX}'
+        self._entries = collections.defaultdict(list)
+        self._served = collections.Counter()
+        self._lock = threading.Lock()
+        with open(replay_archive, encoding='utf-8') as f:
+            for line in filter(None, map(str.strip, f)):
+                entry = json.loads(line)
+                request = entry['request']
+                self._entries[request['method'], request['url'], request['data']].append(entry)
+
+    def _check_extensions(self, extensions):
+        super()._check_extensions(extensions)
+        # Responses are replayed no matter how they were originally requested
+        extensions.clear()
+
+    def _next_entry(self, request: Request):
+        key = _request_key(request.method, request.url, request.data)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise TransportError(f'No recorded response for {request.method} {request.url}')
+            entry = entries[min(self._served[key], len(entries) - 1)]
+            self._served[key] += 1
+        return entry
+
+    def _send(self, request: Request):
+        entry = self._next_entry(request)
+        if 'error' in entry:
+            raise TransportError(entry['error'])
+
+        recorded = entry['response']
+        headers = Message()
+        for name, value in recorded['headers']:
+            headers[name] = value
+        self._get_cookiejar(request).extract_cookies(
+            urllib.response.addinfourl(io.BytesIO(), headers, recorded['url']),
+            urllib.request.Request(request.url))
+
+        if 'body_file' in recorded:
+            try:
+                fp = open(os.path.join(self._bodies_dir, recorded['body_file']), 'rb')  # noqa: SIM115
+            except OSError as e:
+                raise TransportError(f'Unable to open the recorded body of {request.url}: {e}', cause=e) from e
+        else:
+            fp = io.BytesIO(base64.b64decode(recorded['body']))
+        response = _ReplayedResponse(
+            fp, recorded['error'], url=recorded['url'], headers=headers,
+            status=recorded['status'], reason=recorded['reason'])
+        if not 200 <= response.status < 300:
+            raise HTTPError(response)
+        return response
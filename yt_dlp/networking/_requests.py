@@ -4,6 +4,8 @@
 import http.client
 import logging
 import re
+import threading
+import time
 import warnings
 
 from ..dependencies import brotli, requests, urllib3
@@ -157,24 +159,115 @@ def read(self, amt: int | None = None):
             raise TransportError(cause=e) from e
 
 
+class ConnectionPoolStats:
+    """
+    How the connections of a RequestsHTTPAdapter have been used.
+    hits:   requests that reused an open connection
+    misses: requests that needed a new connection (including after a connection was dropped)
+    reaped: connections closed for having been idle for too long
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.reaped = 0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'reaped': self.reaped}
+
+
+class _TrackedPoolMixin:
+    # Set by RequestsHTTPAdapter before the pool is used
+    _yt_dlp_adapter = None
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        adapter = self._yt_dlp_adapter
+        idle_since = conn.__dict__.pop('_yt_dlp_idle_since', None)
+        if adapter and idle_since is not None and adapter.is_idle_expired(conn, idle_since):
+            conn.close()
+            adapter.pool_stats._count('reaped')
+        if adapter:
+            adapter.pool_stats._count('hits' if conn.sock is not None else 'misses')
+        return conn
+
+    def _put_conn(self, conn):
+        if conn:
+            conn._yt_dlp_idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+
+class TrackedHTTPConnectionPool(_TrackedPoolMixin, urllib3.HTTPConnectionPool):
+    pass
+
+
+class TrackedHTTPSConnectionPool(_TrackedPoolMixin, urllib3.HTTPSConnectionPool):
+    pass
+
+
 class RequestsHTTPAdapter(requests.adapters.HTTPAdapter):
-    def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None, **kwargs):
+    """
+    HTTPAdapter with statistics on connection reuse, and closing of connections
+    that have been idle in the pool for longer than idle_timeout
+    """
+
+    def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None, idle_timeout=None, **kwargs):
         self._pm_args = {}
         if ssl_context:
             self._pm_args['ssl_context'] = ssl_context
         if source_address:
             self._pm_args['source_address'] = (source_address, 0)
         self._proxy_ssl_context = proxy_ssl_context or ssl_context
+        self.idle_timeout = idle_timeout
+        self.pool_stats = ConnectionPoolStats()
+        self._next_reap = 0
         super().__init__(**kwargs)
 
+    @staticmethod
+    def _track_pools(manager):
+        if not issubclass(manager.pool_classes_by_scheme['http'], _TrackedPoolMixin):
+            manager.pool_classes_by_scheme = {
+                'http': TrackedHTTPConnectionPool,
+                'https': TrackedHTTPSConnectionPool,
+            }
+        return manager
+
     def init_poolmanager(self, *args, **kwargs):
-        return super().init_poolmanager(*args, **kwargs, **self._pm_args)
+        super().init_poolmanager(*args, **kwargs, **self._pm_args)
+        self._track_pools(self.poolmanager)
 
     def proxy_manager_for(self, proxy, **proxy_kwargs):
         extra_kwargs = {}
         if not proxy.lower().startswith('socks') and self._proxy_ssl_context:
             extra_kwargs['proxy_ssl_context'] = self._proxy_ssl_context
-        return super().proxy_manager_for(proxy, **proxy_kwargs, **self._pm_args, **extra_kwargs)
+        return self._track_pools(
+            super().proxy_manager_for(proxy, **proxy_kwargs, **self._pm_args, **extra_kwargs))
+
+    def is_idle_expired(self, conn, idle_since):
+        return bool(
+            self.idle_timeout and conn.sock is not None
+            and time.monotonic() - idle_since > self.idle_timeout)
+
+    def reap_idle_connections(self):
+        """Close the pooled connections that have been idle for longer than idle_timeout"""
+        for manager in (self.poolmanager, *self.proxy_manager.values()):
+            for key in manager.pools.keys():  # noqa: SIM118 -- the container does not support iteration
+                pool = manager.pools.get(key)
+                queue = pool and pool.pool
+                if queue is None:
+                    continue
+                with queue.mutex:
+                    for conn in queue.queue:
+                        # A connection that is in the queue is not in use, so it is safe to close it here.
+                        # It is transparently reconnected if it is taken from the pool afterwards
+                        idle_since = getattr(conn, '_yt_dlp_idle_since', None)
+                        if conn and idle_since is not None and self.is_idle_expired(conn, idle_since):
+                            conn.close()
+                            self.pool_stats._count('reaped')
 
     # Skip `requests` internal verification; we use our own SSLContext
     def cert_verify(*args, **kwargs):
@@ -188,7 +281,13 @@ def get_connection_with_tls_context(self, request, verify, proxies=None, cert=No
         if proxy := select_proxy(url, proxies):
             manager = self.proxy_manager_for(proxy)
 
-        return manager.connection_from_url(url)
+        if self.idle_timeout and time.monotonic() >= self._next_reap:
+            self._next_reap = time.monotonic() + self.idle_timeout / 2
+            self.reap_idle_connections()
+
+        pool = manager.connection_from_url(url)
+        pool._yt_dlp_adapter = self
+        return pool
 
 
 class RequestsSession(requests.sessions.Session):
@@ -257,8 +356,29 @@ class RequestsRH(RequestHandler, InstanceStoreMixin):
     _SUPPORTED_FEATURES = (Features.NO_PROXY, Features.ALL_PROXY)
     RH_NAME = 'requests'
 
-    def __init__(self, *args, **kwargs):
+    DEFAULT_POOL_SIZE = requests.adapters.DEFAULT_POOLSIZE
+    DEFAULT_POOL_IDLE_TIMEOUT = 60
+
+    def __init__(
+        self, *args,
+        pool_size: int | None = None,
+        max_connections_per_host: int | None = None,
+        pool_idle_timeout: float | None = DEFAULT_POOL_IDLE_TIMEOUT,
+        **kwargs,
+    ):
+        """
+        @param pool_size: Number of connections to keep open per host.
+                          Should be at least the number of requests made to the same host at once
+        @param max_connections_per_host: Maximum number of connections to open to a single host at once.
+                                         Further requests wait for a connection to become free
+        @param pool_idle_timeout: Close connections that have been unused for this many seconds
+        """
         super().__init__(*args, **kwargs)
+        self.max_connections_per_host = max_connections_per_host
+        self.pool_size = max_connections_per_host or max(pool_size or 0, self.DEFAULT_POOL_SIZE)
+        self.pool_idle_timeout = pool_idle_timeout
+        # Adapters hold the connection pools, and are shared between the sessions of all cookiejars
+        self._adapters = {}
 
         # Forward urllib3 debug messages to our logger
         logger = logging.getLogger('urllib3')
@@ -280,6 +400,7 @@ def __init__(self, *args, **kwargs):
 
     def close(self):
         self._clear_instances()
+        self._adapters.clear()
         # Remove the logging handler that contains a reference to our logger
         # See: https://github.com/yt-dlp/yt-dlp/issues/8922
         logging.getLogger('urllib3').removeHandler(self.__logging_handler)
@@ -291,13 +412,30 @@ def _check_extensions(self, extensions):
         extensions.pop('legacy_ssl', None)
         extensions.pop('keep_header_casing', None)
 
+    @property
+    def pool_stats(self):
+        """Connection reuse statistics of all the connection pools, see ConnectionPoolStats"""
+        stats = {'hits': 0, 'misses': 0, 'reaped': 0}
+        for adapter in self._adapters.values():
+            for key, value in adapter.pool_stats.as_dict().items():
+                stats[key] += value
+        return stats
+
+    def _get_adapter(self, legacy_ssl_support=None):
+        if legacy_ssl_support not in self._adapters:
+            self._adapters[legacy_ssl_support] = RequestsHTTPAdapter(
+                ssl_context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support),
+                source_address=self.source_address,
+                idle_timeout=self.pool_idle_timeout,
+                max_retries=urllib3.util.retry.Retry(False),
+                pool_maxsize=self.pool_size,
+                pool_block=bool(self.max_connections_per_host),
+            )
+        return self._adapters[legacy_ssl_support]
+
     def _create_instance(self, cookiejar, legacy_ssl_support=None):
         session = RequestsSession()
-        http_adapter = RequestsHTTPAdapter(
-            ssl_context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support),
-            source_address=self.source_address,
-            max_retries=urllib3.util.retry.Retry(False),
-        )
+        http_adapter = self._get_adapter(legacy_ssl_support)
         session.adapters.clear()
         session.headers = requests.models.CaseInsensitiveDict()
         session.mount('https://', http_adapter)
@@ -396,11 +534,11 @@ class SocksHTTPSConnection(SocksHTTPConnection, urllib3.connection.HTTPSConnecti
     pass
 
 
-class SocksHTTPConnectionPool(urllib3.HTTPConnectionPool):
+class SocksHTTPConnectionPool(TrackedHTTPConnectionPool):
     ConnectionCls = SocksHTTPConnection
 
 
-class SocksHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+class SocksHTTPSConnectionPool(TrackedHTTPSConnectionPool):
     ConnectionCls = SocksHTTPSConnection
 
 
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import email.utils
+import random
+import threading
+import time
+import urllib.parse
+
+from .exceptions import CertificateVerifyError, HTTPError, ProxyError, TransportError
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header value (delay in seconds or HTTP-date) into seconds from now"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdecimal():
+        return float(value)
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostState:
+    def __init__(self):
+        self.failures = 0
+        self.blocked_until = 0
+        self.reason = None
+        self.reported_until = None
+        self.circuit_open = False
+        # Thread making the trial request of a half-open circuit
+        self.trial = None
+
+
+class HostRetryCoordinator:
+    """
+    Coordinate the retries of every request made to the same host.
+
+    Instead of every worker retrying on its own, a failure of any request holds back
+    all the requests to the host: for as long as the Retry-After of a 429/503 response
+    asks, or otherwise for a jittered, exponentially growing delay.
+    After CIRCUIT_THRESHOLD consecutive failures the circuit opens, and all requests to
+    the host are paused for CIRCUIT_OPEN_TIME. A single trial request is then let
+    through; the circuit is closed if it succeeds, or opened again if it fails.
+    """
+
+    BASE_DELAY = 1
+    MAX_DELAY = 60
+    MAX_RETRY_AFTER = 600
+    CIRCUIT_THRESHOLD = 5
+    CIRCUIT_OPEN_TIME = 30
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._hosts: dict[str, _HostState] = {}
+        self._cond = threading.Condition()
+
+    @classmethod
+    def shared(cls) -> HostRetryCoordinator:
+        """Get the coordinator used by the whole process"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def _host(url):
+        return urllib.parse.urlparse(url).hostname
+
+    def _state(self, url):
+        return self._hosts.setdefault(self._host(url), _HostState())
+
+    def wait(self, url: str, report=None):
+        """
+        Wait until a request may be sent to the host of url
+        @param report   Called with a message when the wait starts
+        """
+        with self._cond:
+            state = self._state(url)
+            while True:
+                delay = state.blocked_until - time.monotonic()
+                if delay <= 0 and state.trial is None:
+                    break
+                if report and delay > 0 and state.reported_until != state.blocked_until:
+                    state.reported_until = state.blocked_until
+                    report(
+                        f'Pausing requests to {self._host(url)} for {delay:.2f} seconds ({state.reason})')
+                self._cond.wait(delay if delay > 0 else None)
+            if state.circuit_open:
+                state.trial = threading.get_ident()
+
+    def record(self, url: str, success: bool | None, retry_after: float | None = None):
+        """
+        Record the outcome of a request to the host of url
+        @param success      None if the outcome says nothing about the health of the host
+        @param retry_after  The delay the server asked for (seconds)
+        """
+        with self._cond:
+            state = self._state(url)
+            if state.trial == threading.get_ident():
+                state.trial = None
+                self._cond.notify_all()
+            elif state.trial is not None and success is not None:
+                # Requests that were sent before the circuit opened do not decide on it
+                return
+            if success is None:
+                return
+            if success:
+                state.failures = 0
+                state.circuit_open = False
+                return
+
+            state.failures += 1
+            now = time.monotonic()
+            if retry_after is not None:
+                delay, state.reason = min(retry_after, self.MAX_RETRY_AFTER), 'Retry-After'
+            else:
+                delay = min(self.BASE_DELAY * 2 ** (state.failures - 1), self.MAX_DELAY)
+                delay, state.reason = random.uniform(delay / 2, delay), f'{state.failures} consecutive failures'
+            if state.circuit_open or state.failures >= self.CIRCUIT_THRESHOLD:
+                state.circuit_open = True
+                delay, state.reason = max(delay, self.CIRCUIT_OPEN_TIME), 'circuit open'
+            state.blocked_until = max(state.blocked_until, now + delay)
+
+    @staticmethod
+    def classify(error: Exception) -> tuple[bool | None, float | None]:
+        """Get the (success, retry_after) to record for a request that raised error"""
+        if isinstance(error, HTTPError):
+            if error.status == 429 or error.status >= 500:
+                retry_after = None
+                if error.status in (429, 503):
+                    retry_after = parse_retry_after(error.response.get_header('Retry-After'))
+                return False, retry_after
+            return True, None
+        if isinstance(error, (CertificateVerifyError, ProxyError)):
+            # Not a failure of the host itself
+            return None, None
+        if isinstance(error, TransportError):
+            return False, None
+        return None, None
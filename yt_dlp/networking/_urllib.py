@@ -37,7 +37,7 @@
     SSLError,
     TransportError,
 )
-from ..dependencies import brotli
+from ..dependencies import brotli, zstd
 from ..socks import ProxyError as SocksProxyError
 from ..utils import update_url_query
 from ..utils.networking import normalize_url, select_proxy
@@ -49,6 +49,139 @@
     SUPPORTED_ENCODINGS.append('br')
     CONTENT_DECODE_ERRORS.append(brotli.error)
 
+if zstd:
+    SUPPORTED_ENCODINGS.append('zstd')
+    CONTENT_DECODE_ERRORS.append(zstd.ZstdError)
+
+
+class _GzipDecoder:
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+
+    def decompress(self, data):
+        # There may be junk added the end of the file
+        # We ignore it by only ever decoding a single gzip payload
+        if self._decompressor.eof:
+            return b''
+        return self._decompressor.decompress(data)
+
+    def flush(self):
+        return self._decompressor.flush()
+
+
+class _DeflateDecoder:
+    def __init__(self):
+        self._decompressor = None
+        self._header = b''
+
+    def decompress(self, data):
+        if self._decompressor is None:
+            self._header += data
+            if len(self._header) < 2:
+                return b''
+            # Servers send either raw deflate data or a zlib stream, which starts with a checksummed header
+            cmf, flg = self._header[:2]
+            is_zlib = cmf & 0x0f == 8 and (cmf << 8 | flg) % 31 == 0
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS if is_zlib else -zlib.MAX_WBITS)
+            data, self._header = self._header, b''
+        return self._decompressor.decompress(data)
+
+    def flush(self):
+        if self._decompressor is None:
+            return zlib.decompress(self._header, -zlib.MAX_WBITS) if self._header else b''
+        return self._decompressor.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, data):
+        return self._decompressor.process(data)
+
+    def flush(self):
+        return b''
+
+
+class _ZstdDecoder:
+    def __init__(self):
+        decompressor = zstd.ZstdDecompressor()
+        # zstandard needs a separate object for streaming
+        self._decompressor = getattr(decompressor, 'decompressobj', lambda: decompressor)()
+
+    def decompress(self, data):
+        return self._decompressor.decompress(data)
+
+    def flush(self):
+        return b''
+
+
+_CONTENT_DECODERS = {
+    'gzip': _GzipDecoder,
+    'deflate': _DeflateDecoder,
+    **({'br': _BrotliDecoder} if brotli else {}),
+    **({'zstd': _ZstdDecoder} if zstd else {}),
+}
+
+
+class _DecodingReader(io.RawIOBase):
+    """Decode a response body while it is being read, closing the response once it has been fully read"""
+
+    _CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, fp, decoders):
+        self._fp = fp
+        self._decoders = decoders
+        self._buffer = bytearray()
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def _fill_buffer(self, size):
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            # read1 returns what is available instead of waiting for the whole chunk
+            data = self._fp.read1(self._CHUNK_SIZE)
+            if not data:
+                self._eof = True
+                if getattr(self._fp, 'length', None):
+                    # Unlike read(), read1() does not check if the body is complete
+                    raise http.client.IncompleteRead(b'', self._fp.length)
+            for decoder in self._decoders:
+                data = decoder.decompress(data) if data else b''
+                if self._eof:
+                    data += decoder.flush()
+            self._buffer += data
+
+    def readinto(self, b):
+        self._fill_buffer(1)
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        if self._eof and not self._buffer:
+            self.close()
+        return size
+
+    def read(self, size=-1):
+        if size is None:
+            size = -1
+        self._fill_buffer(size)
+        if size < 0 or size >= len(self._buffer):
+            data, self._buffer = bytes(self._buffer), bytearray()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        if self._eof and not self._buffer:
+            self.close()
+        return data
+
+    def readall(self):
+        return self.read()
+
+    def close(self):
+        self._fp.close()
+        super().close()
+
 
 def _create_http_connection(http_class, source_address, *args, **kwargs):
     hc = http_class(*args, **kwargs)
@@ -66,8 +199,8 @@ class HTTPHandler(urllib.request.AbstractHTTPHandler):
     """Handler for HTTP requests and responses.
 
     This class, when installed with an OpenerDirector, automatically adds
-    the standard headers to every HTTP request and handles gzipped, deflated and
-    brotli responses from web servers.
+    the standard headers to every HTTP request and handles gzipped, deflated,
+    brotli and zstd responses from web servers.
 
     Part of this code was copied from:
 
@@ -102,29 +235,6 @@ def https_open(self, req):
                 _create_http_connection, conn_class, self._source_address),
             req, context=self._context)
 
-    @staticmethod
-    def deflate(data):
-        if not data:
-            return data
-        try:
-            return zlib.decompress(data, -zlib.MAX_WBITS)
-        except zlib.error:
-            return zlib.decompress(data)
-
-    @staticmethod
-    def brotli(data):
-        if not data:
-            return data
-        return brotli.decompress(data)
-
-    @staticmethod
-    def gz(data):
-        # There may be junk added the end of the file
-        # We ignore it by only ever decoding a single gzip payload
-        if not data:
-            return data
-        return zlib.decompress(data, wbits=zlib.MAX_WBITS | 16)
-
     def http_request(self, req):
         # According to RFC 3986, URLs can not contain non-ASCII characters, however this is not
         # always respected by websites, some tend to give out URLs with non percent-encoded
@@ -149,17 +259,15 @@ def http_response(self, req, resp):
         # Content-Encoding header lists the encodings in order that they were applied [1].
         # To decompress, we simply do the reverse.
         # [1]: https://datatracker.ietf.org/doc/html/rfc9110#name-content-encoding
-        decoded_response = None
-        for encoding in (e.strip() for e in reversed(resp.headers.get('Content-encoding', '').split(','))):
-            if encoding == 'gzip':
-                decoded_response = self.gz(decoded_response or resp.read())
-            elif encoding == 'deflate':
-                decoded_response = self.deflate(decoded_response or resp.read())
-            elif encoding == 'br' and brotli:
-                decoded_response = self.brotli(decoded_response or resp.read())
-
-        if decoded_response is not None:
-            resp = urllib.request.addinfourl(io.BytesIO(decoded_response), old_resp.headers, old_resp.url, old_resp.code)
+        # The body is decoded while it is being read
+        decoders = [
+            _CONTENT_DECODERS[encoding]()
+            for encoding in (e.strip() for e in reversed(resp.headers.get('Content-encoding', '').split(',')))
+            if encoding in _CONTENT_DECODERS]
+
+        if decoders:
+            resp = urllib.request.addinfourl(
+                _DecodingReader(old_resp, decoders), old_resp.headers, old_resp.url, old_resp.code)
             resp.msg = old_resp.msg
         # Percent-encode redirect URL of Location HTTP header to satisfy RFC 3986 (see
         # https://github.com/ytdl-org/youtube-dl/issues/6457).
@@ -309,28 +417,46 @@ def read(self, amt=None):
             return b''
         try:
             data = self.fp.read(amt)
-            underlying = getattr(self.fp, 'fp', None)
-            if isinstance(self.fp, http.client.HTTPResponse) and underlying is None:
-                # http.client.HTTPResponse automatically closes itself when fully read
-                self.close()
-            elif isinstance(self.fp, urllib.response.addinfourl) and underlying is not None:
-                # urllib's addinfourl does not close the underlying fp automatically when fully read
-                if isinstance(underlying, io.BytesIO):
-                    # data URLs or in-memory responses (e.g. gzip/deflate/brotli decoded)
-                    if underlying.tell() >= len(underlying.getbuffer()):
-                        self.close()
-                elif isinstance(underlying, io.BufferedReader) and amt is None:
-                    # file URLs.
-                    # XXX: this will not mark the response as closed if it was fully read with amt.
-                    self.close()
-            elif underlying is not None and underlying.closed:
-                # Catch-all for any cases where underlying file is closed
-                self.close()
+            self._close_if_read(amt)
             return data
         except Exception as e:
             handle_response_read_exceptions(e)
             raise e
 
+    def readinto(self, b):
+        if self.closed:
+            return 0
+        try:
+            size = self.fp.readinto(b)
+            self._close_if_read(len(b))
+            return size
+        except Exception as e:
+            handle_response_read_exceptions(e)
+            raise e
+
+    def _close_if_read(self, amt):
+        underlying = getattr(self.fp, 'fp', None)
+        if isinstance(self.fp, http.client.HTTPResponse) and underlying is None:
+            # http.client.HTTPResponse automatically closes itself when fully read
+            self.close()
+        elif isinstance(self.fp, urllib.response.addinfourl) and underlying is not None:
+            # urllib's addinfourl does not close the underlying fp automatically when fully read
+            if isinstance(underlying, io.BytesIO):
+                # data URLs or other in-memory responses
+                if underlying.tell() >= len(underlying.getbuffer()):
+                    self.close()
+            elif isinstance(underlying, _DecodingReader):
+                # gzip/deflate/brotli/zstd decoded responses close themselves when fully read
+                if underlying.closed:
+                    self.close()
+            elif isinstance(underlying, io.BufferedReader) and amt is None:
+                # file URLs.
+                # XXX: this will not mark the response as closed if it was fully read with amt.
+                self.close()
+        elif underlying is not None and underlying.closed:
+            # Catch-all for any cases where underlying file is closed
+            self.close()
+
 
 def handle_sslerror(e: ssl.SSLError):
     if not isinstance(e, ssl.SSLError):
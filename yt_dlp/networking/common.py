@@ -5,6 +5,7 @@
 import enum
 import functools
 import io
+import time
 import typing
 import urllib.parse
 import urllib.request
@@ -15,6 +16,8 @@
 from types import NoneType
 
 from ._helper import make_ssl_context, wrap_request_errors
+from ._proxy_pool import ProxyPool
+from ._retry import HostRetryCoordinator
 from .exceptions import (
     NoSupportingHandlers,
     RequestError,
@@ -57,20 +60,45 @@ class RequestDirector:
     can be registered into the `preferences` set. These are used to sort handlers
     in order of preference.
 
+    The order of the handlers, and which handlers do not support a request, is worked out once
+    for every shape of request: its url scheme, proxies, extensions and header names.
+    Preference functions and handler validation must therefore only depend on these.
+
     @param logger: Logger instance.
     @param verbose: Print debug request information to stdout.
+    @param retry_coordinator: HostRetryCoordinator to consult before sending every request.
+    @param proxy_pool: ProxyPool to pick the proxy of every request from, unless the request sets its own.
+    @param recorder: RequestRecorder to record every request and its response into.
+    @param http_cache: HTTPCache to use for the requests that set the `cache` extension to True.
     """
 
-    def __init__(self, logger, verbose=False):
+    # Number of request shapes to remember the handler selection of
+    _MAX_SELECTIONS = 64
+
+    def __init__(
+        self, logger, verbose=False,
+        retry_coordinator: HostRetryCoordinator | None = None,
+        proxy_pool: ProxyPool | None = None,
+        recorder: RequestRecorder | None = None,
+        http_cache: HTTPCache | None = None,
+    ):
         self.handlers: dict[str, RequestHandler] = {}
         self.preferences: set[Preference] = set()
         self.logger = logger  # TODO(Grub4k): default logger
         self.verbose = verbose
+        self.retry_coordinator = retry_coordinator
+        self.proxy_pool = proxy_pool
+        self.recorder = recorder
+        self.http_cache = http_cache
+        self._selections: dict[tuple, _HandlerSelection] = {}
+        self._selections_state = None
 
     def close(self):
         for handler in self.handlers.values():
             handler.close()
         self.handlers.clear()
+        if self.recorder:
+            self.recorder.close()
 
     def add_handler(self, handler: RequestHandler):
         """Add a handler. If a handler of the same RH_KEY exists, it will overwrite it"""
@@ -83,10 +111,42 @@ def _get_handlers(self, request: Request) -> list[RequestHandler]:
             rh: sum(pref(rh, request) for pref in self.preferences)
             for rh in self.handlers.values()
         }
-        self._print_verbose('Handler preferences for this request: {}'.format(', '.join(
-            f'{rh.RH_NAME}={pref}' for rh, pref in preferences.items())))
+        if self.verbose:
+            self._print_verbose('Handler preferences for this request: {}'.format(', '.join(
+                f'{rh.RH_NAME}={pref}' for rh, pref in preferences.items())))
         return sorted(self.handlers.values(), key=preferences.get, reverse=True)
 
+    @staticmethod
+    def _request_shape(request: Request) -> tuple | None:
+        try:
+            return (
+                request.url.partition(':')[0].lower(),
+                frozenset(request.proxies.items()),
+                frozenset(request.extensions.items()),
+                frozenset(map(str.lower, request.headers)),
+            )
+        except TypeError:  # unhashable extension
+            return None
+
+    def _select_handlers(self, request: Request) -> _HandlerSelection:
+        state = (tuple(self.handlers.values()), frozenset(self.preferences))
+        if state != self._selections_state:
+            self._selections.clear()
+            self._selections_state = state
+
+        shape = self._request_shape(request)
+        selection = self._selections.get(shape)
+        if selection is None:
+            selection = _HandlerSelection(self._get_handlers(request))
+            if shape is not None:
+                if len(self._selections) >= self._MAX_SELECTIONS:
+                    self._selections.clear()
+                self._selections[shape] = selection
+        elif self.verbose:
+            self._print_verbose('Handler preferences for this request: {}'.format(', '.join(
+                rh.RH_NAME for rh in selection.handlers)) + ' (cached order)')
+        return selection
+
     def _print_verbose(self, msg):
         if self.verbose:
             self.logger.stdout(f'director: {msg}')
@@ -100,22 +160,66 @@ def send(self, request: Request) -> Response:
 
         assert isinstance(request, Request)
 
+        if 'cache' in request.extensions:
+            # The extension is handled here rather than by the handlers
+            request = request.copy()
+            if request.extensions.pop('cache') and self.http_cache:
+                return self.http_cache.send(request, self._send_uncached)
+        return self._send_uncached(request)
+
+    def _send_uncached(self, request: Request) -> Response:
+        proxy = None
+        if self.proxy_pool and not request.proxies:
+            proxy = self.proxy_pool.select()
+            request = request.copy()
+            request.proxies = {'all': proxy.url}
+            self._print_verbose(f'Using proxy {proxy.name} from the pool')
+
+        if not (self.retry_coordinator or proxy):
+            return self._send(request)
+
+        if self.retry_coordinator:
+            self.retry_coordinator.wait(request.url, report=self.logger.info)
+        start, error = time.monotonic(), None
+        try:
+            return self._send(request)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if self.retry_coordinator:
+                self.retry_coordinator.record(
+                    request.url, *(self.retry_coordinator.classify(error) if error else (True, None)))
+            if proxy:
+                self.proxy_pool.record(proxy, time.monotonic() - start, error)
+
+    def _send(self, request: Request) -> Response:
         unexpected_errors = []
         unsupported_errors = []
-        for handler in self._get_handlers(request):
-            self._print_verbose(f'Checking if "{handler.RH_NAME}" supports this request.')
-            try:
-                handler.validate(request)
-            except UnsupportedRequest as e:
-                self._print_verbose(
-                    f'"{handler.RH_NAME}" cannot handle this request (reason: {error_to_str(e)})')
-                unsupported_errors.append(e)
+        selection = self._select_handlers(request)
+        for handler in selection.handlers:
+            error = selection.unsupported.get(handler)
+            if error is None:
+                if self.verbose:
+                    self._print_verbose(f'Checking if "{handler.RH_NAME}" supports this request.')
+                try:
+                    handler.validate(request)
+                except UnsupportedRequest as e:
+                    selection.unsupported[handler] = error = e
+            if error is not None:
+                if self.verbose:
+                    self._print_verbose(
+                        f'"{handler.RH_NAME}" cannot handle this request (reason: {error_to_str(error)})')
+                unsupported_errors.append(error)
                 continue
 
-            self._print_verbose(f'Sending request via "{handler.RH_NAME}"')
+            if self.verbose:
+                self._print_verbose(f'Sending request via "{handler.RH_NAME}"')
             try:
                 response = handler.send(request)
-            except RequestError:
+            except RequestError as e:
+                if self.recorder:
+                    self.recorder.record_error(request, e)
                 raise
             except Exception as e:
                 self.logger.error(
@@ -125,11 +229,20 @@ def send(self, request: Request) -> Response:
                 continue
 
             assert isinstance(response, Response)
+            if self.recorder:
+                response = self.recorder.record(request, response)
             return response
 
         raise NoSupportingHandlers(unsupported_errors, unexpected_errors)
 
 
+class _HandlerSelection:
+    def __init__(self, handlers: list[RequestHandler]):
+        # Sorted by preference
+        self.handlers = handlers
+        self.unsupported: dict[RequestHandler, UnsupportedRequest] = {}
+
+
 _REQUEST_HANDLERS = {}
 
 
@@ -561,6 +674,17 @@ def read(self, amt: int | None = None) -> bytes:
         except Exception as e:
             raise TransportError(cause=e) from e
 
+    def readinto(self, b) -> int:
+        """
+        Read up to len(b) bytes into the writable buffer b, returning the number of bytes read.
+        Unlike read(), this can fill the same buffer over and over without creating new objects.
+        """
+        # Subclasses whose underlying response can read into a buffer should redefine this method.
+        data = self.read(len(b))
+        size = len(data)
+        b[:size] = data
+        return size
+
     def close(self):
         if not self.fp.closed:
             self.fp.close()
@@ -602,6 +726,9 @@ def getheader(self, name, default=None):
 
 
 if typing.TYPE_CHECKING:
+    from ._cache import HTTPCache
+    from ._replay import RequestRecorder
+
     RequestData = bytes | Iterable[bytes] | typing.IO | None
     Preference = typing.Callable[[RequestHandler, Request], int]
 
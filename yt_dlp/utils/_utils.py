@@ -1,5 +1,6 @@
 import base64
 import binascii
+import bisect
 import calendar
 import codecs
 import collections
@@ -339,16 +340,12 @@ def get_element_html_by_attribute(attribute, value, html, **kargs):
 
 def get_elements_by_class(class_name, html, **kargs):
     """Return the content of all tags with the specified class in the passed HTML document as a list"""
-    return get_elements_by_attribute(
-        'class', rf'[^\'"]*(?<=[\'"\s]){re.escape(class_name)}(?=[\'"\s])[^\'"]*',
-        html, escape_value=False)
+    return [content for content, _ in get_elements_text_and_html_by_class(class_name, html)]
 
 
 def get_elements_html_by_class(class_name, html):
     """Return the html of all tags with the specified class in the passed HTML document as a list"""
-    return get_elements_html_by_attribute(
-        'class', rf'[^\'"]*(?<=[\'"\s]){re.escape(class_name)}(?=[\'"\s])[^\'"]*',
-        html, escape_value=False)
+    return [whole for _, whole in get_elements_text_and_html_by_class(class_name, html)]
 
 
 def get_elements_by_attribute(*args, **kwargs):
@@ -369,6 +366,10 @@ def get_elements_text_and_html_by_attribute(attribute, value, html, *, tag=r'[\w
     if not value:
         return
 
+    if isinstance(html, HTMLDocument):
+        yield from _unescape_element_contents(html._find_by_attribute(attribute, value, tag, escape_value))
+        return
+
     quote = '' if re.match(r'''[\s"'`=<>]''', value) else '?'
 
     value = re.escape(value) if escape_value else value
@@ -379,9 +380,27 @@ def get_elements_text_and_html_by_attribute(attribute, value, html, *, tag=r'[\w
          \s{re.escape(attribute)}\s*=\s*(?P<_q>['"]{quote})(?-x:{value})(?P=_q)
         '''
 
-    for m in re.finditer(partial_element_re, html):
-        content, whole = get_element_text_and_html_by_tag(m.group('tag'), html[m.start():])
+    yield from _unescape_element_contents(
+        get_element_text_and_html_by_tag(m.group('tag'), html[m.start():])
+        for m in re.finditer(partial_element_re, html))
+
+
+def get_elements_text_and_html_by_class(class_name, html):
+    """
+    Return the text (content) and the html (whole) of the tags with the specified
+    class in the passed HTML document
+    """
+    # The index only has single class names; a sequence of them is matched within the attribute instead
+    if isinstance(html, HTMLDocument) and not re.search(r'\s', class_name):
+        return _unescape_element_contents(html._find_by_class(class_name))
+
+    return get_elements_text_and_html_by_attribute(
+        'class', rf'[^\'"]*(?<=[\'"\s]){re.escape(class_name)}(?=[\'"\s])[^\'"]*',
+        html, escape_value=False)
+
 
+def _unescape_element_contents(elements):
+    for content, whole in elements:
         yield (
             unescapeHTML(re.sub(r'^(?P<q>["\'])(?P<content>.*)(?P=q)$', r'\g<content>', content, flags=re.DOTALL)),
             whole,
@@ -436,6 +455,9 @@ def get_element_text_and_html_by_tag(tag, html):
     For the first element with the specified tag in the passed HTML document
     return its' content (text) and the whole element (html)
     """
+    if isinstance(html, HTMLDocument):
+        return html._find_by_tag(tag)
+
     def find_or_raise(haystack, needle, exc):
         try:
             return haystack.index(needle)
@@ -509,6 +531,8 @@ def extract_attributes(html_element):
         'sq': '"', 'dq': '\''
     }.
     """
+    if isinstance(html_element, HTMLDocument):
+        html_element = html_element._first_start_tag()
     parser = HTMLAttributeParser()
     with contextlib.suppress(compat_HTMLParseError):
         parser.feed(html_element)
@@ -525,6 +549,131 @@ def parse_list(webpage):
     return parser.items
 
 
+class HTMLDocument(str):
+    """
+    An HTML document that indexes its elements for repeated lookups
+
+    It can be used wherever the document string is expected. The `get_element(s)_*` helpers,
+    `get_element_text_and_html_by_tag`, `extract_attributes` and `traversal.find_element(s)`
+    look elements up in an index instead of rescanning the whole document for each call.
+    The index is built by a single pass over the document on the first lookup.
+
+    Unlike with plain strings, elements are closed by the next unmatched closing tag of the
+    same name, unquoted attribute values must match as a whole, and the contents of comments
+    and of raw text elements (e.g. <script>) are not searched for elements
+    """
+
+    _TAG_RE = re.compile(r'''(?x)
+        <(?:
+            !--(?s:.*?)(?:-->|\Z)|
+            (?P<tag>[\w:.-]+)(?P<attrs>(?:\s(?:[^>"']|"[^"]*"|'[^']*')*)?)(?P<end>/?>)?|
+            /(?P<closing_tag>[\w:.-]+)\s*>
+        )''')
+    _ATTRIBUTE_RE = re.compile(r'''(?x)
+        "[^"]*"|'[^']*'|
+        \s+(?P<name>[^\s"'>/=]+)(?:\s*=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<unquoted>[^\s"'>]*)))?''')
+    _QUOTES = {'dq': '"', 'sq': "'", 'unquoted': ''}
+    # The content of these elements is text, even where it looks like markup
+    _RAW_TEXT_TAGS = ('script', 'style', 'textarea', 'title')
+    _ANY_TAG = r'[\w:.-]+'
+
+    class _Element:
+        __slots__ = ('content_end', 'content_start', 'end', 'start', 'tag')
+
+        def __init__(self, tag, start, content_start):
+            self.tag, self.start, self.content_start = tag, start, content_start
+            self.content_end = self.end = None
+
+    # Each maps to a list of elements in document order, which repeats an element
+    # for a repeated attribute. by_attribute has (element, value start, value end, quote) instead
+    _Index = collections.namedtuple('_Index', ('by_tag', 'by_class', 'by_attribute', 'by_value'))
+
+    @functools.cached_property
+    def _index(self):
+        index = self._Index({}, {}, {}, {})
+        open_elements = collections.defaultdict(list)
+
+        pos = 0
+        while mobj := self._TAG_RE.search(self, pos):
+            pos = mobj.end()
+            tag, attrs, end, closing_tag = mobj.group('tag', 'attrs', 'end', 'closing_tag')
+            if closing_tag:
+                if open_elements[closing_tag]:
+                    element = open_elements[closing_tag].pop()
+                    element.content_end, element.end = mobj.span()
+                continue
+            elif not tag:  # comment
+                continue
+
+            element = self._Element(tag, mobj.start(), mobj.end() if end else None)
+            if end == '/>' or (attrs.endswith('/') and re.search(r'''(?:^|[\s"'])/$''', attrs)):
+                element.content_end = element.end = mobj.end()
+            elif end and tag.lower() in self._RAW_TEXT_TAGS:
+                closing_mobj = re.compile(rf'</{re.escape(tag)}\s*>', re.IGNORECASE).search(self, pos)
+                if closing_mobj:
+                    element.content_end, element.end = closing_mobj.span()
+                pos = closing_mobj.end() if closing_mobj else len(self)
+            elif end:
+                open_elements[tag].append(element)
+            index.by_tag.setdefault(tag, []).append(element)
+            if not attrs:
+                continue
+
+            for attr_mobj in self._ATTRIBUTE_RE.finditer(self, *mobj.span('attrs')):
+                name, group = attr_mobj.group('name'), attr_mobj.lastgroup
+                if group in (None, 'name'):  # stray quotes or no value
+                    continue
+                value, quote = attr_mobj.group(group), self._QUOTES[group]
+                index.by_attribute.setdefault(name, []).append((element, *attr_mobj.span(group), quote))
+                index.by_value.setdefault((name, value), []).append(element)
+                if name == 'class' and quote:
+                    for class_name in value.split():
+                        index.by_class.setdefault(class_name, []).append(element)
+
+        return index
+
+    @staticmethod
+    def _unique(elements):
+        previous = None
+        for element in elements:
+            if element is not previous:
+                yield element
+            previous = element
+
+    def _text_and_html(self, element):
+        if element.end is None:
+            raise compat_HTMLParseError(f'closing {element.tag} tag not found')
+        return self[element.content_start:element.content_end], self[element.start:element.end]
+
+    def _find_by_tag(self, tag):
+        elements = self._index.by_tag.get(tag)
+        if not elements:
+            raise compat_HTMLParseError(f'opening {tag} tag not found')
+        return self._text_and_html(elements[0])
+
+    def _find_by_class(self, class_name):
+        for element in self._unique(self._index.by_class.get(class_name, ())):
+            yield self._text_and_html(element)
+
+    def _find_by_attribute(self, attribute, value, tag=_ANY_TAG, escape_value=True):
+        if escape_value:
+            elements = self._index.by_value.get((attribute, value), ())
+        else:
+            # Quoted values are matched in place up to the closing quote, so that lookarounds can see the quotes
+            patterns = {quote: re.compile(rf'(?:{value}){quote}') for quote in '"\''}
+            patterns[''] = re.compile(value)
+            elements = [
+                element for element, start, end, quote in self._index.by_attribute.get(attribute, ())
+                if (patterns[quote].match(self, start) if quote else patterns[''].fullmatch(self, start, end))]
+
+        for element in self._unique(elements):
+            if tag == self._ANY_TAG or re.fullmatch(tag, element.tag):
+                yield self._text_and_html(element)
+
+    def _first_start_tag(self):
+        return next((mobj.group(0) for mobj in self._TAG_RE.finditer(self) if mobj.group('tag')), '')
+
+
 def clean_html(html):
     """Clean an HTML snippet into a readable string"""
 
@@ -547,6 +696,11 @@ def __init__(self, *args, transform_source=None, ignore_extra=False, close_objec
         self.transform_source, self.ignore_extra = transform_source, ignore_extra
         self._close_attempts = 2 * close_objects
         super().__init__(*args, **kwargs)
+        # Most of the JavaScript objects that are parsed are valid JSON already, which js_to_json would only copy.
+        # NaN and Infinity are not JSON, but are accepted by the decoder; js_to_json converts them to strings
+        self._json_decoder = None
+        if transform_source is js_to_json and 'parse_constant' not in kwargs:
+            self._json_decoder = json.JSONDecoder(*args, parse_constant=_reject_json_constant, **kwargs)
 
     @staticmethod
     def _close_object(err):
@@ -563,6 +717,11 @@ def _close_object(err):
             return doc[:-1] + ']'
 
     def decode(self, s):
+        if self._json_decoder:
+            with contextlib.suppress(ValueError):
+                if self.ignore_extra:
+                    return self._json_decoder.raw_decode(s.lstrip())[0]
+                return self._json_decoder.decode(s)
         if self.transform_source:
             s = self.transform_source(s)
         for attempt in range(self._close_attempts + 1):
@@ -2313,6 +2472,119 @@ def __str__(self):
         return repr(self.exhaust())
 
 
+class DashFragments(collections.abc.Sequence):
+    """Immutable sequence of the fragments of a DASH format
+    The fragments of a SegmentTemplate are generated on demand from the template and
+    runs of [number, time, duration, count] segments, like the S elements of a SegmentTimeline.
+    Note that slices of DashFragments are lists"""
+
+    class _SegmentTemplate:
+        __slots__ = ('bandwidth', 'ends', 'location_key', 'segments', 'template', 'timescale')
+
+        def __init__(self, template, location_key, segments, bandwidth=None, timescale=1):
+            self.template, self.location_key, self.bandwidth, self.timescale = template, location_key, bandwidth, timescale
+            self.segments = [list(segment) for segment in segments if segment[3] > 0]
+            self.ends = list(itertools.accumulate(segment[3] for segment in self.segments))
+
+        def __len__(self):
+            return self.ends[-1] if self.ends else 0
+
+        def fragment(self, number, start_time, duration):
+            return {
+                self.location_key: self.template % {'Number': number, 'Time': start_time, 'Bandwidth': self.bandwidth},
+                'duration': float_or_none(duration, self.timescale),
+            }
+
+        def __getitem__(self, idx):
+            run = bisect.bisect_right(self.ends, idx)
+            number, start_time, duration, count = self.segments[run]
+            offset = idx - (self.ends[run] - count)
+            return self.fragment(number + offset, start_time + offset * (duration or 0), duration)
+
+        def __iter__(self):
+            for number, start_time, duration, count in self.segments:
+                for offset in range(count):
+                    yield self.fragment(number + offset, start_time + offset * (duration or 0), duration)
+
+        def to_json(self):
+            return {
+                'template': self.template,
+                'location_key': self.location_key,
+                'bandwidth': self.bandwidth,
+                'timescale': self.timescale,
+                'segments': self.segments,
+            }
+
+    def __init__(self, fragments=()):
+        self._parts, self._ends = [], []
+        self.extend(fragments)
+
+    @classmethod
+    def from_template(cls, template, location_key, segments, *, bandwidth=None, timescale=1):
+        """
+        @param template     The media template, with %(Number)d, %(Time)d and %(Bandwidth)d fields
+        @param location_key The key of the fragment urls, 'url' or 'path'
+        @param segments     Runs of [number, time, duration, count] segments; duration is in timescale units
+        """
+        self = cls()
+        self._add(cls._SegmentTemplate(template, location_key, segments, bandwidth, timescale))
+        return self
+
+    @classmethod
+    def from_json(cls, obj):
+        """Inverse of to_json"""
+        if not isinstance(obj, dict):
+            return obj
+        self = cls()
+        for part in obj['dash_fragments']:
+            self._add(cls._SegmentTemplate(**part) if isinstance(part, dict) else part)
+        return self
+
+    def to_json(self):
+        """Return a compact json representation, which is a list of the fragments if none are from a template"""
+        if not any(isinstance(part, self._SegmentTemplate) for part in self._parts):
+            return list(self)
+        return {'dash_fragments': [
+            part.to_json() if isinstance(part, self._SegmentTemplate) else part for part in self._parts]}
+
+    def _add(self, part):
+        if len(part):
+            self._parts.append(part)
+            self._ends.append(len(self) + len(part))
+
+    def extend(self, fragments):
+        if isinstance(fragments, DashFragments):
+            for part in fragments._parts:
+                self._add(part)
+        else:
+            self._add(list(fragments))
+
+    def append(self, fragment):
+        self._add([fragment])
+
+    def __len__(self):
+        return self._ends[-1] if self._ends else 0
+
+    def __iter__(self):
+        for part in self._parts:
+            yield from part
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        elif not isinstance(idx, int):
+            raise TypeError('indices must be integers or slices')
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('DashFragments index out of range')
+        part = bisect.bisect_right(self._ends, idx)
+        return self._parts[part][idx - self._ends[part] + len(self._parts[part])]
+
+    def __repr__(self):
+        return f'<{type(self).__name__} of {len(self)} fragments>'
+
+
 class PagedList:
 
     class IndexError(IndexError):  # noqa: A001
@@ -2773,6 +3045,10 @@ def strip_jsonp(code):
         r'\g<callback_data>', code)
 
 
+def _reject_json_constant(name):
+    raise ValueError(f'{name} is not valid JSON')
+
+
 def js_to_json(code, vars={}, *, strict=False):
     # vars is a dict of var, val pairs to substitute
     STRING_QUOTES = '\'"`'
@@ -2802,7 +3078,7 @@ def template_substitute(match):
 
     def fix_kv(m):
         v = m.group(0)
-        if v in ('true', 'false', 'null'):
+        if m.group('json') or v in ('true', 'false', 'null'):
             return v
         elif v in ('undefined', 'void 0'):
             return 'null'
@@ -2814,7 +3090,7 @@ def fix_kv(m):
             escaped = re.sub(r'(?s)(")|\\(.)', process_escape, v)
             return f'"{escaped}"'
 
-        for regex, base in INTEGER_TABLE:
+        for regex, base in INTEGER_TABLE if v[0] == '0' else ():
             im = re.match(regex, v)
             if im:
                 i = int(im.group(1), base)
@@ -2837,8 +3113,11 @@ def fix_kv(m):
     def create_map(mobj):
         return json.dumps(dict(json.loads(js_to_json(mobj.group(1) or '[]', vars=vars))))
 
-    code = re.sub(r'(?:new\s+)?Array\((.*?)\)', r'[\g<1>]', code)
-    code = re.sub(r'new Map\((\[.*?\])?\)', create_map, code)
+    # Cheap substring checks spare scanning the whole code for constructs it does not contain
+    if 'Array(' in code:
+        code = re.sub(r'(?:new\s+)?Array\((.*?)\)', r'[\g<1>]', code)
+    if 'new Map(' in code:
+        code = re.sub(r'new Map\((\[.*?\])?\)', create_map, code)
     if not strict:
         code = re.sub(rf'new Date\(({STRING_RE})\)', r'\g<1>', code)
         code = re.sub(r'new \w+\((.*?)\)', lambda m: json.dumps(m.group(0)), code)
@@ -2846,6 +3125,13 @@ def create_map(mobj):
         code = re.sub(r'\(function\([^)]*\)\s*\{[^}]*\}\s*\)\s*\(\s*(["\'][^)]*["\'])\s*\)', r'\1', code)
 
     return re.sub(rf'''(?sx)
+        (?P<json>(?:
+            # Tokens that are left as they are, matched in runs so that valid JSON is copied in few steps
+            \s+|[\[\]{{}}:]|,(?!{SKIP_RE}[\]}}])|
+            "(?:[^"\\]|\\["\\bfnrtu])*"|
+            (?:true|false|null)(?![.a-zA-Z_$0-9])|
+            -?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?(?![.a-zA-Z_$0-9]|{SKIP_RE}:)
+        )+)|
         {STRING_RE}|
         {COMMENT_RE}|,(?={SKIP_RE}[\]}}])|
         void\s0|(?:(?<![0-9])[eE]|[a-df-zA-DF-Z_$])[.a-zA-Z_$0-9]*|
@@ -4521,6 +4807,130 @@ def parse_m3u8_attributes(attrib):
     return info
 
 
+class M3U8Playlist:
+    """A m3u8 playlist, parsed in a single pass over its lines
+
+    @ivar tags          {name: [value, ...]} of all the tags (and comments) of the playlist,
+                        e.g. {'EXT-X-TARGETDURATION': ['10'], 'EXT-X-ENDLIST': ['']}
+    @ivar media         Attributes of the EXT-X-MEDIA tags of a master playlist
+    @ivar variants      (attributes of the EXT-X-STREAM-INF tag, URI) of the variant
+                        streams of a master playlist
+    @ivar segments      M3U8Playlist.Segment of a media playlist, including the
+                        initialization sections (EXT-X-MAP)
+    """
+
+    # uri:              URI of the segment, as given in the playlist
+    # duration:         Duration from EXTINF, if any
+    # byte_range:       (start, end) of the sub-range of the resource to use, if any
+    # key:              Attributes of the EXT-X-KEY tag that applies to the segment, if any
+    # sequence:         Media sequence number; None for initialization sections
+    # discontinuity:    Number of EXT-X-DISCONTINUITY tags before the segment
+    # ad:               Whether the segment is an ad, as marked by Anvato or Uplynk
+    # init:             Whether the segment is an initialization section
+    Segment = collections.namedtuple('Segment', (
+        'uri', 'duration', 'byte_range', 'key', 'sequence', 'discontinuity', 'ad', 'init'))
+
+    def __init__(self, data):
+        self.tags, self.media, self.variants, self.segments = {}, [], [], []
+        sequence = 0
+        duration = byte_range = key = stream_inf = None
+        byte_range_offset = discontinuity = 0
+        ad = False
+        for line in data.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith('#'):
+                self.variants.append((stream_inf or {}, line))
+                self.segments.append(self.Segment(
+                    line, duration, byte_range, key, sequence, discontinuity, ad, False))
+                if byte_range:
+                    byte_range_offset = byte_range[1]
+                sequence += 1
+                duration = byte_range = stream_inf = None
+                continue
+
+            name, _, value = line[1:].partition(':')
+            self.tags.setdefault(name, []).append(value)
+            if name == 'EXTINF':
+                duration = float_or_none(value.partition(',')[0])
+            elif name == 'EXT-X-BYTERANGE':
+                length, _, start = value.partition('@')
+                start = int(start) if start else byte_range_offset
+                byte_range = (start, start + int(length))
+            elif name == 'EXT-X-KEY':
+                key = parse_m3u8_attributes(value)
+            elif name == 'EXT-X-MAP':
+                attributes = parse_m3u8_attributes(value)
+                map_byte_range = None
+                if attributes.get('BYTERANGE'):
+                    length, _, start = attributes['BYTERANGE'].partition('@')
+                    start = int(start) if start else 0
+                    map_byte_range = (start, start + int(length))
+                self.segments.append(self.Segment(
+                    attributes.get('URI'), None, map_byte_range, key, None, discontinuity, False, True))
+            elif name == 'EXT-X-MEDIA-SEQUENCE':
+                sequence = int(value)
+            elif name == 'EXT-X-DISCONTINUITY':
+                discontinuity += 1
+            elif name == 'EXT-X-STREAM-INF':
+                stream_inf = parse_m3u8_attributes(value)
+            elif name == 'EXT-X-MEDIA':
+                self.media.append(parse_m3u8_attributes(value))
+            elif name == 'ANVATO-SEGMENT-INFO':
+                if 'type=ad' in value:
+                    ad = True
+                elif 'type=master' in value:
+                    ad = False
+            elif name == 'UPLYNK-SEGMENT':
+                if value.endswith(',ad'):
+                    ad = True
+                elif value.endswith(',segment'):
+                    ad = False
+
+        if self.is_master:
+            self.segments = []
+        else:
+            self.variants = []
+
+    @staticmethod
+    def parse(data):
+        return M3U8Playlist(data)
+
+    def _last_tag(self, name):
+        values = self.tags.get(name)
+        return values[-1] if values else None
+
+    @property
+    def is_master(self):
+        # As per RFC 8216 section 4.3.4, variant streams and renditions are only in master playlists.
+        # Media playlists are recognized by their segments too, since some omit EXT-X-TARGETDURATION
+        if 'EXT-X-STREAM-INF' in self.tags or 'EXT-X-MEDIA' in self.tags:
+            return True
+        return 'EXT-X-TARGETDURATION' not in self.tags and 'EXTINF' not in self.tags
+
+    @property
+    def is_live(self):
+        """Whether segments may still be added to the media playlist"""
+        return 'EXT-X-ENDLIST' not in self.tags and self._last_tag('EXT-X-PLAYLIST-TYPE') != 'VOD'
+
+    @property
+    def target_duration(self):
+        return float_or_none(self._last_tag('EXT-X-TARGETDURATION'))
+
+    @property
+    def media_sequence(self):
+        return int_or_none(self._last_tag('EXT-X-MEDIA-SEQUENCE')) or 0
+
+    @property
+    def discontinuity_sequence(self):
+        return int_or_none(self._last_tag('EXT-X-DISCONTINUITY-SEQUENCE')) or 0
+
+    @property
+    def discontinuities(self):
+        return len(self.tags.get('EXT-X-DISCONTINUITY', ()))
+
+
 def urshift(val, n):
     return val >> n if val >= 0 else (val + 0x100000000) >> n
 
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+import time
+import urllib.parse
+
+
+class TokenBucket:
+    # Time worth of tokens that can be used at once after being idle (seconds)
+    BURST_TIME = 0.1
+    # Minimum number of tokens that can be used at once
+    MIN_BURST = 1024
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(rate * self.BURST_TIME, self.MIN_BURST)
+        self._tokens = self.capacity
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: int) -> float:
+        """
+        Take the tokens immediately, going into debt if there are not enough of them
+        @returns    The time to wait before the tokens are actually available (seconds)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_update) * self.rate)
+            self._last_update = now
+            self._tokens -= amount
+            return max(-self._tokens / self.rate, 0)
+
+
+class RateLimiter:
+    """
+    Limit the combined rate of everything drawing from it, as opposed to the
+    rate of each individual download. There is a bucket for the total rate and
+    one for every host, and every transfer has to wait for both of them
+    """
+
+    _shared: dict[tuple, RateLimiter] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate: float | None = None, host_rate: float | None = None):
+        self._rate = rate
+        self._bucket = TokenBucket(rate) if rate else None
+        self._host_rate = host_rate
+        self._host_buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, rate: float | None = None, host_rate: float | None = None) -> RateLimiter | None:
+        """Get the limiter used by the whole process for the given limits, if any"""
+        if not (rate or host_rate):
+            return None
+        with cls._shared_lock:
+            key = (rate, host_rate)
+            if key not in cls._shared:
+                cls._shared[key] = cls(rate, host_rate)
+            return cls._shared[key]
+
+    @property
+    def max_block_size(self) -> int:
+        """The largest amount that should be transferred at once for the pacing to stay smooth"""
+        rate = min(rate for rate in (self._rate, self._host_rate) if rate)
+        return int(max(rate * TokenBucket.BURST_TIME, TokenBucket.MIN_BURST))
+
+    def _host_bucket(self, url: str | None) -> TokenBucket | None:
+        if not self._host_rate:
+            return None
+        host = urllib.parse.urlparse(url).hostname if url else None
+        with self._lock:
+            if host not in self._host_buckets:
+                self._host_buckets[host] = TokenBucket(self._host_rate)
+            return self._host_buckets[host]
+
+    def delay(self, amount: int, url: str | None = None) -> float:
+        """Draw amount from the buckets, returning the time to wait before transferring it"""
+        return max((
+            bucket.reserve(amount) for bucket in (self._bucket, self._host_bucket(url)) if bucket), default=0)
+
+    def consume(self, amount: int, url: str | None = None):
+        """Wait until amount may be transferred to or from url"""
+        delay = self.delay(amount, url)
+        if delay > 0:
+            time.sleep(delay)
@@ -136,7 +136,7 @@ def apply_key(key, obj, is_last):
         elif isinstance(key, (list, tuple)):
             branching = True
             result = itertools.chain.from_iterable(
-                apply_path(obj, branch, is_last)[0] for branch in key)
+                apply_path(obj, _compile_path(branch), is_last)[0] for branch in key)
 
         elif key is ...:
             branching = True
@@ -236,24 +236,13 @@ def apply_specials(element):
 
         return branching, result if branching else (result,)
 
-    def lazy_last(iterable):
-        iterator = iter(iterable)
-        prev = next(iterator, NO_DEFAULT)
-        if prev is NO_DEFAULT:
-            return
-
-        for item in iterator:
-            yield False, prev
-            prev = item
-
-        yield True, prev
-
-    def apply_path(start_obj, path, test_type):
+    def apply_path(start_obj, compiled, test_type):
         objs = (start_obj,)
         has_branched = False
 
         key = None
-        for last, key in lazy_last(variadic(path, (str, bytes, dict, set))):
+        for index, key in enumerate(compiled.keys, 1):
+            last = index == len(compiled.keys)
             if not casesense and isinstance(key, str):
                 key = key.casefold()
 
@@ -270,10 +259,6 @@ def apply_path(start_obj, path, test_type):
                 objs = filter(None, objs)
                 continue
 
-            if __debug__ and callable(key):
-                # Verify function signature
-                inspect.signature(key).bind(None, None)
-
             new_objs = []
             for obj in objs:
                 branching, results = apply_key(key, obj, last)
@@ -288,7 +273,26 @@ def apply_path(start_obj, path, test_type):
         return objs, has_branched, isinstance(key, dict)
 
     def _traverse_obj(obj, path, allow_empty, test_type):
-        results, has_branched, is_dict = apply_path(obj, path, test_type)
+        compiled = _compile_path(path)
+        if compiled.is_simple and casesense and not traverse_string:
+            # Lookups of plain keys can neither branch nor end on a dict
+            for key in compiled.keys:
+                if obj is None:
+                    break
+                elif key is None:
+                    continue
+                elif type(obj) is dict:
+                    obj = obj.get(key)
+                elif type(obj) is list and type(key) is int:
+                    obj = obj[key] if -len(obj) <= key < len(obj) else None
+                else:
+                    obj = apply_key(key, obj, False)[1][0]
+
+            if test_type:
+                obj = type_test(obj)
+            return obj if obj not in (None, {}) else None
+
+        results, has_branched, is_dict = apply_path(obj, compiled, test_type)
         results = LazyList(item for item in results if item not in (None, {}))
         if get_all and has_branched:
             if results:
@@ -313,6 +317,58 @@ def _traverse_obj(obj, path, allow_empty, test_type):
     return None if default is NO_DEFAULT else default
 
 
+class _CompiledPath(typing.NamedTuple):
+    keys: tuple
+    # Whether all keys are `None` or plain `str`/`int` lookups
+    is_simple: bool
+
+
+_compiled_paths = {}
+# Paths of constants that have only been seen once so far
+_seen_paths = {}
+_MAX_COMPILED_PATHS = 4096
+_CONSTANT_KEY_TYPES = (str, int, bool, type(None), type(...))
+
+
+def _is_constant_path(path):
+    return all(
+        _is_constant_path(key) if type(key) is tuple else type(key) in _CONSTANT_KEY_TYPES
+        for key in path)
+
+
+def _compile_path(path):
+    """
+    Prepare a path for traversal, caching the result by the identity of the path
+
+    Literal tuples of constants are the same objects on every call, so only those are cached,
+    once they have been seen twice. Paths built on each call, e.g. with f-strings, are never seen again.
+    Keeping a reference to a seen path ensures that its id is not reused.
+    """
+    cached = _compiled_paths.get(id(path))
+    if cached and cached[0] is path:
+        return cached[1]
+
+    keys = tuple(variadic(path, (str, bytes, dict, set)))
+    if __debug__:
+        for key in keys:
+            if callable(key) and key not in (any, all, filter):
+                # Verify function signature
+                inspect.signature(key).bind(None, None)
+
+    compiled = _CompiledPath(keys, all(key is None or type(key) in (str, int) for key in keys))
+    # Paths with other keys, like functions or sets, are built anew on each call
+    if type(path) is tuple and _is_constant_path(path):
+        if _seen_paths.pop(id(path), None) is path:
+            if len(_compiled_paths) >= _MAX_COMPILED_PATHS:
+                _compiled_paths.clear()
+            _compiled_paths[id(path)] = path, compiled
+        else:
+            if len(_seen_paths) >= _MAX_COMPILED_PATHS:
+                _seen_paths.clear()
+            _seen_paths[id(path)] = path
+    return compiled
+
+
 def value(value, /):
     return lambda _: value
 